@@ -0,0 +1,84 @@
+"""
+Replays a synthetic month of funding observations and 20-level ask snapshots for a
+100-symbol universe from a local .npz file, through the event-by-event reference path and
+the vectorised fast path, and reports events per second.
+
+    python -m app.benchmarks.bench_backtest [--symbols 100] [--days 30] [--book-interval 300] [--skip-reference]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from app.crypto_funding_arbitrage.backtest import BacktestData, BacktestEngine
+from app.crypto_funding_arbitrage.strategies.crypto_funding_arbitrage_strategy import CryptoFundingArbitrageStrategy
+
+START_US = 1_714_521_600 * 10 ** 6  # 2024-05-01 00:00 UTC
+DEPTH = 20
+
+
+def synthetic(symbols: int, days: int, book_interval: int, funding_interval: int = 60, seed: int = 1) -> BacktestData:
+    """
+    Funding observed every `funding_interval` seconds and a book every `book_interval` seconds per symbol.
+    """
+    rng = np.random.default_rng(seed)
+    span = days * 86400 * 10 ** 6
+
+    funding_steps = span // (funding_interval * 10 ** 6)
+    funding_times = START_US + np.arange(funding_steps, dtype=np.int64) * funding_interval * 10 ** 6
+    # Slowly drifting rate per symbol, occasionally spiking well above fees
+    drift = rng.normal(0.0001, 0.00005, size=(symbols, 1)) + rng.normal(0, 0.00003, size=(symbols, funding_steps)).cumsum(axis=1) / 50
+    rates = drift + (rng.random((symbols, funding_steps)) < 0.002) * rng.uniform(0.002, 0.01, size=(symbols, funding_steps))
+
+    book_steps = span // (book_interval * 10 ** 6)
+    book_times = START_US + np.arange(book_steps, dtype=np.int64) * book_interval * 10 ** 6
+    mids = 100.0 * np.exp(rng.normal(0, 0.001, size=(symbols, book_steps)).cumsum(axis=1))
+    levels = np.arange(DEPTH)
+    asks = np.empty((symbols, book_steps, DEPTH, 2))
+    asks[..., 0] = mids[..., None] * (1 + 0.0001 * (levels + 1))
+    asks[..., 1] = rng.uniform(0.5, 5.0, size=(symbols, book_steps, DEPTH))
+
+    return BacktestData(
+        exchanges=["binance" if i % 2 else "bybit" for i in range(symbols)],
+        symbols=[f"SYM{i}USDT" for i in range(symbols)],
+        taker_fees=np.full(symbols, 0.0004),
+        funding_intervals=np.where(np.arange(symbols) % 5 == 0, 4, 8).astype(np.int64),
+        funding_times_us=np.tile(funding_times, symbols),
+        funding_symbol_ids=np.repeat(np.arange(symbols, dtype=np.int32), funding_steps),
+        funding_rates=rates.reshape(-1),
+        book_times_us=np.tile(book_times, symbols),
+        book_symbol_ids=np.repeat(np.arange(symbols, dtype=np.int32), book_steps),
+        book_asks=asks.reshape(-1, DEPTH, 2)
+    )
+
+
+def main(symbols: int, days: int, book_interval: int, skip_reference: bool):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "history.npz")
+        synthetic(symbols, days, book_interval).save(path)
+        started = time.perf_counter()
+        data = BacktestData.load(path)
+        print(f"loaded {data.events:,} events ({os.path.getsize(path) / 2 ** 20:.0f} MiB) in {time.perf_counter() - started:.2f}s")
+
+    engine = BacktestEngine(data, CryptoFundingArbitrageStrategy(threshold=0.0005, max_hours_to_wait=4))
+    results = [("vectorised", engine.run_vectorized())]
+    if not skip_reference:
+        results.append(("reference", asyncio.run(engine.run())))
+    for label, result in results:
+        print(
+            f"{label:<11} {result.elapsed:7.2f}s  {result.events_per_second:12,.0f} events/s  "
+            f"trades={result.summary['trades']} total_return={result.summary['total_return']:.4f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the funding arbitrage backtest engine.")
+    parser.add_argument("--symbols", "-s", type=int, default=100)
+    parser.add_argument("--days", "-d", type=int, default=30)
+    parser.add_argument("--book-interval", "-b", type=int, default=300, help="seconds between book snapshots per symbol")
+    parser.add_argument("--skip-reference", action="store_true", help="only run the vectorised path")
+    args = parser.parse_args()
+    main(args.symbols, args.days, args.book_interval, args.skip_reference)
@@ -0,0 +1,132 @@
+"""
+Memory held per symbol for one scan of the universe: the previous plain dataclasses
+(with a `__dict__` each), the slotted/frozen entities, and the struct-of-arrays
+`MarketSnapshot` built from them. Every variant keeps the same 20-level books and an
+evaluation result per symbol (a dict for the entities, columns for the snapshot).
+
+    python -m app.benchmarks.bench_entity_memory [--symbols 2000] [--depth 20]
+"""
+import argparse
+import gc
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from app.trade.entities.fees import Fees
+from app.trade.entities.funding_rate import FundingRate
+from app.trade.entities.order_book import OrderBook
+from app.crypto_funding_arbitrage.entities.crypto_funding_arbitrage_data import CryptoFundingArbitrageData
+from app.crypto_funding_arbitrage.entities.market_snapshot import MarketSnapshot
+from app.crypto_funding_arbitrage.strategies.crypto_funding_arbitrage_strategy import CryptoFundingArbitrageStrategy
+
+
+# The entities as they were before slots, for the "before" column
+@dataclass
+class LegacyFundingRate:
+    symbol: str
+    funding_rate: float
+    timestamp: datetime
+
+
+@dataclass
+class LegacyFees:
+    maker: float
+    taker: float
+
+
+@dataclass
+class LegacyOrderBook:
+    symbol: str
+    bids: Sequence[Tuple[float, float]]
+    asks: Sequence[Tuple[float, float]]
+    timestamp: datetime
+
+
+@dataclass
+class LegacyData:
+    funding_rate: Optional[LegacyFundingRate]
+    order_book: Optional[LegacyOrderBook]
+    fees: Optional[LegacyFees]
+    symbol: Optional[str] = None
+    error: Optional[str] = None
+    exchange: Optional[str] = None
+
+
+def _levels(i: int, depth: int, start: float, step: float) -> List[Tuple[float, float]]:
+    return [(start + i + level * step, 1.0 + (i + level) % 7) for level in range(depth)]
+
+
+def build(funding_rate_cls, fees_cls, order_book_cls, data_cls, symbols: int, depth: int) -> list:
+    timestamp = datetime.now(timezone.utc)
+    universe = []
+    for i in range(symbols):
+        symbol = f"SYM{i}USDT"
+        universe.append(data_cls(
+            funding_rate=funding_rate_cls(symbol=symbol, funding_rate=0.0001 * (i % 13), timestamp=timestamp),
+            order_book=order_book_cls(
+                symbol=symbol,
+                bids=_levels(i, depth, 100.0, -0.01),
+                asks=_levels(i, depth, 100.01, 0.01),
+                timestamp=timestamp
+            ),
+            fees=fees_cls(maker=0.0002, taker=0.0004),
+            symbol=symbol,
+            exchange="binance"
+        ))
+    return universe
+
+
+def evaluations(universe: list) -> list:
+    # The shape of CryptoFundingArbitrageStrategy.evaluate() results
+    return [
+        {
+            "symbol": market_data.symbol, "funding_rate": market_data.funding_rate.funding_rate,
+            "taker_fee": market_data.fees.taker, "slippage": 0.0001 * i, "net_return": -0.001 * i,
+            "breakeven_hours": 8.0 + i, "breakeven_human": "8h", "time_to_funding_hours": 3.5,
+            "is_profitable": False
+        }
+        for i, market_data in enumerate(universe)
+    ]
+
+
+def measure(make: Callable[[], object]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    kept = make()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current
+
+
+def main(symbols: int, depth: int):
+    strategy = CryptoFundingArbitrageStrategy()
+    entities = build(FundingRate, Fees, OrderBook, CryptoFundingArbitrageData, symbols, depth)
+
+    def snapshot():
+        columns = MarketSnapshot.from_market_data(entities, depth)
+        batch = columns.to_batch([0.0] * symbols)
+        return columns, strategy.evaluate_batch(batch)
+
+    variants = (
+        ("dataclass", lambda: (lambda universe: (universe, evaluations(universe)))(
+            build(LegacyFundingRate, LegacyFees, LegacyOrderBook, LegacyData, symbols, depth))),
+        ("slots", lambda: (lambda universe: (universe, evaluations(universe)))(
+            build(FundingRate, Fees, OrderBook, CryptoFundingArbitrageData, symbols, depth))),
+        ("snapshot", snapshot),
+    )
+    print(f"symbols={symbols} depth={depth}/side")
+    baseline = None
+    for label, make in variants:
+        per_symbol = measure(make) / symbols
+        baseline = baseline or per_symbol
+        print(f"{label:<10} {per_symbol:9.0f} B/symbol  ({per_symbol / baseline:5.1%} of dataclass)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark memory per symbol of the market-data entities.")
+    parser.add_argument("--symbols", "-s", type=int, default=2000)
+    parser.add_argument("--depth", "-d", type=int, default=20, help="order-book levels per side")
+    args = parser.parse_args()
+    main(args.symbols, args.depth)
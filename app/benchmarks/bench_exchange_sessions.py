@@ -0,0 +1,79 @@
+"""
+Per-request latency of a fresh `httpx.AsyncClient` per call (the old client behaviour)
+versus the pooled, keep-alive session now owned by every `ExchangeClient`.
+
+    python -m app.benchmarks.bench_exchange_sessions [--requests 500]
+
+The stub server is plain HTTP on localhost, so the "before" numbers only pay for
+TCP connect and client setup. Against a real venue every fresh client also pays a
+TLS handshake, so the production saving is larger than what is shown here.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+import httpx
+
+from app.benchmarks.stub_server import StubExchangeServer
+from app.trade.exchanges.binance_client import BinanceClient
+
+DEPTH_PAYLOAD = {
+    "lastUpdateId": 1,
+    "bids": [[f"{30000 - i * 0.1:.1f}", "1.250"] for i in range(5)],
+    "asks": [[f"{30000.1 + i * 0.1:.1f}", "0.750"] for i in range(5)],
+}
+
+
+class PerCallBinanceClient(BinanceClient):
+    """Reproduces the previous behaviour: a brand-new HTTP client for every request."""
+
+    async def _get(self, url, params=None):
+        async with httpx.AsyncClient() as client:
+            response = await client.get(url, params=params)
+            response.raise_for_status()
+            return response
+
+
+async def _measure(client: BinanceClient, requests: int) -> List[float]:
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await client.fetch_order_book("BTCUSDT")
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def _report(label: str, latencies: List[float], connections: int):
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{label:<10} mean={statistics.mean(latencies):7.3f}ms  "
+        f"p50={statistics.median(latencies):7.3f}ms  p95={p95:7.3f}ms  "
+        f"connections={connections}"
+    )
+
+
+async def main(requests: int):
+    async with StubExchangeServer({"/fapi/v1/depth": DEPTH_PAYLOAD}) as server:
+        before = PerCallBinanceClient()
+        before.api_url = server.base_url + "/fapi/v1"
+        before.order_book_url = f"{before.api_url}/depth"
+        latencies = await _measure(before, requests)
+        _report("per-call", latencies, server.connections)
+
+        server.connections = 0
+        async with BinanceClient() as after:
+            after.api_url = server.base_url + "/fapi/v1"
+            after.order_book_url = f"{after.api_url}/depth"
+            await after.fetch_order_book("BTCUSDT")  # warm the pool
+            latencies = await _measure(after, requests)
+        _report("pooled", latencies, server.connections)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark pooled vs per-call exchange sessions.")
+    parser.add_argument("--requests", "-n", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
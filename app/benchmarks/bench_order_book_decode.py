@@ -0,0 +1,71 @@
+"""
+Decoding a realistic 1000-level depth payload: stdlib JSON plus a list of float tuples
+per level (the current clients) versus orjson plus tuples, versus the fast path that
+hands only the needed levels to NumPy straight from the response bytes.
+
+    python -m app.benchmarks.bench_order_book_decode [--iterations 2000] [--depth 20]
+
+`--depth 0` decodes the whole book.
+"""
+import argparse
+import json
+import statistics
+import time
+from typing import Callable, List
+
+import orjson
+
+from app.trade.order_book.fast_decode import decode_levels
+
+PAYLOAD = json.dumps({
+    "lastUpdateId": 1027024,
+    "E": 1589436922972,
+    "T": 1589436922959,
+    "bids": [[f"{30000 - i * 0.1:.1f}", f"{0.001 + (i % 97) * 0.137:.3f}"] for i in range(1000)],
+    "asks": [[f"{30000.1 + i * 0.1:.1f}", f"{0.002 + (i % 89) * 0.211:.3f}"] for i in range(1000)],
+}).encode()
+
+
+def stdlib_tuples(raw: bytes, depth: int):
+    data = json.loads(raw)
+    return (
+        [(float(price), float(qty)) for price, qty in data["bids"][:depth]],
+        [(float(price), float(qty)) for price, qty in data["asks"][:depth]],
+    )
+
+
+def orjson_tuples(raw: bytes, depth: int):
+    data = orjson.loads(raw)
+    return (
+        [(float(price), float(qty)) for price, qty in data["bids"][:depth]],
+        [(float(price), float(qty)) for price, qty in data["asks"][:depth]],
+    )
+
+
+def fast_arrays(raw: bytes, depth: int):
+    return decode_levels(raw, b'"bids"', depth), decode_levels(raw, b'"asks"', depth)
+
+
+def _measure(decode: Callable, depth: int, iterations: int) -> List[float]:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        decode(PAYLOAD, depth)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    return timings
+
+
+def main(iterations: int, depth: int):
+    print(f"payload={len(PAYLOAD) / 1024:.0f}KiB levels=1000/side depth={depth or 'all'}")
+    depth = depth or None
+    for label, decode in (("stdlib", stdlib_tuples), ("orjson", orjson_tuples), ("numpy", fast_arrays)):
+        timings = _measure(decode, depth, iterations)
+        print(f"{label:<8} mean={statistics.mean(timings):8.1f}us  p50={statistics.median(timings):8.1f}us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark order-book decoding paths.")
+    parser.add_argument("--iterations", "-n", type=int, default=2000)
+    parser.add_argument("--depth", "-d", type=int, default=20, help="levels kept per side (0 = whole book)")
+    args = parser.parse_args()
+    main(args.iterations, args.depth)
@@ -0,0 +1,79 @@
+"""
+Time per signal of the pre-trade risk gate with every limit enabled, against a book of
+open positions across several venues: single `check` calls, and `check_batch` over a scan's
+worth of signals at once. Also times `on_fill`, which keeps the indexes up to date.
+
+    python -m app.benchmarks.bench_risk_engine [--positions 5000] [--signals 100000] [--batch 500]
+"""
+import argparse
+import random
+import time
+
+from app.trade.entities.signal import Signal, SignalAction
+from app.trade.risk.risk_engine import RiskEngine, RiskLimits
+
+EXCHANGES = ["kraken", "binance", "deribit", "bybit", "okx"]
+
+
+def build_engine(positions: int, symbols: int, rng: random.Random) -> RiskEngine:
+    engine = RiskEngine(RiskLimits(
+        min_confidence=0.0001,
+        max_order_notional=50_000,
+        max_symbol_notional=100_000,
+        max_exchange_notional=50_000_000,
+        max_total_notional=200_000_000,
+        max_open_positions=positions * 2,
+        max_positions_per_exchange=positions,
+        cooldown_seconds=60
+    ))
+    for _ in range(positions):
+        engine.on_fill(
+            rng.choice(EXCHANGES), f"SYM{rng.randrange(symbols)}USDT",
+            rng.choice([SignalAction.BUY, SignalAction.SELL]), rng.uniform(100, 20_000), now=0.0
+        )
+    return engine
+
+
+def main(positions: int, signals: int, batch: int):
+    rng = random.Random(1)
+    symbols = positions * 2
+    engine = build_engine(positions, symbols, rng)
+    stream = [
+        Signal(
+            f"SYM{rng.randrange(symbols)}USDT",
+            rng.choice([SignalAction.BUY, SignalAction.SELL]),
+            confidence=rng.uniform(0, 0.01),
+            metadata={"exchange": rng.choice(EXCHANGES), "notional": rng.uniform(100, 60_000)}
+        )
+        for _ in range(signals)
+    ]
+
+    started = time.perf_counter()
+    for signal in stream:
+        engine.check(signal, now=1000.0)
+    single = (time.perf_counter() - started) / signals
+
+    started = time.perf_counter()
+    for i in range(0, signals, batch):
+        engine.check_batch(stream[i:i + batch], now=1000.0)
+    batched = (time.perf_counter() - started) / signals
+
+    started = time.perf_counter()
+    for signal in stream:
+        engine.on_fill(signal.metadata["exchange"], signal.symbol, signal.action, signal.metadata["notional"], now=1000.0)
+    fills = (time.perf_counter() - started) / signals
+
+    print(f"positions={positions} signals={signals} batch={batch}")
+    print(f"check        {single * 1e6:6.2f} us/signal")
+    print(f"check_batch  {batched * 1e6:6.2f} us/signal")
+    print(f"on_fill      {fills * 1e6:6.2f} us/fill")
+    print(f"rejections   {dict(sorted(engine.rejections.items()))}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the pre-trade risk engine.")
+    parser.add_argument("--positions", "-p", type=int, default=5000, help="open positions before the run")
+    parser.add_argument("--signals", "-n", type=int, default=100_000)
+    parser.add_argument("--batch", "-b", type=int, default=500, help="signals per check_batch call")
+    args = parser.parse_args()
+    main(args.positions, args.signals, args.batch)
@@ -0,0 +1,83 @@
+import asyncio
+import json
+from typing import Dict, Optional, Tuple
+
+
+class StubExchangeServer:
+    """
+    Minimal HTTP/1.1 keep-alive server that answers every GET with a canned JSON payload.
+    Used by the benchmarks to stand in for an exchange REST API on localhost.
+    """
+
+    def __init__(self, routes: Dict[str, object], host: str = "127.0.0.1", port: int = 0):
+        """
+        :param routes: Map of request path (without query string) to a JSON-serialisable payload.
+        """
+        self.routes = {path: json.dumps(payload).encode() for path, payload in routes.items()}
+        self.host = host
+        self.port = port
+        self.connections = 0
+        self.requests = 0
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> "StubExchangeServer":
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "StubExchangeServer":
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                path, keep_alive = request
+                self.requests += 1
+                body = self.routes.get(path)
+                status = "200 OK" if body is not None else "404 Not Found"
+                body = body if body is not None else b"{}"
+                writer.write(
+                    f"HTTP/1.1 {status}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple[str, bool]]:
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        _, target, _ = request_line.decode().split(" ", 2)
+        keep_alive = True
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode().partition(":")
+            if name.strip().lower() == "connection" and value.strip().lower() == "close":
+                keep_alive = False
+        return target.split("?", 1)[0], keep_alive
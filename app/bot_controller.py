@@ -1,14 +1,20 @@
 import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+import time
+from typing import List, Dict, Any, Optional, Set
 from datetime import datetime
 from app.scrapers.scraper_interface import Scraper
 from app.parsers.parser_interface import Parser
 from app.handlers.handler_interface import Handler
+from app.handlers.handler_dispatcher import HandlerDispatcher, HandlerOptions
 from app.state import BotState
 
 logger = logging.getLogger(__name__)
 
+FIXED_DELAY = "fixed_delay"  # sleep poll_interval after each cycle; the period is interval + cycle time
+FIXED_RATE = "fixed_rate"  # start cycles on a monotonic grid of poll_interval; overruns skip ticks
+DEFAULT_STOP_TIMEOUT = 10.0  # seconds stop() lets cycles in progress finish before cancelling them
+
 class BotController:
     """Manages the lifecycle and execution of the scraping bot."""
     
@@ -17,14 +23,52 @@ class BotController:
                  parser: Parser,
                  handlers: List[Handler],
                  state: BotState,
-                 poll_interval: int = 60):
+                 poll_interval: int = 60,
+                 scheduler: Optional[Any] = None,
+                 schedule: str = FIXED_DELAY,
+                 pipelined: bool = False,
+                 max_in_flight: int = 2,
+                 handler_options: Optional[Dict[Handler, HandlerOptions]] = None,
+                 default_handler_options: Optional[HandlerOptions] = None,
+                 stop_timeout: float = DEFAULT_STOP_TIMEOUT):
+        """
+        :param scheduler: Decides how long to wait between cycles (e.g. a `FundingScheduler`,
+            via `seconds_until_next_run()`); without one the bot polls every `poll_interval` seconds.
+        :param schedule: `FIXED_DELAY` (default) or `FIXED_RATE`, which keeps cycles on a drift-free
+            grid and counts the ticks an overrunning cycle misses.
+        :param pipelined: Fetch the next cycle while the previous one is still parsed and handled.
+            Handling stays in cycle order.
+        :param max_in_flight: Cycles fetched but not yet handled, in pipelined mode; the next fetch
+            waits for a slot.
+        :param handler_options: Timeout and optional bounded queue per handler (keyed by instance).
+            Handlers run concurrently, each isolated from the others' errors and timeouts.
+        :param default_handler_options: Options of handlers missing from `handler_options`.
+        :param stop_timeout: How long `stop()` waits for the cycles in progress (fetched data still
+            being parsed or handled) to finish; cycles still running after that are cancelled.
+        """
+        if schedule not in (FIXED_DELAY, FIXED_RATE):
+            raise ValueError(f"Unknown schedule: {schedule}")
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
         self.scraper = scraper
         self.parser = parser
         self.handlers = handlers
+        self.dispatcher = HandlerDispatcher(handlers, handler_options, default_handler_options, metrics=state.metrics)
         self.state = state
         self.poll_interval = poll_interval
+        self.scheduler = scheduler
+        self.schedule = schedule
+        self.pipelined = pipelined
+        self.max_in_flight = max_in_flight
+        self.stop_timeout = stop_timeout
         self.is_running = False
         self.task: Optional[asyncio.Task] = None
+        self.in_flight = 0
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._pipeline_tail: Optional[asyncio.Task] = None
+        self._cycles: Set[asyncio.Task] = set()  # pipelined cycles still being handled
+        self._next_tick = 0.0
+        self._in_cycle = False  # the main loop is fetching (or, unpipelined, handling) a cycle
         
     async def start(self):
         """Start the bot controller."""
@@ -41,7 +85,7 @@ class BotController:
         logger.info("✅ Bot controller started successfully")
     
     async def stop(self):
-        """Stop the bot controller."""
+        """Stop the bot controller, letting cycles in progress finish within `stop_timeout`."""
         if not self.is_running:
             logger.warning("Bot is not running")
             return
@@ -50,12 +94,27 @@ class BotController:
         self.is_running = False
         self.state.set_running(False)
         
+        deadline = time.monotonic() + self.stop_timeout
         if self.task:
+            if self._in_cycle:
+                # The loop exits on its own once the cycle in progress is done
+                await asyncio.wait([self.task], timeout=self.stop_timeout)
             self.task.cancel()
             try:
                 await self.task
             except asyncio.CancelledError:
                 pass
+        cycles = list(self._cycles)
+        if cycles:
+            await asyncio.wait(cycles, timeout=max(0.0, deadline - time.monotonic()))
+        unfinished = [cycle for cycle in cycles if not cycle.done()]
+        if unfinished:
+            logger.warning(f"⚠️ Cancelling {len(unfinished)} cycle(s) still being handled after {self.stop_timeout}s")
+        for cycle in unfinished:
+            cycle.cancel()
+        await asyncio.gather(*cycles, return_exceptions=True)
+        self._pipeline_tail = None
+        await self.dispatcher.stop()
         
         logger.info("✅ Bot controller stopped")
     
@@ -73,17 +132,27 @@ class BotController:
     
     async def _main_loop(self):
         """Main execution loop for the bot."""
-        logger.info(f"🔄 Starting main loop with {self.poll_interval}s intervals")
+        logger.info(f"🔄 Starting main loop with {self.poll_interval}s intervals ({self.schedule}{', pipelined' if self.pipelined else ''})")
+        self._next_tick = time.monotonic()
         
         while self.is_running:
             try:
                 if not self.state.is_paused:
-                    await self._execute_cycle()
+                    self._in_cycle = True
+                    try:
+                        if self.pipelined:
+                            await self._start_pipelined_cycle()
+                        else:
+                            await self._execute_cycle()
+                    finally:
+                        self._in_cycle = False
                 else:
                     logger.debug("Bot is paused, skipping cycle")
+                if not self.is_running:
+                    break
                 
                 # Wait for next cycle
-                await asyncio.sleep(self.poll_interval)
+                await asyncio.sleep(self._next_delay())
                 
             except asyncio.CancelledError:
                 logger.info("Main loop cancelled")
@@ -93,34 +162,108 @@ class BotController:
                 # Continue running despite errors
                 await asyncio.sleep(self.poll_interval)
     
+    def _next_delay(self) -> float:
+        if self.scheduler is not None:
+            return self.scheduler.seconds_until_next_run()
+        if self.schedule != FIXED_RATE or self.poll_interval <= 0:
+            return self.poll_interval
+        # Next slot of the grid started at the first cycle, however long this cycle took
+        now = time.monotonic()
+        self._next_tick += self.poll_interval
+        if now > self._next_tick:
+            missed = int((now - self._next_tick) // self.poll_interval) + 1
+            self._next_tick += missed * self.poll_interval
+            self.state.add_missed_ticks(missed)
+            logger.warning(f"⏭️ Cycle overran its slot, skipped {missed} tick(s)")
+        return self._next_tick - now
+
     async def _execute_cycle(self):
         """Execute one complete scraping cycle."""
         cycle_start = datetime.now()
+        started = time.monotonic()
+        raw_data = await self._fetch()
+        if raw_data is not None:
+            await self._process(raw_data, cycle_start, started)
+
+    async def _start_pipelined_cycle(self):
+        """
+        Fetch one cycle and hand it to a background task for parsing and handling, so the next
+        fetch can start while it runs. Returns once the fetch is done.
+        """
+        await self._slots.acquire()
+        self.in_flight += 1
+        cycle_start = datetime.now()
+        started = time.monotonic()
+        try:
+            raw_data = await self._fetch()
+        except BaseException:
+            self._release_slot()
+            raise
+        if raw_data is None:
+            self._release_slot()
+            return
+        self._pipeline_tail = asyncio.create_task(
+            self._finish_pipelined_cycle(raw_data, cycle_start, started, self._pipeline_tail)
+        )
+        self._cycles.add(self._pipeline_tail)
+        self._pipeline_tail.add_done_callback(self._cycles.discard)
+
+    async def _finish_pipelined_cycle(self, raw_data: Any, cycle_start: datetime, started: float,
+                                      previous: Optional[asyncio.Task]):
+        try:
+            if previous is not None:
+                await asyncio.wait([previous])  # keep handlers in cycle order
+            await self._process(raw_data, cycle_start, started)
+        finally:
+            self._release_slot()
+
+    def _release_slot(self):
+        self.in_flight -= 1
+        self._slots.release()
+
+    async def _fetch(self) -> Optional[Any]:
+        """Fetch raw data; None (after logging) if the fetch failed."""
         logger.info("🔄 Starting scraping cycle...")
-        
+        fetch_started = time.perf_counter()
         try:
-            # Step 1: Fetch raw data
             logger.debug("📡 Fetching data...")
             raw_data = await self.scraper.fetch()
+            self.state.record_stage("fetch", time.perf_counter() - fetch_started)
             logger.debug(f"✅ Fetched {len(str(raw_data))} characters of raw data")
-            
-            # Step 2: Parse data
+            return raw_data
+        except Exception as e:
+            logger.error(f"❌ Error in scraping cycle: {e}", exc_info=True)
+            self.state.record_stage("fetch", time.perf_counter() - fetch_started, error=True)
+            self.state.increment_error_count()
+            return None
+
+    async def _process(self, raw_data: Any, cycle_start: datetime, started: float):
+        """Parse the fetched data and run the handlers."""
+        stage, stage_started = "parse", time.perf_counter()
+        try:
             logger.debug("🔍 Parsing data...")
             parsed_data = await self.parser.parse(raw_data)
+            self.state.record_stage(stage, time.perf_counter() - stage_started)
             logger.debug("✅ Data parsed successfully")
             
-            # Step 3: Process with handlers
             logger.debug("💾 Processing with handlers...")
-            for handler in self.handlers:
-                await handler.handle(parsed_data)
+            stage, stage_started = "handle", time.perf_counter()
+            errors = self.dispatcher.errors
+            await self.dispatcher.dispatch(parsed_data)
+            handler_errors = self.dispatcher.errors - errors
+            for _ in range(handler_errors):
+                self.state.increment_error_count()
+            self.state.record_stage(stage, time.perf_counter() - stage_started, error=handler_errors > 0)
             
             # Update state
-            cycle_duration = (datetime.now() - cycle_start).total_seconds()
+            cycle_duration = time.monotonic() - started
             self.state.update_last_cycle(cycle_start, cycle_duration)
+            self.state.record_stage("cycle", cycle_duration)
             
             logger.info(f"✅ Cycle completed in {cycle_duration:.2f}s")
             
         except Exception as e:
+            self.state.record_stage(stage, time.perf_counter() - stage_started, error=True)
             logger.error(f"❌ Error in scraping cycle: {e}", exc_info=True)
             self.state.increment_error_count()
     
@@ -132,5 +275,11 @@ class BotController:
             "last_cycle": self.state.last_cycle_time,
             "cycle_duration": self.state.last_cycle_duration,
             "error_count": self.state.error_count,
-            "poll_interval": self.poll_interval
+            "poll_interval": self.poll_interval,
+            "schedule": self.schedule,
+            "missed_ticks": self.state.missed_ticks,
+            "pipelined": self.pipelined,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "handlers": self.dispatcher.stats()
         } 
\ No newline at end of file
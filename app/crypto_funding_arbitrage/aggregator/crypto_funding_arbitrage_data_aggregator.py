@@ -1,21 +1,195 @@
+import asyncio
+import time
 from app.trade.exchanges.exchange_client import ExchangeClient
-from typing import List
+from typing import Dict, List, Optional
+from app.trade.entities.funding_rate import FundingRate
+from app.trade.streams.market_data_table import MarketDataTable
+from app.trade.history.history_writer import HistoryWriter
+from app.metrics import MetricsRegistry, shared_metrics_registry
 from app.crypto_funding_arbitrage.entities.crypto_funding_arbitrage_data import CryptoFundingArbitrageData
 
+DEFAULT_SYMBOL_TIMEOUT = 15.0  # seconds, covers queueing for a request slot plus all three legs
+DEFAULT_MAX_TICK_AGE = 30.0  # seconds a streamed funding rate is trusted before falling back to REST
+
+SYMBOL_FETCH_SECONDS = "symbol_fetch_seconds"
+SYMBOL_FETCH_ERRORS = "symbol_fetch_errors_total"
+
 class CryptoFundingArbitrageDataAggregator:
-    def __init__(self, exchange_client: ExchangeClient, symbols: List[str]):
+    def __init__(
+        self,
+        exchange_client: ExchangeClient,
+        symbols: List[str],
+        concurrent: bool = False,
+        max_concurrency: Optional[int] = None,
+        symbol_timeout: float = DEFAULT_SYMBOL_TIMEOUT,
+        market_data_table: Optional[MarketDataTable] = None,
+        max_tick_age: float = DEFAULT_MAX_TICK_AGE,
+        history_writer: Optional[HistoryWriter] = None,
+        metrics: Optional[MetricsRegistry] = None
+    ):
+        """
+        :param concurrent: Fetch every leg of every symbol at once instead of one request at a time.
+        :param max_concurrency: Cap on in-flight requests to the exchange (defaults to the client's `max_concurrency`).
+        :param symbol_timeout: Deadline for one symbol's funding rate, order book and fees in concurrent mode.
+        :param market_data_table: Streamed latest values; fresh funding rates are read from here instead of REST.
+        :param max_tick_age: Seconds after which a streamed funding rate is considered stale.
+        :param history_writer: Records every fetched funding rate and order book; streamed rates are recorded by the table.
+        :param metrics: Where each symbol's fetch time (all legs) and failures are recorded.
+        """
         self.exchange_client = exchange_client
         self.symbols = symbols
+        self.concurrent = concurrent
+        self.max_concurrency = max_concurrency or exchange_client.max_concurrency
+        self.symbol_timeout = symbol_timeout
+        self.market_data_table = market_data_table
+        self.max_tick_age = max_tick_age
+        self.history_writer = history_writer
+        self.metrics = metrics if metrics is not None else shared_metrics_registry()
 
     async def fetch_all(self) -> List[CryptoFundingArbitrageData]:  
+        # Each scan is a new cycle: bulk payloads are fetched once and then served from a snapshot
+        self.exchange_client.start_cycle()
+        streamed = self._streamed_funding_rates()
+        rest_symbols = [symbol for symbol in self.symbols if symbol not in streamed]
+        if self.concurrent:
+            return await self._fetch_all_concurrent(streamed, rest_symbols)
+
+        # Venues with a bulk endpoint answer every symbol's funding rate in one request
+        funding_rates = None
+        if rest_symbols and self.exchange_client.has_bulk_funding_rates:
+            funding_rates = await self._fetch_funding_rates(rest_symbols)  # None: bulk failed, go per symbol
         results = []
         for symbol in self.symbols:
+            started = time.perf_counter()
             try:
-                funding_rate = await self.exchange_client.fetch_funding_rate(symbol)
+                if symbol in streamed:
+                    funding_rate = streamed[symbol]
+                elif funding_rates is not None:
+                    funding_rate = self._funding_rate_for(symbol, funding_rates)
+                else:
+                    funding_rate = await self.exchange_client.fetch_funding_rate(symbol)
                 order_book = await self.exchange_client.fetch_order_book(symbol)
                 fees = await self.exchange_client.fetch_fees(symbol)
-                results.append(CryptoFundingArbitrageData(funding_rate, order_book, fees))
+                if symbol not in streamed:
+                    self._record_funding_rate(funding_rate)
+                self._record_order_book(order_book)
+                results.append(CryptoFundingArbitrageData(funding_rate, order_book, fees, exchange=self.exchange_client.name))
+                self._record_symbol_fetch(symbol, started)
             except Exception as e:
                 print(f"Error fetching {symbol}: {e}")
+                self._record_symbol_fetch(symbol, started, error=True)
                 continue  # skip appending
-        return results
\ No newline at end of file
+        return results
+
+    async def _fetch_all_concurrent(
+        self,
+        streamed: Dict[str, FundingRate],
+        rest_symbols: List[str]
+    ) -> List[CryptoFundingArbitrageData]:
+        """
+        Fan out the network legs of all symbols behind one semaphore for this exchange.
+        Results keep the order of `self.symbols`; failed symbols carry `error` instead of data.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def bounded_funding_rates():
+            async with semaphore:
+                return await self._fetch_funding_rates(rest_symbols)
+
+        # One bulk funding request shared by every symbol, in flight alongside the books and fees
+        funding_task = None
+        if rest_symbols and self.exchange_client.has_bulk_funding_rates:
+            funding_task = asyncio.ensure_future(bounded_funding_rates())
+        try:
+            return list(await asyncio.gather(
+                *(self._fetch_symbol(symbol, semaphore, funding_task, streamed.get(symbol)) for symbol in self.symbols)
+            ))
+        finally:
+            if funding_task:
+                funding_task.cancel()
+
+    async def _fetch_symbol(
+        self,
+        symbol: str,
+        semaphore: asyncio.Semaphore,
+        funding_task: Optional["asyncio.Future[Dict[str, FundingRate]]"],
+        streamed_funding_rate: Optional[FundingRate]
+    ) -> CryptoFundingArbitrageData:
+        async def bounded(fetch):
+            async with semaphore:
+                return await fetch(symbol)
+
+        async def funding_rate_leg() -> FundingRate:
+            if streamed_funding_rate is not None:
+                return streamed_funding_rate
+            funding_rates = await asyncio.shield(funding_task) if funding_task is not None else None
+            if funding_rates is None:
+                return await bounded(self.exchange_client.fetch_funding_rate)
+            return self._funding_rate_for(symbol, funding_rates)
+
+        started = time.perf_counter()
+        try:
+            funding_rate, order_book, fees = await asyncio.wait_for(
+                asyncio.gather(
+                    funding_rate_leg(),
+                    bounded(self.exchange_client.fetch_order_book),
+                    self.exchange_client.fetch_fees(symbol)  # static per client: no request, so no slot
+                ),
+                timeout=self.symbol_timeout
+            )
+            if streamed_funding_rate is None:
+                self._record_funding_rate(funding_rate)
+            self._record_order_book(order_book)
+            self._record_symbol_fetch(symbol, started)
+            return CryptoFundingArbitrageData(funding_rate, order_book, fees, symbol=symbol, exchange=self.exchange_client.name)
+        except asyncio.TimeoutError:
+            error = f"timed out after {self.symbol_timeout}s"
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        print(f"Error fetching {symbol}: {error}")
+        self._record_symbol_fetch(symbol, started, error=True)
+        return CryptoFundingArbitrageData(
+            None, None, None, symbol=symbol, error=error, exchange=self.exchange_client.name
+        )
+
+    def _streamed_funding_rates(self) -> Dict[str, FundingRate]:
+        if self.market_data_table is None:
+            return {}
+        rates = {}
+        for symbol in self.symbols:
+            tick = self.market_data_table.get_funding_rate(self.exchange_client.name, symbol, max_age=self.max_tick_age)
+            if tick is not None:
+                rates[symbol] = FundingRate(symbol=symbol, funding_rate=tick.funding_rate, timestamp=tick.timestamp)
+        return rates
+
+    async def _fetch_funding_rates(self, symbols: List[str]) -> Optional[Dict[str, FundingRate]]:
+        """
+        One bulk funding request, or None if it failed so callers fall back to the per-symbol endpoint.
+        """
+        try:
+            return await self.exchange_client.fetch_funding_rates(symbols)
+        except Exception as e:
+            print(f"Error fetching funding rates, falling back to per-symbol requests: {e}")
+            return None
+
+    def _funding_rate_for(self, symbol: str, funding_rates: Dict[str, FundingRate]) -> FundingRate:
+        funding_rate = funding_rates.get(symbol)
+        if funding_rate is None:
+            raise ValueError(f"No funding rate returned for {symbol}")
+        return funding_rate
+
+    def _record_symbol_fetch(self, symbol: str, started: float, error: bool = False):
+        labels = {"exchange": self.exchange_client.name, "symbol": symbol}
+        self.metrics.histogram(SYMBOL_FETCH_SECONDS, "Duration of one symbol's fetch, all legs", **labels).record(
+            time.perf_counter() - started
+        )
+        if error:
+            self.metrics.counter(SYMBOL_FETCH_ERRORS, "Symbol fetches that failed", **labels).inc()
+
+    def _record_funding_rate(self, funding_rate: FundingRate):
+        if self.history_writer is not None:
+            self.history_writer.record_funding_rate(self.exchange_client.name, funding_rate)
+
+    def _record_order_book(self, order_book):
+        if self.history_writer is not None:
+            self.history_writer.record_order_book(self.exchange_client.name, order_book)
@@ -0,0 +1,96 @@
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional
+from app.trade.exchanges import get_exchange_by_name
+from app.trade.exchanges.exchange_client import ExchangeClient
+from app.trade.exchanges.session_pool import ExchangeSessionPool
+from app.trade.symbols import get_symbols_by_exchange
+from app.trade.streams.market_data_table import MarketDataTable
+from app.trade.history.history_writer import HistoryWriter
+from app.metrics import MetricsRegistry, shared_metrics_registry
+from app.crypto_funding_arbitrage.aggregator.crypto_funding_arbitrage_data_aggregator import CryptoFundingArbitrageDataAggregator
+from app.crypto_funding_arbitrage.entities.crypto_funding_arbitrage_data import CryptoFundingArbitrageData
+
+EXCHANGE_SCAN_SECONDS = "exchange_scan_seconds"
+EXCHANGE_SCAN_ERRORS = "exchange_scan_errors_total"
+
+class MultiExchangeDataAggregator:
+    """
+    Scans several venues at once in one event loop and merges their results.
+    Each venue gets its own client, symbol universe and bounded fan-out, so the scan takes as
+    long as the slowest venue rather than the sum of all of them.
+    """
+
+    def __init__(
+        self,
+        exchange_names: List[str],
+        symbols_by_exchange: Optional[Dict[str, List[str]]] = None,
+        market_data_table: Optional[MarketDataTable] = None,
+        client_factory: Callable[[str], ExchangeClient] = get_exchange_by_name,
+        history_writer: Optional[HistoryWriter] = None,
+        session_pool: Optional[ExchangeSessionPool] = None,
+        metrics: Optional[MetricsRegistry] = None
+    ):
+        """
+        :param symbols_by_exchange: Override the symbol universe per venue (defaults to `app.trade.symbols`).
+        :param client_factory: Builds an unopened client for a venue name.
+        :param history_writer: Records the fetched funding rates and order books of every venue.
+        :param session_pool: Long-lived open clients to scan with; without one each scan opens and closes its own.
+        :param metrics: Where each venue's scan time and failures (and each symbol's fetch time) are recorded.
+        """
+        self.exchange_names = exchange_names
+        self.symbols_by_exchange = symbols_by_exchange or {}
+        self.market_data_table = market_data_table
+        self.client_factory = client_factory
+        self.history_writer = history_writer
+        self.session_pool = session_pool
+        self.metrics = metrics if metrics is not None else shared_metrics_registry()
+
+    async def fetch_all(self) -> List[CryptoFundingArbitrageData]:
+        """
+        Results of every venue, in `exchange_names` order. A venue that fails as a whole
+        contributes one entry carrying the error instead of failing the scan.
+        """
+        results = await asyncio.gather(
+            *(self._fetch_exchange(name) for name in self.exchange_names),
+            return_exceptions=True
+        )
+        merged = []
+        for name, result in zip(self.exchange_names, results):
+            if isinstance(result, Exception):
+                error = str(result) or type(result).__name__
+                print(f"Error scanning {name}: {error}")
+                merged.append(CryptoFundingArbitrageData(None, None, None, symbol="*", exchange=name, error=error))
+                continue
+            merged.extend(result)
+        return merged
+
+    async def _fetch_exchange(self, name: str) -> List[CryptoFundingArbitrageData]:
+        started = time.perf_counter()
+        try:
+            return await self._fetch_exchange_symbols(name)
+        except Exception:
+            self.metrics.counter(EXCHANGE_SCAN_ERRORS, "Venue scans that failed as a whole", exchange=name).inc()
+            raise
+        finally:
+            self.metrics.histogram(EXCHANGE_SCAN_SECONDS, "Duration of one venue's scan", exchange=name).record(
+                time.perf_counter() - started
+            )
+
+    async def _fetch_exchange_symbols(self, name: str) -> List[CryptoFundingArbitrageData]:
+        symbols = self.symbols_by_exchange.get(name) or get_symbols_by_exchange(name)
+        if self.session_pool is not None:
+            return await self._scan(await self.session_pool.client(name), symbols)
+        async with self.client_factory(name) as exchange_client:
+            return await self._scan(exchange_client, symbols)
+
+    async def _scan(self, exchange_client: ExchangeClient, symbols: List[str]) -> List[CryptoFundingArbitrageData]:
+        aggregator = CryptoFundingArbitrageDataAggregator(
+            exchange_client,
+            symbols,
+            concurrent=True,
+            market_data_table=self.market_data_table,
+            history_writer=self.history_writer,
+            metrics=self.metrics
+        )
+        return await aggregator.fetch_all()
@@ -0,0 +1,170 @@
+import asyncio
+import pytest
+from datetime import datetime, timezone
+
+from app.crypto_funding_arbitrage.aggregator.crypto_funding_arbitrage_data_aggregator import CryptoFundingArbitrageDataAggregator
+from app.trade.exchanges.exchange_client import ExchangeClient
+from app.trade.entities.fees import Fees
+from app.trade.entities.order_book import OrderBook
+from app.trade.entities.funding_rate import FundingRate
+
+
+class FakeExchangeClient(ExchangeClient):
+    """In-memory exchange whose calls sleep `delay` seconds; symbols in `failing`/`hanging` misbehave."""
+
+    def __init__(self, delay=0.05, failing=(), hanging=()):
+        super().__init__()
+        self.delay = delay
+        self.failing = set(failing)
+        self.hanging = set(hanging)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _call(self, symbol):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(60 if symbol in self.hanging else self.delay)
+            if symbol in self.failing:
+                raise ValueError(f"boom {symbol}")
+        finally:
+            self.in_flight -= 1
+
+    async def fetch_funding_rate(self, symbol):
+        await self._call(symbol)
+        return FundingRate(symbol=symbol, funding_rate=0.001, timestamp=datetime.now(timezone.utc))
+
+    async def fetch_order_book(self, symbol):
+        await self._call(symbol)
+        return OrderBook(symbol=symbol, bids=[], asks=[], timestamp=datetime.now(timezone.utc))
+
+    async def fetch_fees(self, symbol):
+        return Fees(maker=0.0002, taker=0.0004)  # static, like every real client
+
+
+SYMBOLS = [f"S{i}USDT" for i in range(10)]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_fetch_is_one_round_trip_and_keeps_order():
+    client = FakeExchangeClient(delay=0.05)
+    aggregator = CryptoFundingArbitrageDataAggregator(client, SYMBOLS, concurrent=True, max_concurrency=30)
+
+    start = asyncio.get_running_loop().time()
+    results = await aggregator.fetch_all()
+    elapsed = asyncio.get_running_loop().time() - start
+
+    assert [r.symbol for r in results] == SYMBOLS
+    assert all(r.error is None for r in results)
+    assert elapsed < 0.05 * 3  # far below the 30 serial round trips
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped_by_semaphore():
+    client = FakeExchangeClient(delay=0.01)
+    aggregator = CryptoFundingArbitrageDataAggregator(client, SYMBOLS, concurrent=True, max_concurrency=4)
+
+    await aggregator.fetch_all()
+
+    assert client.max_in_flight == 4
+
+
+@pytest.mark.asyncio
+async def test_errors_and_timeouts_stay_per_symbol():
+    client = FakeExchangeClient(delay=0.01, failing={"S2USDT"}, hanging={"S5USDT"})
+    aggregator = CryptoFundingArbitrageDataAggregator(
+        client, SYMBOLS, concurrent=True, max_concurrency=30, symbol_timeout=0.2
+    )
+
+    results = await aggregator.fetch_all()
+
+    assert [r.symbol for r in results] == SYMBOLS
+    assert "boom S2USDT" in results[2].error
+    assert "timed out" in results[5].error
+    assert [r.symbol for r in results if r.error is None] == [s for s in SYMBOLS if s not in ("S2USDT", "S5USDT")]
+
+
+class FeesAfterOrderBooksClient(FakeExchangeClient):
+    """Fees only resolve once every order book has been fetched."""
+
+    def __init__(self, symbols):
+        super().__init__(delay=0.001)
+        self.pending_order_books = set(symbols)
+        self.order_books_done = asyncio.Event()
+
+    async def fetch_order_book(self, symbol):
+        order_book = await super().fetch_order_book(symbol)
+        self.pending_order_books.discard(symbol)
+        if not self.pending_order_books:
+            self.order_books_done.set()
+        return order_book
+
+    async def fetch_fees(self, symbol):
+        await self.order_books_done.wait()
+        return await super().fetch_fees(symbol)
+
+
+@pytest.mark.asyncio
+async def test_fees_do_not_take_a_concurrency_slot():
+    client = FeesAfterOrderBooksClient(SYMBOLS)
+    aggregator = CryptoFundingArbitrageDataAggregator(
+        client, SYMBOLS, concurrent=True, max_concurrency=1, symbol_timeout=1.0
+    )
+
+    results = await aggregator.fetch_all()
+
+    assert all(r.error is None for r in results)
+    assert client.max_in_flight == 1
+
+
+class FakeBulkExchangeClient(FakeExchangeClient):
+    """Fake venue with a bulk funding endpoint."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.single_funding_calls = 0
+        self.bulk_funding_calls = 0
+
+    async def fetch_funding_rate(self, symbol):
+        self.single_funding_calls += 1
+        return await super().fetch_funding_rate(symbol)
+
+    async def fetch_funding_rates(self, symbols):
+        self.bulk_funding_calls += 1
+        await asyncio.sleep(self.delay)
+        now = datetime.now(timezone.utc)
+        return {s: FundingRate(symbol=s, funding_rate=0.001, timestamp=now) for s in symbols if s != "S3USDT"}
+
+
+@pytest.mark.parametrize("concurrent", [True, False])
+@pytest.mark.asyncio
+async def test_bulk_funding_endpoint_replaces_per_symbol_calls(concurrent):
+    client = FakeBulkExchangeClient(delay=0.01)
+    aggregator = CryptoFundingArbitrageDataAggregator(client, SYMBOLS, concurrent=concurrent)
+
+    results = await aggregator.fetch_all()
+
+    assert client.bulk_funding_calls == 1
+    assert client.single_funding_calls == 0
+    assert "S3USDT" not in [r.symbol for r in results if r.error is None]
+    assert len([r for r in results if r.error is None]) == len(SYMBOLS) - 1
+
+
+class FailingBulkExchangeClient(FakeBulkExchangeClient):
+    async def fetch_funding_rates(self, symbols):
+        self.bulk_funding_calls += 1
+        raise ConnectionError("bulk endpoint down")
+
+
+@pytest.mark.parametrize("concurrent", [True, False])
+@pytest.mark.asyncio
+async def test_failed_bulk_request_falls_back_to_per_symbol_calls(concurrent):
+    client = FailingBulkExchangeClient(delay=0.01)
+    aggregator = CryptoFundingArbitrageDataAggregator(client, SYMBOLS, concurrent=concurrent)
+
+    results = await aggregator.fetch_all()
+
+    assert client.bulk_funding_calls == 1
+    assert client.single_funding_calls == len(SYMBOLS)
+    assert all(r.error is None for r in results)
+    assert len(results) == len(SYMBOLS)
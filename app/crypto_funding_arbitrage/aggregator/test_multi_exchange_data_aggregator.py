@@ -0,0 +1,73 @@
+import asyncio
+import pytest
+
+from app.crypto_funding_arbitrage.aggregator.multi_exchange_data_aggregator import MultiExchangeDataAggregator
+from app.crypto_funding_arbitrage.aggregator.test_crypto_funding_arbitrage_data_aggregator import FakeExchangeClient
+
+
+class FakeVenue(FakeExchangeClient):
+    def __init__(self, name, delay):
+        super().__init__(delay=delay)
+        self.name = name
+
+    async def open(self):
+        return self  # no real HTTP session for an in-memory venue
+
+
+@pytest.mark.asyncio
+async def test_venues_are_scanned_concurrently_and_merged_in_order():
+    delays = {"kraken": 0.05, "binance": 0.05, "okx": 0.05}
+    symbols = {"kraken": ["PF_XBTUSD"], "binance": ["BTCUSDT", "ETHUSDT"], "okx": ["BTCUSDT"]}
+    aggregator = MultiExchangeDataAggregator(
+        list(delays), symbols_by_exchange=symbols, client_factory=lambda name: FakeVenue(name, delays[name])
+    )
+
+    start = asyncio.get_running_loop().time()
+    results = await aggregator.fetch_all()
+    elapsed = asyncio.get_running_loop().time() - start
+
+    assert [(r.exchange, r.symbol) for r in results] == [
+        ("kraken", "PF_XBTUSD"), ("binance", "BTCUSDT"), ("binance", "ETHUSDT"), ("okx", "BTCUSDT")
+    ]
+    assert all(r.error is None for r in results)
+    assert elapsed < 0.05 * 2  # the slowest venue, not the sum of three
+
+
+@pytest.mark.asyncio
+async def test_failed_venue_becomes_one_error_entry():
+    def factory(name):
+        if name == "deribit":
+            raise ConnectionError("venue unreachable")
+        return FakeVenue(name, 0.01)
+
+    aggregator = MultiExchangeDataAggregator(
+        ["binance", "deribit"], symbols_by_exchange={"binance": ["BTCUSDT"], "deribit": ["BTCUSD"]}, client_factory=factory
+    )
+
+    results = await aggregator.fetch_all()
+
+    assert results[0].error is None
+    assert results[1].exchange == "deribit"
+    assert "unreachable" in results[1].error
+
+
+@pytest.mark.asyncio
+async def test_session_pool_clients_are_reused_across_scans():
+    from app.trade.exchanges.session_pool import ExchangeSessionPool
+
+    built = []
+
+    def factory(name):
+        built.append(name)
+        return FakeVenue(name, 0.0)
+
+    pool = ExchangeSessionPool(factory)
+    aggregator = MultiExchangeDataAggregator(
+        ["binance"], symbols_by_exchange={"binance": ["BTCUSDT"]}, session_pool=pool
+    )
+    for _ in range(3):
+        results = await aggregator.fetch_all()
+        assert results[0].error is None
+    assert built == ["binance"]
+    await pool.aclose()
+    assert pool.names() == []
@@ -0,0 +1,3 @@
+from app.crypto_funding_arbitrage.backtest.backtest_data import BacktestData
+from app.crypto_funding_arbitrage.backtest.backtest_engine import BacktestEngine, BacktestResult
+from app.crypto_funding_arbitrage.backtest.execution_simulator import ExecutionSimulator, SimulatedTrade
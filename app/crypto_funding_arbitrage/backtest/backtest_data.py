@@ -0,0 +1,166 @@
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.trade.entities.array_order_book import ArrayLevels, ArrayOrderBook
+from app.trade.entities.funding_schedule import FundingSchedule
+from app.trade.funding.funding_calendar import FundingCalendar
+from app.trade.history.history_store import DEPTH, FUNDING, HistoryStore
+from app.trade.utilities.epoch_time import from_epoch_us
+from app.crypto_funding_arbitrage.strategies.config import DEFAULT_TAKER_FEE
+
+ARRAY_COLUMNS = (
+    "taker_fees", "funding_intervals", "funding_times_us", "funding_symbol_ids",
+    "funding_rates", "book_times_us", "book_symbol_ids", "book_asks"
+)
+
+
+@dataclass
+class BacktestData:
+    """
+    Historical funding-rate observations and ask-side book snapshots for a symbol universe,
+    as flat columns. Events reference their symbol by index into `symbols`/`exchanges`;
+    times are UTC epoch microseconds. Books are NaN-padded to a common depth.
+
+    Stored as one `.npz` file (`save`/`load`), so a month of a large universe loads in one read,
+    or assembled from the recorded history of a `HistoryStore` (`from_history`).
+    """
+    exchanges: List[str]
+    symbols: List[str]
+    taker_fees: np.ndarray  # float64 per symbol
+    funding_intervals: np.ndarray  # int64 hours per symbol
+    funding_times_us: np.ndarray  # int64
+    funding_symbol_ids: np.ndarray  # int32
+    funding_rates: np.ndarray  # float64
+    book_times_us: np.ndarray  # int64
+    book_symbol_ids: np.ndarray  # int32
+    book_asks: np.ndarray  # float64 (n, depth, 2)
+
+    @classmethod
+    def load(cls, path: str) -> "BacktestData":
+        with np.load(path) as data:
+            return cls(
+                exchanges=data["exchanges"].tolist(),
+                symbols=data["symbols"].tolist(),
+                **{name: data[name] for name in ARRAY_COLUMNS}
+            )
+
+    def save_columns(self, directory: str):
+        """
+        One `.npy` file per column in `directory`, for `open_columns`.
+        """
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "exchanges.npy"), np.array(self.exchanges))
+        np.save(os.path.join(directory, "symbols.npy"), np.array(self.symbols))
+        for name in ARRAY_COLUMNS:
+            np.save(os.path.join(directory, f"{name}.npy"), getattr(self, name))
+
+    @classmethod
+    def open_columns(cls, directory: str) -> "BacktestData":
+        """
+        Memory-map the columns written by `save_columns`. Processes that open the same directory
+        share one copy of the data in the page cache instead of each holding their own.
+        """
+        return cls(
+            exchanges=np.load(os.path.join(directory, "exchanges.npy")).tolist(),
+            symbols=np.load(os.path.join(directory, "symbols.npy")).tolist(),
+            **{name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r") for name in ARRAY_COLUMNS}
+        )
+
+    @classmethod
+    def from_history(
+        cls,
+        store: HistoryStore,
+        start_us: Optional[int] = None,
+        end_us: Optional[int] = None,
+        taker_fees: Optional[Dict[Tuple[str, str], float]] = None,
+        calendar: Optional[FundingCalendar] = None
+    ) -> "BacktestData":
+        """
+        Every symbol with recorded funding rates in [start_us, end_us], with its ask-side depth snapshots.
+
+        :param taker_fees: Fee per (exchange, symbol); others get `DEFAULT_TAKER_FEE`.
+        :param calendar: Funding intervals per symbol (defaults to each venue's default interval).
+        """
+        taker_fees = taker_fees or {}
+        calendar = calendar or FundingCalendar()
+        exchanges, symbols, fees, intervals = [], [], [], []
+        funding_times, funding_ids, funding_rates = [], [], []
+        book_times, book_ids, book_asks = [], [], []
+        for exchange, symbol in store.partitions(FUNDING):
+            funding = store.read(FUNDING, exchange, symbol, start_us, end_us)
+            if not len(funding["time_us"]):
+                continue
+            symbol_id = len(symbols)
+            exchanges.append(exchange)
+            symbols.append(symbol)
+            fees.append(taker_fees.get((exchange, symbol), DEFAULT_TAKER_FEE))
+            intervals.append(calendar.schedule(exchange, symbol).interval_hours)
+            funding_times.append(funding["time_us"])
+            funding_rates.append(funding["funding_rate"])
+            funding_ids.append(np.full(len(funding["time_us"]), symbol_id, dtype=np.int32))
+            books = store.read(DEPTH, exchange, symbol, start_us, end_us)
+            book_times.append(books["time_us"])
+            book_asks.append(books["asks"])
+            book_ids.append(np.full(len(books["time_us"]), symbol_id, dtype=np.int32))
+
+        def joined(arrays, dtype, shape=()):
+            return np.concatenate(arrays).astype(dtype, copy=False) if arrays else np.empty((0,) + shape, dtype=dtype)
+
+        return cls(
+            exchanges=exchanges,
+            symbols=symbols,
+            taker_fees=np.array(fees, dtype=np.float64),
+            funding_intervals=np.array(intervals, dtype=np.int64),
+            funding_times_us=joined(funding_times, np.int64),
+            funding_symbol_ids=joined(funding_ids, np.int32),
+            funding_rates=joined(funding_rates, np.float64),
+            book_times_us=joined(book_times, np.int64),
+            book_symbol_ids=joined(book_ids, np.int32),
+            book_asks=joined(book_asks, np.float64, (store.depth, 2))
+        )
+
+    def save(self, path: str):
+        np.savez(
+            path,
+            exchanges=np.array(self.exchanges),
+            symbols=np.array(self.symbols),
+            taker_fees=self.taker_fees,
+            funding_intervals=self.funding_intervals,
+            funding_times_us=self.funding_times_us,
+            funding_symbol_ids=self.funding_symbol_ids,
+            funding_rates=self.funding_rates,
+            book_times_us=self.book_times_us,
+            book_symbol_ids=self.book_symbol_ids,
+            book_asks=self.book_asks
+        )
+
+    @property
+    def events(self) -> int:
+        return len(self.funding_times_us) + len(self.book_times_us)
+
+    def calendar(self) -> FundingCalendar:
+        """
+        A calendar holding each symbol's historical interval, counted from midnight UTC.
+        """
+        calendar = FundingCalendar()
+        calendar.update(
+            FundingSchedule(exchange=exchange, symbol=symbol, interval_hours=int(interval))
+            for exchange, symbol, interval in zip(self.exchanges, self.symbols, self.funding_intervals.tolist())
+        )
+        return calendar
+
+    def order_book(self, i: int) -> ArrayOrderBook:
+        """
+        Book snapshot `i` as an `OrderBook` (asks only; the strategy prices entry on the asks).
+        """
+        asks = self.book_asks[i]
+        depth = int(np.count_nonzero(~np.isnan(asks[:, 0])))
+        return ArrayOrderBook(
+            symbol=self.symbols[self.book_symbol_ids[i]],
+            bids=ArrayLevels(np.empty((0, 2))),
+            asks=ArrayLevels(asks[:depth]),
+            timestamp=from_epoch_us(self.book_times_us[i])
+        )
@@ -0,0 +1,185 @@
+import copy
+import heapq
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.trade.entities.fees import Fees
+from app.trade.entities.funding_rate import FundingRate
+from app.trade.order_book.slippage import notional_slippages
+from app.crypto_funding_arbitrage.backtest.backtest_data import BacktestData
+from app.crypto_funding_arbitrage.backtest.execution_simulator import ExecutionSimulator, SimulatedTrade
+from app.crypto_funding_arbitrage.entities.crypto_funding_arbitrage_batch import CryptoFundingArbitrageBatch
+from app.crypto_funding_arbitrage.entities.crypto_funding_arbitrage_data import CryptoFundingArbitrageData
+from app.crypto_funding_arbitrage.strategies.config import DEFAULT_ORDER_SIZE_USD, DEFAULT_SLIPPAGE
+from app.crypto_funding_arbitrage.strategies.crypto_funding_arbitrage_strategy import CryptoFundingArbitrageStrategy
+from app.trade.utilities.epoch_time import MICROSECONDS_PER_SECOND, from_epoch_us, microseconds
+
+HOUR_US = 3600 * MICROSECONDS_PER_SECOND
+DAY_US = 24 * HOUR_US
+BOOK_EVENT, FUNDING_EVENT = 0, 1  # at equal times books apply first, so a funding event sees the book of its instant
+
+
+@dataclass
+class BacktestResult:
+    trades: List[SimulatedTrade]
+    summary: Dict[str, Any]
+    events: int
+    elapsed: float
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events / self.elapsed if self.elapsed > 0 else float("inf")
+
+
+class BacktestEngine:
+    """
+    Replays `BacktestData` through `CryptoFundingArbitrageStrategy` and an `ExecutionSimulator`.
+
+    `run` is the reference path: every event in time order, each funding observation evaluated
+    by `strategy.evaluate` against the latest book of its symbol. `run_vectorized` computes the
+    same decisions per symbol with NumPy (slippage for every snapshot at once, `evaluate_batch`
+    for every observation) and only walks the profitable ones in Python; both give the same trades.
+
+    A position opens on a profitable observation, settles at the symbol's next funding time
+    (collecting the last rate observed by then) and is processed once the replay has passed
+    that time; positions still open when the data ends are not reported as trades.
+    """
+
+    def __init__(
+        self,
+        data: BacktestData,
+        strategy: Optional[CryptoFundingArbitrageStrategy] = None,
+        order_size_usd: float = DEFAULT_ORDER_SIZE_USD
+    ):
+        self.data = data
+        # Historical funding intervals, not whatever the live calendar holds today
+        self.strategy = copy.copy(strategy or CryptoFundingArbitrageStrategy())
+        self.strategy.funding_calendar = data.calendar()
+        self.order_size_usd = order_size_usd
+
+    async def run(self) -> BacktestResult:
+        started = time.perf_counter()
+        data = self.data
+        strategy = self.strategy
+        simulator = ExecutionSimulator(self.order_size_usd)
+        taker_fees = data.taker_fees.tolist()
+
+        times = np.concatenate([data.book_times_us, data.funding_times_us])
+        kinds = np.concatenate([
+            np.full(len(data.book_times_us), BOOK_EVENT),
+            np.full(len(data.funding_times_us), FUNDING_EVENT)
+        ])
+        indexes = np.concatenate([np.arange(len(data.book_times_us)), np.arange(len(data.funding_times_us))])
+        order = np.lexsort((kinds, times))
+
+        latest_book: Dict[int, int] = {}
+        last_rate: Dict[int, float] = {}
+        settlements: List[tuple] = []
+
+        def settle(symbol_id: int):
+            exit_slippage = strategy._calculate_slippage(data.order_book(latest_book[symbol_id]))
+            simulator.settle(
+                symbol_id, data.exchanges[symbol_id], data.symbols[symbol_id],
+                last_rate[symbol_id], taker_fees[symbol_id] + exit_slippage
+            )
+
+        for t, kind, i in zip(times[order].tolist(), kinds[order].tolist(), indexes[order].tolist()):
+            while settlements and settlements[0][0] < t:
+                settle(heapq.heappop(settlements)[1])
+            if kind == BOOK_EVENT:
+                latest_book[int(data.book_symbol_ids[i])] = i
+                continue
+
+            symbol_id = int(data.funding_symbol_ids[i])
+            rate = float(data.funding_rates[i])
+            last_rate[symbol_id] = rate
+            if symbol_id not in latest_book or simulator.position(symbol_id) is not None:
+                continue
+            market_data = CryptoFundingArbitrageData(
+                funding_rate=FundingRate(symbol=data.symbols[symbol_id], funding_rate=rate, timestamp=from_epoch_us(t)),
+                order_book=data.order_book(latest_book[symbol_id]),
+                fees=Fees(maker=0.0, taker=taker_fees[symbol_id]),
+                exchange=data.exchanges[symbol_id]
+            )
+            evaluation = await strategy.evaluate(market_data)
+            if not evaluation["is_profitable"]:
+                continue
+            settlement = t + microseconds(strategy._time_to_next_funding(market_data))
+            simulator.open(symbol_id, t, settlement, evaluation["taker_fee"] + evaluation["slippage"])
+            heapq.heappush(settlements, (settlement, symbol_id))
+
+        end = int(times.max()) if len(times) else 0
+        while settlements and settlements[0][0] <= end:
+            settle(heapq.heappop(settlements)[1])
+
+        return self._result(simulator, started)
+
+    def run_vectorized(self) -> BacktestResult:
+        started = time.perf_counter()
+        data = self.data
+        strategy = self.strategy
+        simulator = ExecutionSimulator(self.order_size_usd)
+
+        book_slippages = notional_slippages(data.book_asks, self.order_size_usd)
+        book_slippages = np.where(np.isnan(book_slippages), DEFAULT_SLIPPAGE, np.maximum(book_slippages, 0.0))
+        end = int(max(data.book_times_us.max(initial=0), data.funding_times_us.max(initial=0)))
+
+        settled, still_open = [], []
+        for symbol_id, (exchange, symbol) in enumerate(zip(data.exchanges, data.symbols)):
+            observations = np.flatnonzero(data.funding_symbol_ids == symbol_id)
+            observations = observations[np.argsort(data.funding_times_us[observations], kind="stable")]
+            books = np.flatnonzero(data.book_symbol_ids == symbol_id)
+            books = books[np.argsort(data.book_times_us[books], kind="stable")]
+            observation_times = data.funding_times_us[observations]
+            book_times = data.book_times_us[books]
+
+            # Latest snapshot at or before each observation; observations before the first one are skipped
+            entry_books = np.searchsorted(book_times, observation_times, side="right") - 1
+            has_book = entry_books >= 0
+            funding, times, entry_books = observations[has_book], observation_times[has_book], entry_books[has_book]
+            if not len(funding):
+                continue
+
+            interval = int(data.funding_intervals[symbol_id])
+            time_of_day = times % DAY_US
+            waits = (time_of_day // HOUR_US // interval + 1) * interval * HOUR_US - time_of_day
+            taker_fee = float(data.taker_fees[symbol_id])
+            slippages = book_slippages[books[entry_books]]
+            profitable = strategy.evaluate_batch(CryptoFundingArbitrageBatch(
+                symbols=[symbol] * len(funding),
+                funding_rates=data.funding_rates[funding],
+                taker_fees=np.full(len(funding), taker_fee),
+                slippages=slippages,
+                funding_wait_us=waits
+            )).is_profitable
+
+            previous_settlement = None
+            for t, wait, slippage in zip(times[profitable].tolist(), waits[profitable].tolist(), slippages[profitable].tolist()):
+                if previous_settlement is not None and t <= previous_settlement:
+                    continue  # still holding the previous position
+                settlement = previous_settlement = t + wait
+                if settlement > end:
+                    still_open.append((symbol_id, t, settlement, taker_fee + slippage))
+                    continue
+                rate = float(data.funding_rates[observations[np.searchsorted(observation_times, settlement, side="right") - 1]])
+                exit_slippage = float(book_slippages[books[np.searchsorted(book_times, settlement, side="right") - 1]])
+                settled.append((settlement, symbol_id, t, taker_fee + slippage, rate, taker_fee + exit_slippage))
+
+        for settlement, symbol_id, t, entry_cost, rate, exit_cost in sorted(settled, key=lambda trade: trade[:2]):
+            simulator.open(symbol_id, t, settlement, entry_cost)
+            simulator.settle(symbol_id, data.exchanges[symbol_id], data.symbols[symbol_id], rate, exit_cost)
+        for symbol_id, t, settlement, entry_cost in still_open:
+            simulator.open(symbol_id, t, settlement, entry_cost)
+
+        return self._result(simulator, started)
+
+    def _result(self, simulator: ExecutionSimulator, started: float) -> BacktestResult:
+        return BacktestResult(
+            trades=simulator.trades,
+            summary=simulator.summary(),
+            events=self.data.events,
+            elapsed=time.perf_counter() - started
+        )
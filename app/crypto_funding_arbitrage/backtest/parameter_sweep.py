@@ -0,0 +1,203 @@
+"""
+Searches `CryptoFundingArbitrageStrategy` parameters against recorded market data on every core
+and prints the best combinations.
+
+    python -m app.crypto_funding_arbitrage.backtest.parameter_sweep --data history.npz [--random 200] [--top 20]
+    python -m app.crypto_funding_arbitrage.backtest.parameter_sweep --history ./history [--processes 8]
+"""
+import argparse
+import itertools
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.crypto_funding_arbitrage.backtest.backtest_data import BacktestData
+from app.crypto_funding_arbitrage.backtest.backtest_engine import BacktestEngine
+from app.crypto_funding_arbitrage.strategies.config import (
+    DEFAULT_HOLD_TIME_HOURS,
+    DEFAULT_MAX_HOURS_TO_WAIT,
+    DEFAULT_ORDER_SIZE_USD,
+    DEFAULT_THRESHOLD
+)
+from app.crypto_funding_arbitrage.strategies.crypto_funding_arbitrage_strategy import CryptoFundingArbitrageStrategy
+from app.trade.history.history_store import HistoryStore
+
+PARAMETERS = ("threshold", "hold_time_hours", "max_hours_to_wait", "order_size_usd")
+DEFAULT_GRID = {
+    "threshold": [0.0001, 0.0002, 0.0003, 0.0005, 0.00075, 0.001, 0.002],
+    "hold_time_hours": [1, 4, 8],
+    "max_hours_to_wait": [0.5, 1, 2, 4, 8],
+    "order_size_usd": [100, 1000, 10000],
+}
+DEFAULT_RANK_BY = "pnl_usd"
+
+_worker_data: Optional[BacktestData] = None  # the memory-mapped data of this worker process
+
+
+@dataclass(frozen=True, slots=True)
+class SweepResult:
+    parameters: Dict[str, float]
+    summary: Dict[str, Any]
+    elapsed: float
+
+
+def grid(**values: Sequence[float]) -> List[Dict[str, float]]:
+    """
+    Every combination of the given values; parameters left out keep their `config.py` default.
+    """
+    names = list(values)
+    return [_with_defaults(dict(zip(names, combination))) for combination in itertools.product(*values.values())]
+
+
+def random_search(ranges: Dict[str, Tuple[float, float]], samples: int, seed: Optional[int] = None) -> List[Dict[str, float]]:
+    """
+    `samples` parameter sets drawn uniformly from `(low, high)` per parameter; integer bounds draw integers.
+    """
+    rng = random.Random(seed)
+    sets = []
+    for _ in range(samples):
+        parameters = {}
+        for name, (low, high) in ranges.items():
+            integral = isinstance(low, int) and isinstance(high, int)
+            parameters[name] = rng.randint(low, high) if integral else rng.uniform(low, high)
+        sets.append(_with_defaults(parameters))
+    return sets
+
+
+def evaluate(data: BacktestData, parameters: Dict[str, float]) -> SweepResult:
+    """
+    One vectorised backtest of one parameter set.
+    """
+    started = time.perf_counter()
+    strategy = CryptoFundingArbitrageStrategy(
+        threshold=parameters["threshold"],
+        hold_time_hours=parameters["hold_time_hours"],
+        max_hours_to_wait=parameters["max_hours_to_wait"]
+    )
+    result = BacktestEngine(data, strategy, order_size_usd=parameters["order_size_usd"]).run_vectorized()
+    return SweepResult(parameters=parameters, summary=result.summary, elapsed=time.perf_counter() - started)
+
+
+class ParameterSweep:
+    """
+    Backtests many parameter sets on a process pool.
+
+    The data is written once as `.npy` columns and every worker memory-maps them in its
+    initializer, so the arrays are shared through the page cache rather than pickled per task;
+    only the parameter sets and the summaries cross process boundaries.
+    """
+
+    def __init__(self, data: BacktestData, processes: Optional[int] = None):
+        """
+        :param processes: Worker processes (defaults to every core); 0 runs in this process.
+        """
+        self.data = data
+        self.processes = (os.cpu_count() or 1) if processes is None else processes
+
+    def run(self, parameter_sets: Iterable[Dict[str, float]], rank_by: str = DEFAULT_RANK_BY) -> List[SweepResult]:
+        """
+        Results of every parameter set, best first by `summary[rank_by]`.
+        """
+        parameter_sets = list(parameter_sets)
+        if not self.processes:
+            results = [evaluate(self.data, parameters) for parameters in parameter_sets]
+        else:
+            with tempfile.TemporaryDirectory() as directory:
+                self.data.save_columns(directory)
+                with ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    initializer=_open_worker_data,
+                    initargs=(directory,)
+                ) as pool:
+                    chunksize = max(1, len(parameter_sets) // (self.processes * 4))
+                    results = list(pool.map(_evaluate_in_worker, parameter_sets, chunksize=chunksize))
+        return rank(results, rank_by)
+
+
+def rank(results: Iterable[SweepResult], rank_by: str = DEFAULT_RANK_BY) -> List[SweepResult]:
+    # Parameter sets that never traded have no averages; they sort last
+    return sorted(results, key=lambda result: _score(result, rank_by), reverse=True)
+
+
+def format_table(results: Sequence[SweepResult], top: Optional[int] = None) -> str:
+    rows = results[:top] if top else results
+    header = f"{'#':>4} {'threshold':>10} {'hold_h':>7} {'wait_h':>7} {'size_usd':>9} {'trades':>7} {'win_rate':>9} {'avg_ret':>10} {'pnl_usd':>12}"
+    lines = [header, "-" * len(header)]
+    for i, result in enumerate(rows, 1):
+        p, s = result.parameters, result.summary
+        win_rate = f"{s['win_rate']:.1%}" if s["win_rate"] is not None else "-"
+        avg_return = f"{s['avg_return']:.6f}" if s["avg_return"] is not None else "-"
+        lines.append(
+            f"{i:>4} {p['threshold']:>10.6f} {p['hold_time_hours']:>7g} {p['max_hours_to_wait']:>7g}"
+            f" {p['order_size_usd']:>9g} {s['trades']:>7} {win_rate:>9} {avg_return:>10} {s['pnl_usd']:>12.2f}"
+        )
+    return "\n".join(lines)
+
+
+def _with_defaults(parameters: Dict[str, float]) -> Dict[str, float]:
+    unknown = set(parameters) - set(PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown strategy parameters: {sorted(unknown)}")
+    return {
+        "threshold": DEFAULT_THRESHOLD,
+        "hold_time_hours": DEFAULT_HOLD_TIME_HOURS,
+        "max_hours_to_wait": DEFAULT_MAX_HOURS_TO_WAIT,
+        "order_size_usd": DEFAULT_ORDER_SIZE_USD,
+        **parameters
+    }
+
+
+def _score(result: SweepResult, rank_by: str) -> float:
+    value = result.summary.get(rank_by)
+    return float("-inf") if value is None else value
+
+
+def _open_worker_data(directory: str):
+    global _worker_data
+    _worker_data = BacktestData.open_columns(directory)
+
+
+def _evaluate_in_worker(parameters: Dict[str, float]) -> SweepResult:
+    return evaluate(_worker_data, parameters)
+
+
+def main(args):
+    if args.history:
+        data = BacktestData.from_history(HistoryStore(args.history))
+    else:
+        data = BacktestData.load(args.data)
+    if args.random:
+        parameter_sets = random_search({
+            "threshold": (0.00005, 0.003),
+            "hold_time_hours": (1, 8),
+            "max_hours_to_wait": (0.25, 8.0),
+            "order_size_usd": (100.0, 10000.0),
+        }, args.random, seed=args.seed)
+    else:
+        parameter_sets = grid(**DEFAULT_GRID)
+
+    sweep = ParameterSweep(data, processes=args.processes)
+    started = time.perf_counter()
+    results = sweep.run(parameter_sets, rank_by=args.rank_by)
+    print(
+        f"{len(results)} parameter sets over {len(data.symbols)} symbols and {data.events:,} events"
+        f" in {time.perf_counter() - started:.1f}s on {sweep.processes or 1} process(es)\n"
+    )
+    print(format_table(results, args.top))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sweep funding arbitrage strategy parameters over recorded data.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--data", type=str, help="BacktestData .npz file")
+    source.add_argument("--history", type=str, help="HistoryStore directory")
+    parser.add_argument("--random", type=int, default=0, help="random search with this many samples instead of the grid")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--processes", "-p", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--rank-by", type=str, default=DEFAULT_RANK_BY, choices=["pnl_usd", "total_return", "avg_return", "win_rate"])
+    parser.add_argument("--top", type=int, default=20)
+    main(parser.parse_args())
@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+
+from app.crypto_funding_arbitrage.backtest import BacktestData, BacktestEngine
+from app.crypto_funding_arbitrage.strategies.crypto_funding_arbitrage_strategy import CryptoFundingArbitrageStrategy
+
+HOUR = 3600 * 10 ** 6
+DAY0 = 1_714_521_600 * 10 ** 6  # 2024-05-01 00:00 UTC
+
+
+def book(best, size=10.0, depth=3):
+    asks = np.full((4, 2), np.nan)
+    asks[:depth, 0] = best + np.arange(depth) * 0.1
+    asks[:depth, 1] = size
+    return asks
+
+
+def handmade() -> BacktestData:
+    # One symbol: books at 05:00 and 07:30, funding observed at 05:30 (spike), 06:00, 07:59 and 09:00
+    return BacktestData(
+        exchanges=["binance"],
+        symbols=["BTCUSDT"],
+        taker_fees=np.array([0.0004]),
+        funding_intervals=np.array([8]),
+        funding_times_us=np.array([DAY0 + 5 * HOUR + HOUR // 2, DAY0 + 6 * HOUR, DAY0 + 8 * HOUR - 60 * 10 ** 6, DAY0 + 9 * HOUR]),
+        funding_symbol_ids=np.zeros(4, dtype=np.int32),
+        funding_rates=np.array([0.005, 0.004, 0.003, 0.0001]),
+        book_times_us=np.array([DAY0 + 5 * HOUR, DAY0 + 7 * HOUR + HOUR // 2]),
+        book_symbol_ids=np.zeros(2, dtype=np.int32),
+        book_asks=np.stack([book(100.0, size=5.0), book(101.0, size=5.0)])
+    )
+
+
+def random_data(seed: int) -> BacktestData:
+    rng = np.random.default_rng(seed)
+    symbols, observations, snapshots = 4, 400, 120
+    asks = np.full((snapshots, 5, 2), np.nan)
+    depths = rng.integers(0, 6, size=snapshots)
+    for i, depth in enumerate(depths):
+        asks[i, :depth, 0] = 100.0 + np.arange(depth) * 0.05
+        asks[i, :depth, 1] = rng.uniform(0.5, 4.0, size=depth)
+    return BacktestData(
+        exchanges=["binance", "kraken", "bybit", "okx"],
+        symbols=["A", "B", "C", "D"],
+        taker_fees=np.array([0.0004, 0.0002, 0.0006, 0.0005]),
+        funding_intervals=np.array([8, 1, 8, 4]),
+        funding_times_us=DAY0 + rng.integers(0, 3 * 24 * 60, size=observations) * 60 * 10 ** 6,
+        funding_symbol_ids=rng.integers(0, symbols, size=observations).astype(np.int32),
+        funding_rates=rng.choice([0.0001, 0.001, 0.003, 0.006, -0.002], size=observations),
+        book_times_us=DAY0 + rng.integers(0, 3 * 24 * 60, size=snapshots) * 60 * 10 ** 6,
+        book_symbol_ids=rng.integers(0, symbols, size=snapshots).astype(np.int32),
+        book_asks=asks
+    )
+
+
+@pytest.mark.asyncio
+async def test_replay_opens_and_settles_positions():
+    engine = BacktestEngine(handmade(), CryptoFundingArbitrageStrategy(threshold=0.0005, max_hours_to_wait=4))
+    result = await engine.run()
+
+    # Enters at 05:30 on the 05:00 book, holds through 08:00 and collects the 07:59 rate
+    (trade,) = result.trades
+    assert trade.entry_time_us == DAY0 + 5 * HOUR + HOUR // 2
+    assert trade.settlement_time_us == DAY0 + 8 * HOUR
+    assert trade.funding_rate == 0.003
+    assert trade.net_return == pytest.approx(0.003 - trade.entry_cost - trade.exit_cost)
+    assert trade.exit_cost > 0.0004
+    assert result.summary["trades"] == 1 and result.events == 6
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("seed", [1, 2, 3])
+async def test_vectorized_matches_reference(seed):
+    engine = BacktestEngine(random_data(seed), CryptoFundingArbitrageStrategy(threshold=0.0005, max_hours_to_wait=4))
+
+    reference = await engine.run()
+    fast = engine.run_vectorized()
+
+    assert reference.trades
+    assert fast.trades == reference.trades
+    assert fast.summary == reference.summary
+
+
+def test_round_trips_through_npz(tmp_path):
+    data = handmade()
+    data.save(tmp_path / "history.npz")
+    loaded = BacktestData.load(tmp_path / "history.npz")
+
+    assert loaded.symbols == data.symbols
+    np.testing.assert_array_equal(loaded.book_asks, data.book_asks)
+    assert BacktestEngine(loaded).run_vectorized().trades == BacktestEngine(data).run_vectorized().trades
+
+
+def test_backtest_data_from_history_store(tmp_path):
+    from app.trade.history import DEPTH, FUNDING, HistoryStore
+
+    data = handmade()
+    store = HistoryStore(str(tmp_path), depth=4)
+    store.append(FUNDING, "binance", "BTCUSDT", {
+        "time_us": data.funding_times_us,
+        "funding_rate": data.funding_rates,
+        "mark_price": np.full(len(data.funding_times_us), np.nan)
+    })
+    store.append(DEPTH, "binance", "BTCUSDT", {
+        "time_us": data.book_times_us,
+        "bids": np.full_like(data.book_asks, np.nan),
+        "asks": data.book_asks
+    })
+
+    loaded = BacktestData.from_history(store, taker_fees={("binance", "BTCUSDT"): 0.0004})
+    strategy = CryptoFundingArbitrageStrategy(threshold=0.0005, max_hours_to_wait=4)
+    assert loaded.symbols == ["BTCUSDT"] and loaded.funding_intervals.tolist() == [8]
+    assert BacktestEngine(loaded, strategy).run_vectorized().trades == BacktestEngine(data, strategy).run_vectorized().trades
@@ -0,0 +1,42 @@
+import numpy as np
+
+from app.crypto_funding_arbitrage.backtest import BacktestData
+from app.crypto_funding_arbitrage.backtest.parameter_sweep import ParameterSweep, format_table, grid, random_search
+from app.crypto_funding_arbitrage.backtest.test_backtest_engine import random_data
+from app.crypto_funding_arbitrage.strategies.config import DEFAULT_ORDER_SIZE_USD
+
+
+def test_grid_fills_defaults():
+    sets = grid(threshold=[0.001, 0.002], max_hours_to_wait=[1, 4])
+    assert len(sets) == 4
+    assert all(parameters["order_size_usd"] == DEFAULT_ORDER_SIZE_USD for parameters in sets)
+    assert {(p["threshold"], p["max_hours_to_wait"]) for p in sets} == {(0.001, 1), (0.001, 4), (0.002, 1), (0.002, 4)}
+
+
+def test_random_search_is_seeded_and_bounded():
+    ranges = {"threshold": (0.0001, 0.001), "hold_time_hours": (1, 8)}
+    first, second = random_search(ranges, 20, seed=3), random_search(ranges, 20, seed=3)
+    assert first == second
+    assert all(0.0001 <= p["threshold"] <= 0.001 and p["hold_time_hours"] in range(1, 9) for p in first)
+
+
+def test_columns_round_trip_memory_mapped(tmp_path):
+    data = random_data(5)
+    data.save_columns(str(tmp_path))
+    opened = BacktestData.open_columns(str(tmp_path))
+    assert isinstance(opened.book_asks, np.memmap)
+    assert opened.symbols == data.symbols and opened.exchanges == data.exchanges
+    assert np.array_equal(opened.book_asks, data.book_asks, equal_nan=True)
+
+
+def test_process_pool_matches_serial_and_ranks():
+    data = random_data(11)
+    parameter_sets = grid(threshold=[0.0005, 0.002, 0.005], max_hours_to_wait=[1, 8])
+    pooled = ParameterSweep(data, processes=2).run(parameter_sets)
+    serial = ParameterSweep(data, processes=0).run(parameter_sets)
+
+    assert [result.parameters for result in pooled] == [result.parameters for result in serial]
+    assert [result.summary for result in pooled] == [result.summary for result in serial]
+    pnls = [result.summary["pnl_usd"] for result in pooled]
+    assert pnls == sorted(pnls, reverse=True)
+    assert len(format_table(pooled, top=3).splitlines()) == 5
@@ -0,0 +1,88 @@
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from app.crypto_funding_arbitrage.utility.format_duration import format_duration
+from app.trade.utilities.epoch_time import microseconds
+
+
+@dataclass
+class CryptoFundingArbitrageBatch:
+    """
+    Columnar inputs for `CryptoFundingArbitrageStrategy.evaluate_batch`, one row per symbol.
+    """
+    symbols: List[str]
+    funding_rates: np.ndarray  # float64
+    taker_fees: np.ndarray  # float64
+    slippages: np.ndarray  # float64
+    funding_wait_us: np.ndarray  # int64 microseconds from each funding timestamp to the next settlement
+
+    @classmethod
+    def from_columns(
+        cls,
+        symbols: Sequence[str],
+        funding_rates: Sequence[float],
+        taker_fees: Sequence[float],
+        slippages: Sequence[float],
+        times_to_funding: Sequence[timedelta]
+    ) -> "CryptoFundingArbitrageBatch":
+        return cls(
+            symbols=list(symbols),
+            funding_rates=np.asarray(funding_rates, dtype=np.float64),
+            taker_fees=np.asarray(taker_fees, dtype=np.float64),
+            slippages=np.asarray(slippages, dtype=np.float64),
+            funding_wait_us=np.fromiter(
+                (microseconds(delta) for delta in times_to_funding),
+                dtype=np.int64,
+                count=len(times_to_funding)
+            )
+        )
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+
+@dataclass
+class CryptoFundingArbitrageBatchEvaluation:
+    """
+    Columnar result of `evaluate_batch`; `to_dicts()` gives the same dicts as `evaluate`.
+    """
+    symbols: List[str]
+    funding_rates: np.ndarray
+    taker_fees: np.ndarray
+    slippages: np.ndarray
+    net_returns: np.ndarray
+    breakeven_hours: np.ndarray
+    time_to_funding_hours: np.ndarray
+    is_profitable: np.ndarray  # bool
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        columns = zip(
+            self.symbols,
+            self.funding_rates.tolist(),
+            self.taker_fees.tolist(),
+            self.slippages.tolist(),
+            self.net_returns.tolist(),
+            self.breakeven_hours.tolist(),
+            self.time_to_funding_hours.tolist(),
+            self.is_profitable.tolist()
+        )
+        return [
+            {
+                "symbol": symbol,
+                "funding_rate": funding_rate,
+                "taker_fee": taker_fee,
+                "slippage": slippage,
+                "net_return": net_return,
+                "breakeven_hours": breakeven_hours,
+                "breakeven_human": format_duration(breakeven_hours),
+                "time_to_funding_hours": wait_hours,
+                "is_profitable": is_profitable
+            }
+            for symbol, funding_rate, taker_fee, slippage, net_return, breakeven_hours, wait_hours, is_profitable in columns
+        ]
+
+    def __len__(self) -> int:
+        return len(self.symbols)
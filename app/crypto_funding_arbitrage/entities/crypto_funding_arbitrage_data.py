@@ -1,10 +1,18 @@
 from dataclasses import dataclass
+from typing import Optional
 from app.trade.entities.funding_rate import FundingRate
 from app.trade.entities.order_book import OrderBook
 from app.trade.entities.fees import Fees
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CryptoFundingArbitrageData:
-    funding_rate: FundingRate
-    order_book: OrderBook
-    fees: Fees
\ No newline at end of file
+    funding_rate: Optional[FundingRate]
+    order_book: Optional[OrderBook]
+    fees: Optional[Fees]
+    symbol: Optional[str] = None
+    error: Optional[str] = None  # set instead of the market data when fetching the symbol failed
+    exchange: Optional[str] = None  # venue the data came from; tells results apart in multi-exchange scans
+
+    def __post_init__(self):
+        if self.symbol is None and self.funding_rate is not None:
+            object.__setattr__(self, "symbol", self.funding_rate.symbol)
\ No newline at end of file
@@ -0,0 +1,139 @@
+from dataclasses import dataclass
+from itertools import islice
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from app.trade.entities.array_order_book import ArrayLevels, ArrayOrderBook
+from app.trade.entities.fees import Fees
+from app.trade.entities.funding_rate import FundingRate
+from app.crypto_funding_arbitrage.entities.crypto_funding_arbitrage_data import CryptoFundingArbitrageData
+from app.crypto_funding_arbitrage.entities.crypto_funding_arbitrage_batch import CryptoFundingArbitrageBatch
+from app.trade.funding.funding_calendar import FundingCalendar, shared_funding_calendar
+from app.trade.utilities.epoch_time import epoch_us, from_epoch_us, microseconds
+
+DEFAULT_SNAPSHOT_DEPTH = 20
+
+
+@dataclass(slots=True)
+class MarketSnapshot:
+    """
+    One scan of the whole universe as struct-of-arrays: a few contiguous columns instead of
+    a `CryptoFundingArbitrageData`, `FundingRate`, `Fees` and `OrderBook` (plus level tuples)
+    per symbol. Order books are kept to `depth` levels per side, padded with NaN.
+
+    Rows that failed to fetch keep their error and `valid[i]` is False. Timestamps are stored
+    as UTC epoch microseconds.
+    """
+    exchanges: List[Optional[str]]
+    symbols: List[str]
+    errors: List[Optional[str]]
+    valid: np.ndarray  # bool
+    funding_rates: np.ndarray  # float64
+    funding_times_us: np.ndarray  # int64
+    maker_fees: np.ndarray  # float64
+    taker_fees: np.ndarray  # float64
+    bids: np.ndarray  # float64 (n, depth, 2)
+    asks: np.ndarray  # float64 (n, depth, 2)
+    book_depths: np.ndarray  # int32 (n, 2) levels actually present: bids, asks
+    book_times_us: np.ndarray  # int64
+
+    @classmethod
+    def from_market_data(
+        cls,
+        market_data_list: Sequence[CryptoFundingArbitrageData],
+        depth: int = DEFAULT_SNAPSHOT_DEPTH
+    ) -> "MarketSnapshot":
+        n = len(market_data_list)
+        snapshot = cls(
+            exchanges=[market_data.exchange for market_data in market_data_list],
+            symbols=[market_data.symbol for market_data in market_data_list],
+            errors=[market_data.error for market_data in market_data_list],
+            valid=np.zeros(n, dtype=bool),
+            funding_rates=np.full(n, np.nan),
+            funding_times_us=np.zeros(n, dtype=np.int64),
+            maker_fees=np.full(n, np.nan),
+            taker_fees=np.full(n, np.nan),
+            bids=np.full((n, depth, 2), np.nan),
+            asks=np.full((n, depth, 2), np.nan),
+            book_depths=np.zeros((n, 2), dtype=np.int32),
+            book_times_us=np.zeros(n, dtype=np.int64)
+        )
+        for i, market_data in enumerate(market_data_list):
+            if market_data.error or None in (market_data.funding_rate, market_data.fees, market_data.order_book):
+                continue
+            snapshot.valid[i] = True
+            snapshot.funding_rates[i] = market_data.funding_rate.funding_rate
+            snapshot.funding_times_us[i] = epoch_us(market_data.funding_rate.timestamp)
+            snapshot.maker_fees[i] = market_data.fees.maker
+            snapshot.taker_fees[i] = market_data.fees.taker if market_data.fees.taker is not None else np.nan
+            order_book = market_data.order_book
+            snapshot.book_times_us[i] = epoch_us(order_book.timestamp)
+            for column, out, levels in ((0, snapshot.bids, order_book.bids), (1, snapshot.asks, order_book.asks)):
+                array = getattr(levels, "array", None)
+                rows = array[:depth] if array is not None else np.asarray(list(islice(levels, depth)), dtype=np.float64).reshape(-1, 2)
+                out[i, :len(rows)] = rows
+                snapshot.book_depths[i, column] = len(rows)
+        return snapshot
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Bytes held by the numeric columns (the symbol/exchange strings are shared with the caller).
+        """
+        return sum(column.nbytes for column in (
+            self.valid, self.funding_rates, self.funding_times_us, self.maker_fees, self.taker_fees,
+            self.bids, self.asks, self.book_depths, self.book_times_us
+        ))
+
+    def market_data(self, i: int) -> CryptoFundingArbitrageData:
+        """
+        Materialise row `i` as the entities the strategies take; order books come back array-backed.
+        """
+        if not self.valid[i]:
+            return CryptoFundingArbitrageData(
+                funding_rate=None, order_book=None, fees=None,
+                symbol=self.symbols[i], error=self.errors[i], exchange=self.exchanges[i]
+            )
+        symbol = self.symbols[i]
+        bid_depth, ask_depth = self.book_depths[i].tolist()
+        taker = float(self.taker_fees[i])
+        return CryptoFundingArbitrageData(
+            funding_rate=FundingRate(
+                symbol=symbol,
+                funding_rate=float(self.funding_rates[i]),
+                timestamp=from_epoch_us(self.funding_times_us[i])
+            ),
+            order_book=ArrayOrderBook(
+                symbol=symbol,
+                bids=ArrayLevels(self.bids[i, :bid_depth]),
+                asks=ArrayLevels(self.asks[i, :ask_depth]),
+                timestamp=from_epoch_us(self.book_times_us[i])
+            ),
+            fees=Fees(maker=float(self.maker_fees[i]), taker=None if np.isnan(taker) else taker),
+            symbol=symbol,
+            exchange=self.exchanges[i]
+        )
+
+    def to_batch(self, slippages: Sequence[float], calendar: Optional[FundingCalendar] = None) -> CryptoFundingArbitrageBatch:
+        """
+        The valid rows as an `evaluate_batch` input; `slippages` holds one value per valid row and
+        the waits until funding come from `calendar` (the process-wide one by default).
+        """
+        calendar = calendar if calendar is not None else shared_funding_calendar()
+        rows = np.flatnonzero(self.valid).tolist()
+        return CryptoFundingArbitrageBatch(
+            symbols=[self.symbols[i] for i in rows],
+            funding_rates=self.funding_rates[rows],
+            taker_fees=self.taker_fees[rows],
+            slippages=np.asarray(slippages, dtype=np.float64),
+            funding_wait_us=np.array([
+                microseconds(calendar.time_to_next_funding(
+                    self.exchanges[i], self.symbols[i], from_epoch_us(self.funding_times_us[i])
+                ))
+                for i in rows
+            ], dtype=np.int64)
+        )
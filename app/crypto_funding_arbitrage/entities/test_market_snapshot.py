@@ -0,0 +1,63 @@
+from dataclasses import FrozenInstanceError
+from datetime import datetime, timezone
+
+import pytest
+
+from app.trade.entities.fees import Fees
+from app.trade.entities.funding_rate import FundingRate
+from app.trade.entities.order_book import OrderBook
+from app.trade.entities.signal import Signal, SignalAction
+from app.crypto_funding_arbitrage.entities.crypto_funding_arbitrage_data import CryptoFundingArbitrageData
+from app.crypto_funding_arbitrage.entities.market_snapshot import MarketSnapshot
+from app.crypto_funding_arbitrage.strategies.crypto_funding_arbitrage_strategy import CryptoFundingArbitrageStrategy
+
+
+def market_data(symbol, rate, hour, asks):
+    timestamp = datetime(2024, 5, 1, hour, 30, 15, 250, tzinfo=timezone.utc)
+    return CryptoFundingArbitrageData(
+        funding_rate=FundingRate(symbol=symbol, funding_rate=rate, timestamp=timestamp),
+        fees=Fees(maker=0.0002, taker=0.0004),
+        order_book=OrderBook(symbol=symbol, bids=[(99.0, 3.0)], asks=asks, timestamp=timestamp),
+        exchange="binance"
+    )
+
+
+UNIVERSE = [
+    market_data("BTCUSDT", 0.002, 7, [(100.0, 5.0), (100.5, 10.0)]),
+    CryptoFundingArbitrageData(funding_rate=None, order_book=None, fees=None, symbol="ETHUSDT", error="timeout"),
+    market_data("SOLUSDT", 0.0001, 15, [(20.0, 100.0)] * 30),
+]
+
+
+def test_entities_are_slotted_and_frozen():
+    rate = UNIVERSE[0].funding_rate
+    assert not hasattr(rate, "__dict__")
+    assert not hasattr(Signal("BTCUSDT", SignalAction.NONE), "__dict__")
+    with pytest.raises(FrozenInstanceError):
+        rate.funding_rate = 0.0
+
+
+def test_snapshot_round_trips_rows():
+    snapshot = MarketSnapshot.from_market_data(UNIVERSE, depth=20)
+
+    assert len(snapshot) == 3
+    assert snapshot.valid.tolist() == [True, False, True]
+    assert snapshot.book_depths.tolist() == [[1, 2], [0, 0], [1, 20]]
+
+    row = snapshot.market_data(0)
+    assert row.funding_rate == UNIVERSE[0].funding_rate
+    assert list(row.order_book.asks) == UNIVERSE[0].order_book.asks
+    assert row.fees == UNIVERSE[0].fees
+    assert row.exchange == "binance"
+    assert snapshot.market_data(1).error == "timeout"
+
+
+@pytest.mark.asyncio
+async def test_snapshot_batch_matches_scalar_evaluation():
+    strategy = CryptoFundingArbitrageStrategy()
+    snapshot = MarketSnapshot.from_market_data(UNIVERSE)
+    valid = [market_data for market_data in UNIVERSE if not market_data.error]
+
+    batch = snapshot.to_batch([strategy._calculate_slippage(market_data.order_book) for market_data in valid])
+
+    assert strategy.evaluate_batch(batch).to_dicts() == [await strategy.evaluate(market_data) for market_data in valid]
@@ -1,35 +1,96 @@
-from typing import Callable
+import time
+from typing import Callable, Optional
 from app.trade.entities.strategy import Strategy
 from app.trade.entities.signal import SignalAction
 from app.crypto_funding_arbitrage.entities.crypto_funding_arbitrage_data import CryptoFundingArbitrageData
+from app.crypto_funding_arbitrage.executors.evaluation_cache import EvaluationCache, shared_evaluation_cache
+from app.metrics import MetricsRegistry, shared_metrics_registry
+import importlib.util
 import json
+
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+EVALUATE_SECONDS = "strategy_evaluate_seconds"
+SYMBOLS_EVALUATED = "strategy_symbols_evaluated_total"
+
 class CryptoFundingArbitrageStrategyExecutor:
-    def __init__(self, strategy: Strategy):
+    def __init__(
+        self,
+        strategy: Strategy,
+        evaluation_cache: Optional[EvaluationCache] = None,
+        metrics: Optional[MetricsRegistry] = None
+    ):
+        """
+        :param evaluation_cache: Reuse evaluations of unchanged inputs; defaults to the strategy's process-wide cache.
+        :param metrics: Where the duration of each evaluation pass and the symbols it covered are recorded.
+        """
+        name = strategy.name()
         self.strategy = strategy
+        self.evaluation_cache = evaluation_cache if evaluation_cache is not None else shared_evaluation_cache(name)
+        metrics = metrics if metrics is not None else shared_metrics_registry()
+        self._evaluate_latency = metrics.histogram(EVALUATE_SECONDS, "Duration of one evaluation pass over a scan", strategy=name)
+        self._cached = metrics.counter(SYMBOLS_EVALUATED, "Symbols evaluated", strategy=name, result="cached")
+        self._computed = metrics.counter(SYMBOLS_EVALUATED, "Symbols evaluated", strategy=name, result="computed")
 
     async def run(self, 
             market_data_list: list[CryptoFundingArbitrageData], 
             handle_signals: Callable[[str], None] = None
         ):
         signals = []
+        valid = []
         for market_data in market_data_list:
-            # if market_data.error:
-            #     print(f" Error fetching {market_data.funding_rate.symbol}: {market_data.error}")
-            #     continue
+            if market_data.error:
+                print(f" Error fetching {self._label(market_data)}: {market_data.error}")
+                continue
+            valid.append(market_data)
 
-            evaluation = await self.strategy.evaluate(market_data)
+        for market_data, evaluation in zip(valid, await self._evaluate(valid)):
+            label = self._label(market_data)
             # print(f" Evaluation for {market_data.funding_rate.symbol}:")
             print(json.dumps(evaluation, indent=2, default=str))
-            signal = await self.strategy.generate_signal(market_data)
+            signal = self.strategy.signal_from_evaluation(evaluation)
             if signal.action != SignalAction.NONE:
-                print(f" Trade Signal: {signal.action} {signal.symbol} (Confidence: {signal.confidence})")
+                print(f" Trade Signal: {signal.action} {label} (Confidence: {signal.confidence})")
             else:
-                print(f" No trade signal for {market_data.funding_rate.symbol}")
-            signals.append(signal)
+                print(f" No trade signal for {label}")
+            signals.append((label, signal))
 
         if handle_signals:
             response = [
-                f"Signal: {signal.action} {signal.symbol} (Confidence: {signal.confidence})" if signal.action != SignalAction.NONE else f"No signal for `{signal.symbol}`"
-                for signal in signals
+                f"Signal: {signal.action} {label} (Confidence: {signal.confidence})" if signal.action != SignalAction.NONE else f"No signal for `{label}`"
+                for label, signal in signals
             ]
-            handle_signals("\n".join(response))
\ No newline at end of file
+            handle_signals("\n".join(response))
+
+    async def _evaluate(self, market_data_list: list[CryptoFundingArbitrageData]) -> list[dict]:
+        # Only symbols whose inputs changed since they were last seen are recomputed
+        started = time.perf_counter()
+        evaluations = [None] * len(market_data_list)
+        dirty = []
+        for i, market_data in enumerate(market_data_list):
+            fingerprint = self.strategy.evaluation_fingerprint(market_data)
+            evaluations[i] = self.evaluation_cache.get(self._cache_key(market_data), fingerprint)
+            if evaluations[i] is None:
+                dirty.append((i, fingerprint))
+
+        dirty_data = [market_data_list[i] for i, _ in dirty]
+        for (i, fingerprint), evaluation in zip(dirty, await self._compute(dirty_data)):
+            self.evaluation_cache.put(self._cache_key(market_data_list[i]), fingerprint, evaluation)
+            evaluations[i] = evaluation
+        self._evaluate_latency.record(time.perf_counter() - started)
+        self._cached.inc(len(market_data_list) - len(dirty))
+        self._computed.inc(len(dirty))
+        return evaluations
+
+    async def _compute(self, market_data_list: list[CryptoFundingArbitrageData]) -> list[dict]:
+        # One vectorized pass when NumPy is available; identical to evaluating one by one
+        if NUMPY_AVAILABLE and market_data_list:
+            return self.strategy.evaluate_batch(self.strategy.build_batch(market_data_list)).to_dicts()
+        return [await self.strategy.evaluate(market_data) for market_data in market_data_list]
+
+    def _cache_key(self, market_data: CryptoFundingArbitrageData) -> tuple:
+        return market_data.exchange, market_data.symbol
+
+    def _label(self, market_data: CryptoFundingArbitrageData) -> str:
+        # Prefix the venue so merged multi-exchange results stay readable
+        return f"{market_data.exchange}:{market_data.symbol}" if market_data.exchange else market_data.symbol
@@ -0,0 +1,87 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+DEFAULT_MAX_ENTRIES = 4096  # one entry per (exchange, symbol), so this covers every venue's universe
+
+
+class EvaluationCache:
+    """
+    Last evaluation per key (an `(exchange, symbol)` pair), reused while the fingerprint of
+    its inputs is unchanged. Bounded, evicting the least recently used key.
+
+    Cached results are shared with every later hit, so callers must treat them as read-only.
+    """
+
+    def __init__(self, name: str, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.name = name
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Hashable, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, fingerprint: Hashable) -> Optional[Dict[str, Any]]:
+        """
+        The cached evaluation for `key`, or None when there is none or its inputs changed (dirty).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != fingerprint:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, fingerprint: Hashable, evaluation: Dict[str, Any]):
+        with self._lock:
+            self._entries[key] = (fingerprint, evaluation)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            }
+
+
+_shared_caches: Dict[str, EvaluationCache] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_evaluation_cache(name: str) -> EvaluationCache:
+    """
+    The process-wide cache for strategy `name`, so evaluations survive the per-run executors.
+    """
+    with _shared_lock:
+        cache = _shared_caches.get(name)
+        if cache is None:
+            cache = _shared_caches[name] = EvaluationCache(name)
+        return cache
+
+
+def evaluation_cache_metrics() -> Dict[str, Dict[str, Any]]:
+    """
+    Hit/miss counters of every strategy cache in this process.
+    """
+    with _shared_lock:
+        caches = list(_shared_caches.values())
+    return {cache.name: cache.stats() for cache in caches}
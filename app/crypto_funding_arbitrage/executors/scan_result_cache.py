@@ -0,0 +1,135 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from app.metrics import MetricsRegistry, shared_metrics_registry
+from app.trade.exchanges.single_flight import SingleFlight
+
+DEFAULT_MAX_AGE = 15.0  # seconds a finished scan is served to identical requests
+DEFAULT_MAX_ENTRIES = 256
+
+SCANNED = "scanned"  # this request ran the scan
+JOINED = "joined"  # attached to an identical scan already in flight
+CACHED = "cached"  # served from a finished scan inside the freshness window
+
+SCAN_REQUESTS = "scan_requests_total"
+
+
+@dataclass(frozen=True, slots=True)
+class ScanResult:
+    value: Any
+    completed_at: float  # wall clock, for display
+    source: str
+    _completed_monotonic: float
+
+    def age(self) -> float:
+        return max(0.0, time.monotonic() - self._completed_monotonic)
+
+    def describe(self) -> str:
+        if self.source == SCANNED:
+            return "fresh scan"
+        if self.source == JOINED:
+            return "joined a scan already in progress"
+        return f"cached result from {self.age():.0f}s ago"
+
+
+class ScanResultCache:
+    """
+    Whole scan results keyed by exchange, strategy and parameters. Identical requests arriving
+    while a scan runs attach to it (`SingleFlight`), and requests within `max_age` seconds of a
+    finished scan get its result, so exchange traffic does not grow with the number of askers.
+    Failed scans are not cached.
+
+    The in-flight scans are futures of the running loop: use one cache per event loop.
+    """
+
+    def __init__(
+        self,
+        max_age: float = DEFAULT_MAX_AGE,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        metrics: Optional[MetricsRegistry] = None
+    ):
+        """
+        :param metrics: Where requests are counted by how they were answered (scanned, joined, cached).
+        """
+        metrics = metrics if metrics is not None else shared_metrics_registry()
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.scans = 0
+        self.hits = 0
+        self.joined = 0
+        self._single_flight = SingleFlight()
+        self._results: "OrderedDict[Hashable, ScanResult]" = OrderedDict()
+        self._requests = {
+            source: metrics.counter(SCAN_REQUESTS, "Scan requests by how they were answered", result=source)
+            for source in (SCANNED, JOINED, CACHED)
+        }
+
+    async def get_or_scan(
+        self,
+        key: Hashable,
+        scan: Callable[[], Awaitable[Any]],
+        max_age: Optional[float] = None
+    ) -> ScanResult:
+        """
+        A result for `key` no older than `max_age` (defaults to the cache's), running `scan` only
+        when there is neither a fresh result nor an identical scan in flight.
+        """
+        max_age = self.max_age if max_age is None else max_age
+        cached = self._results.get(key)
+        if cached is not None and cached.age() <= max_age:
+            self.hits += 1
+            self._requests[CACHED].inc()
+            self._results.move_to_end(key)
+            return replace(cached, source=CACHED)
+
+        joining = self._single_flight.is_in_flight(key)
+
+        async def run() -> ScanResult:
+            self.scans += 1
+            value = await scan()
+            result = ScanResult(value, time.time(), SCANNED, time.monotonic())
+            self._store(key, result)
+            return result
+
+        result = await self._single_flight.do(key, run)
+        if joining:
+            self.joined += 1
+            self._requests[JOINED].inc()
+            return replace(result, source=JOINED)
+        self._requests[SCANNED].inc()
+        return result
+
+    def clear(self):
+        self._results.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        requests = self.scans + self.hits + self.joined
+        return {
+            "scans": self.scans,
+            "hits": self.hits,
+            "joined": self.joined,
+            "in_flight": self._single_flight.in_flight(),
+            "entries": len(self._results),
+            "saved": round((self.hits + self.joined) / requests, 3) if requests else None,
+        }
+
+    def _store(self, key: Hashable, result: ScanResult):
+        self._results[key] = result
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+
+def scan_key(
+    exchange_names: Tuple[str, ...],
+    strategy,
+    symbols_by_exchange: Optional[Dict[str, list]] = None
+) -> tuple:
+    """
+    Identity of a scan: the venues, the strategy and its parameters, and any symbol override.
+    """
+    symbols = tuple(sorted((name, tuple(symbols)) for name, symbols in (symbols_by_exchange or {}).items()))
+    parameters = strategy.parameters() if hasattr(strategy, "parameters") else ()
+    return tuple(exchange_names), strategy.name(), parameters, symbols
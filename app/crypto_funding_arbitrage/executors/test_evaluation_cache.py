@@ -0,0 +1,78 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.trade.entities.fees import Fees
+from app.trade.entities.funding_rate import FundingRate
+from app.trade.entities.order_book import OrderBook
+from app.crypto_funding_arbitrage.entities.crypto_funding_arbitrage_data import CryptoFundingArbitrageData
+from app.crypto_funding_arbitrage.executors.crypto_funding_arbitrage_strategy_executor import CryptoFundingArbitrageStrategyExecutor
+from app.crypto_funding_arbitrage.executors.evaluation_cache import EvaluationCache
+from app.crypto_funding_arbitrage.strategies.crypto_funding_arbitrage_strategy import CryptoFundingArbitrageStrategy
+
+TIMESTAMP = datetime(2024, 5, 1, 6, 0, tzinfo=timezone.utc)
+
+
+def market_data(symbol, rate=0.0001, asks=((100.0, 50.0),)):
+    return CryptoFundingArbitrageData(
+        funding_rate=FundingRate(symbol=symbol, funding_rate=rate, timestamp=TIMESTAMP),
+        fees=Fees(maker=0.0002, taker=0.0004),
+        order_book=OrderBook(symbol=symbol, bids=[], asks=list(asks), timestamp=TIMESTAMP),
+        exchange="binance"
+    )
+
+
+class CountingStrategy(CryptoFundingArbitrageStrategy):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.evaluated = []
+
+    def build_batch(self, market_data_list):
+        self.evaluated.extend(market_data.symbol for market_data in market_data_list)
+        return super().build_batch(market_data_list)
+
+
+def test_lru_eviction_and_counters():
+    cache = EvaluationCache("test", max_entries=2)
+    cache.put("a", 1, {"v": "a"})
+    cache.put("b", 1, {"v": "b"})
+    assert cache.get("a", 1) == {"v": "a"}  # "a" is now the most recent
+    cache.put("c", 1, {"v": "c"})
+
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 2) is None  # inputs changed
+    assert cache.stats() == {
+        "entries": 2, "max_entries": 2, "hits": 1, "misses": 2, "evictions": 1, "hit_rate": 0.333
+    }
+
+
+@pytest.mark.asyncio
+async def test_only_dirty_symbols_are_recomputed():
+    strategy = CountingStrategy()
+    cache = EvaluationCache("test")
+    executor = CryptoFundingArbitrageStrategyExecutor(strategy, evaluation_cache=cache)
+
+    first = [market_data("BTCUSDT"), market_data("ETHUSDT"), market_data("SOLUSDT")]
+    expected = await executor._evaluate(first)
+    assert strategy.evaluated == ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+
+    strategy.evaluated.clear()
+    second = [market_data("BTCUSDT"), market_data("ETHUSDT", rate=0.0002), market_data("SOLUSDT", asks=((100.0, 1.0),) * 20)]
+    evaluations = await executor._evaluate(second)
+
+    assert strategy.evaluated == ["ETHUSDT", "SOLUSDT"]
+    assert evaluations[0] is expected[0]
+    assert evaluations == [await strategy.evaluate(data) for data in second]
+    assert (cache.hits, cache.misses) == (1, 5)
+
+
+@pytest.mark.asyncio
+async def test_strategy_parameters_are_part_of_the_fingerprint():
+    cache = EvaluationCache("test")
+    data = [market_data("BTCUSDT")]
+    await CryptoFundingArbitrageStrategyExecutor(CryptoFundingArbitrageStrategy(threshold=0.0005), cache)._evaluate(data)
+
+    strict = CryptoFundingArbitrageStrategy(threshold=0.01)
+    await CryptoFundingArbitrageStrategyExecutor(strict, cache)._evaluate(data)
+
+    assert cache.hits == 0
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from app.crypto_funding_arbitrage.executors.scan_result_cache import CACHED, JOINED, SCANNED, ScanResultCache, scan_key
+from app.crypto_funding_arbitrage.strategies.crypto_funding_arbitrage_strategy import CryptoFundingArbitrageStrategy
+
+
+class CountingScan:
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return [f"scan {self.calls}"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_share_one_scan():
+    cache = ScanResultCache(max_age=10)
+    scan = CountingScan()
+
+    results = await asyncio.gather(*(cache.get_or_scan("binance", scan) for _ in range(5)))
+
+    assert scan.calls == 1
+    assert [result.source for result in results] == [SCANNED] + [JOINED] * 4
+    assert all(result.value == ["scan 1"] for result in results)
+    assert cache.stats()["joined"] == 4
+
+
+@pytest.mark.asyncio
+async def test_fresh_results_are_served_with_their_age_then_expire():
+    cache = ScanResultCache(max_age=0.05)
+    scan = CountingScan(delay=0)
+
+    first = await cache.get_or_scan("binance", scan)
+    second = await cache.get_or_scan("binance", scan)
+    assert (first.source, second.source, scan.calls) == (SCANNED, CACHED, 1)
+    assert "ago" in second.describe() and second.age() < 0.05
+
+    await asyncio.sleep(0.06)
+    third = await cache.get_or_scan("binance", scan)
+    assert (third.source, third.value, scan.calls) == (SCANNED, ["scan 2"], 2)
+    # A caller may ask for a tighter window than the cache's
+    assert (await cache.get_or_scan("binance", scan, max_age=0)).source == SCANNED
+
+
+@pytest.mark.asyncio
+async def test_failed_scans_are_not_cached():
+    cache = ScanResultCache(max_age=10)
+
+    async def failing():
+        raise ConnectionError("venue down")
+
+    with pytest.raises(ConnectionError):
+        await cache.get_or_scan("okx", failing)
+    assert (await cache.get_or_scan("okx", CountingScan(delay=0))).source == SCANNED
+
+
+def test_scan_key_includes_strategy_parameters():
+    base = scan_key(("binance",), CryptoFundingArbitrageStrategy(threshold=0.0005))
+    assert base == scan_key(("binance",), CryptoFundingArbitrageStrategy(threshold=0.0005))
+    assert base != scan_key(("binance",), CryptoFundingArbitrageStrategy(threshold=0.001))
+    assert base != scan_key(("binance",), CryptoFundingArbitrageStrategy(threshold=0.0005), {"binance": ["BTCUSDT"]})
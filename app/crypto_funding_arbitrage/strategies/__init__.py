@@ -1,7 +1,8 @@
 from app.crypto_funding_arbitrage.strategies.crypto_funding_arbitrage_strategy import CryptoFundingArbitrageStrategy
 
-def get_strategy_by_name(name: str, exchange):
+def get_strategy_by_name(name: str, exchange=None):
+    # The strategy is venue-agnostic; `exchange` is kept for existing callers
     if name == "cfrashort":
-        return CryptoFundingArbitrageStrategy(exchange)
+        return CryptoFundingArbitrageStrategy()
     else:
         raise ValueError(f"Unknown strategy: {name}")
\ No newline at end of file
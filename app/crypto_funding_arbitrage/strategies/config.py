@@ -8,3 +8,5 @@ DEFAULT_HOLD_TIME_HOURS = 8
 DEFAULT_MAX_HOURS_TO_WAIT = 4
 DEFAULT_ORDER_SIZE_USD = 1000
 DEFAULT_SLIPPAGE = 0.0005  # fallback slippage in case of empty or shallow book
+
+FINGERPRINT_BOOK_DEPTH = 50  # ask levels hashed into the evaluation cache key; fills deeper than this are assumed unchanged
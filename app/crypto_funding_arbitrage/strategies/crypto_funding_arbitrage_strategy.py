@@ -1,10 +1,13 @@
-from typing import Optional
+from datetime import timedelta
+from itertools import islice
+from typing import List, Optional
 
 from app.trade.entities.signal import Signal, SignalAction
 from app.trade.entities.strategy import Strategy
 from app.trade.entities.order_book import OrderBook
+from app.trade.order_book.slippage import BUY, DepthCurve
 from app.crypto_funding_arbitrage.utility.format_duration import format_duration
-from app.crypto_funding_arbitrage.utility.time_to_next_funding_cycle import time_to_next_funding_cycle
+from app.trade.funding.funding_calendar import FundingCalendar, shared_funding_calendar
 from app.crypto_funding_arbitrage.strategies.config import (
     DEFAULT_TAKER_FEE,
     DEFAULT_SLIPPAGE,
@@ -12,7 +15,8 @@ from app.crypto_funding_arbitrage.strategies.config import (
     DEFAULT_HOLD_TIME_HOURS,
     DEFAULT_MAX_HOURS_TO_WAIT,
     DEFAULT_ORDER_SIZE_USD,
-    DEFAULT_SLIPPAGE
+    DEFAULT_SLIPPAGE,
+    FINGERPRINT_BOOK_DEPTH
 )
 from app.crypto_funding_arbitrage.entities.crypto_funding_arbitrage_data import CryptoFundingArbitrageData
 
@@ -22,16 +26,19 @@ class CryptoFundingArbitrageStrategy(Strategy):
         self,
         threshold: float = DEFAULT_THRESHOLD,
         hold_time_hours: int = DEFAULT_HOLD_TIME_HOURS,
-        max_hours_to_wait: int = DEFAULT_MAX_HOURS_TO_WAIT
+        max_hours_to_wait: int = DEFAULT_MAX_HOURS_TO_WAIT,
+        funding_calendar: Optional[FundingCalendar] = None
     ):
         """
         :param threshold: Minimum funding rate to consider an opportunity.
         :param hold_time_hours: Duration needed to qualify for funding.
         :param max_hours_to_wait: Max time until next funding event to still consider entering.
+        :param funding_calendar: Settlement schedule per venue and symbol; defaults to the process-wide calendar.
         """
         self.threshold = threshold
         self.hold_time_hours = hold_time_hours
         self.max_hours_to_wait = max_hours_to_wait
+        self.funding_calendar = funding_calendar if funding_calendar is not None else shared_funding_calendar()
 
 
     def name(self) -> str:
@@ -70,9 +77,90 @@ class CryptoFundingArbitrageStrategy(Strategy):
             )
         }
 
+    def evaluation_fingerprint(self, market_data: CryptoFundingArbitrageData) -> tuple:
+        """
+        Cheap identity of everything `evaluate` reads: funding rate and timestamp, the symbol's funding
+        schedule, fees, the top `FINGERPRINT_BOOK_DEPTH` ask levels (the side slippage walks) and the
+        strategy parameters.
+        Equal fingerprints give equal evaluations.
+        """
+        funding_rate = market_data.funding_rate
+        asks = market_data.order_book.asks
+        array = getattr(asks, "array", None)
+        top_asks = (
+            array[:FINGERPRINT_BOOK_DEPTH].tobytes() if array is not None
+            else tuple(islice(asks, FINGERPRINT_BOOK_DEPTH))
+        )
+        return (
+            funding_rate.funding_rate,
+            funding_rate.timestamp,
+            market_data.fees.taker,
+            hash(top_asks),
+            self.funding_calendar.fingerprint(market_data.exchange, funding_rate.symbol),
+            *self.parameters()
+        )
+
+    def parameters(self) -> tuple:
+        """
+        The tunable parameters, for keys of anything cached per strategy configuration.
+        """
+        return self.threshold, self.hold_time_hours, self.max_hours_to_wait
+
+    def build_batch(self, market_data_list: List[CryptoFundingArbitrageData]) -> "CryptoFundingArbitrageBatch":
+        """
+        Columnar batch for `evaluate_batch`; slippage is estimated here, per order book.
+        """
+        from app.crypto_funding_arbitrage.entities.crypto_funding_arbitrage_batch import CryptoFundingArbitrageBatch
+
+        for market_data in market_data_list:
+            if market_data.fees.taker is None:
+                raise ValueError(f"Taker fee is None for {market_data.funding_rate.symbol}")
+        return CryptoFundingArbitrageBatch.from_columns(
+            symbols=[market_data.funding_rate.symbol for market_data in market_data_list],
+            funding_rates=[market_data.funding_rate.funding_rate for market_data in market_data_list],
+            taker_fees=[market_data.fees.taker for market_data in market_data_list],
+            slippages=[self._calculate_slippage(market_data.order_book) for market_data in market_data_list],
+            times_to_funding=[self._time_to_next_funding(market_data) for market_data in market_data_list]
+        )
+
+    def evaluate_batch(self, batch: "CryptoFundingArbitrageBatch") -> "CryptoFundingArbitrageBatchEvaluation":
+        """
+        `evaluate` for a whole universe in one NumPy pass. Each column is computed with the
+        same operations, in the same order, as the scalar helpers, so results are identical.
+        """
+        import numpy as np
+        from app.crypto_funding_arbitrage.entities.crypto_funding_arbitrage_batch import CryptoFundingArbitrageBatchEvaluation
+        from app.trade.utilities.epoch_time import MICROSECONDS_PER_SECOND
+
+        gross_returns = np.maximum(batch.funding_rates, 0.0)
+        estimated_costs = 2 * np.maximum(batch.taker_fees + batch.slippages, 0.0)
+        net_returns = gross_returns - estimated_costs
+
+        breakeven_hours = np.full(len(batch), np.inf)
+        earning = gross_returns > 0
+        breakeven_hours[earning] = estimated_costs[earning] / (gross_returns[earning] / self.hold_time_hours)
+
+        time_to_funding_hours = batch.funding_wait_us / MICROSECONDS_PER_SECOND / 3600
+
+        return CryptoFundingArbitrageBatchEvaluation(
+            symbols=batch.symbols,
+            funding_rates=batch.funding_rates,
+            taker_fees=batch.taker_fees,
+            slippages=batch.slippages,
+            net_returns=net_returns,
+            breakeven_hours=breakeven_hours,
+            time_to_funding_hours=time_to_funding_hours,
+            is_profitable=(
+                (net_returns > 0) &
+                (batch.funding_rates > self.threshold) &
+                (time_to_funding_hours <= self.max_hours_to_wait)
+            )
+        )
+
     async def generate_signal(self, market_data: CryptoFundingArbitrageData) -> Optional[Signal]:
-        eval_result = await self.evaluate(market_data)
+        return self.signal_from_evaluation(await self.evaluate(market_data))
 
+    def signal_from_evaluation(self, eval_result: dict) -> Signal:
         if eval_result["is_profitable"]:
             return Signal(
                 symbol=eval_result["symbol"],
@@ -106,36 +194,31 @@ class CryptoFundingArbitrageStrategy(Strategy):
         return estimated_cost / funding_per_hour
 
     def _calculate_time_to_next_funding_hours(self, market_data: CryptoFundingArbitrageData) -> float:
-        funding_time = market_data.funding_rate.timestamp
-        wait_delta = time_to_next_funding_cycle(funding_time)
+        wait_delta = self._time_to_next_funding(market_data)
         return wait_delta.total_seconds() / 3600
+
+    def _time_to_next_funding(self, market_data: CryptoFundingArbitrageData) -> timedelta:
+        # The symbol's own schedule on its venue, not one fixed 00/08/16 cycle for everything
+        funding_rate = market_data.funding_rate
+        return self.funding_calendar.time_to_next_funding(market_data.exchange, funding_rate.symbol, funding_rate.timestamp)
     
+    def slippage_curve(self, order_book: OrderBook, order_sizes_usd: List[float]) -> List[float]:
+        """
+        `_calculate_slippage` for several USD order sizes, indexing the asks only once.
+        """
+        if not order_book.asks:
+            return [DEFAULT_SLIPPAGE] * len(order_sizes_usd)
+        curve = DepthCurve.from_levels(order_book.asks, BUY)
+        return [self._clamp_slippage(slippage) for slippage in curve.curve(order_sizes_usd)]
+
     def _calculate_slippage(self, order_book: OrderBook, order_size_usd: float = DEFAULT_ORDER_SIZE_USD) -> float:
         """
         Estimate slippage for a market buy order of a given USD size using the asks side of the order book.
         Slippage is defined as the % difference between the average execution price and the best ask.
         """
-        asks = order_book.asks
-        if not asks:
-            return DEFAULT_SLIPPAGE  # No liquidity? Use fallback.
-
-        total_cost = 0.0
-        remaining_usd = order_size_usd
-        best_price = asks[0][0]
-
-        for price, quantity in asks:
-            level_value = price * quantity
-            if level_value >= remaining_usd:
-                total_cost += price * (remaining_usd / price)
-                remaining_usd = 0
-                break
-            else:
-                total_cost += level_value
-                remaining_usd -= level_value
-
-        if remaining_usd > 0:  # Order size too large for book depth
-            return DEFAULT_SLIPPAGE
+        return self.slippage_curve(order_book, [order_size_usd])[0]
 
-        avg_price = total_cost / order_size_usd
-        slippage = (avg_price - best_price) / best_price
-        return  max(0.0, slippage)
+    def _clamp_slippage(self, slippage: Optional[float]) -> float:
+        if slippage is None:  # Order size too large for book depth
+            return DEFAULT_SLIPPAGE
+        return max(0.0, slippage)
@@ -93,4 +93,40 @@ async def test_not_profitable_due_to_funding_delay():
 
     # So no signal should be generated
     signal = await strategy.generate_signal(market_data)
-    assert signal is None
\ No newline at end of file
+    assert signal is None
+# -------------------------------
+# 🧮 Test 4: evaluate_batch matches evaluate exactly
+# Same scenarios as above plus edge cases, evaluated both ways
+# -------------------------------
+
+def _market_data(symbol, funding_rate, taker, timestamp, asks=()):
+    return CryptoFundingArbitrageData(
+        funding_rate=FundingRate(symbol=symbol, funding_rate=funding_rate, timestamp=timestamp),
+        fees=Fees(maker=0.0002, taker=taker),
+        order_book=OrderBook(symbol=symbol, bids=[], asks=list(asks), timestamp=timestamp),
+    )
+
+@pytest.mark.asyncio
+async def test_evaluate_batch_matches_scalar():
+    strategy = CryptoFundingArbitrageStrategy(threshold=0.0005, max_hours_to_wait=8)
+    day = datetime.now(timezone.utc)
+    market_data_list = [
+        _market_data("BTCUSDT", 0.0012, 0.0003, day.replace(hour=0, minute=1)),
+        _market_data("ETHUSDT", 0.0001, 0.0003, day.replace(hour=1, minute=0)),
+        _market_data("XRPUSDT", 0.002, 0.0003, day.replace(hour=1, minute=0)),
+        _market_data("SOLUSDT", 0.004, 0.0001, day.replace(hour=7, minute=59, second=59, microsecond=999999),
+                     asks=[(100.0, 50.0), (100.1, 80.0)]),
+        _market_data("ADAUSDT", 0.0, 0.0003, day.replace(hour=8, minute=0, second=0, microsecond=0)),
+        _market_data("DOGEUSDT", -0.003, 0.0003, day.replace(hour=16, minute=30)),
+        _market_data("AVAXUSDT", 0.01, 0.0, day.replace(hour=23, minute=59, second=30, microsecond=123456)),
+    ]
+
+    expected = [await strategy.evaluate(market_data) for market_data in market_data_list]
+    batch = strategy.evaluate_batch(strategy.build_batch(market_data_list))
+
+    assert batch.to_dicts() == expected
+    assert batch.is_profitable.tolist() == [result["is_profitable"] for result in expected]
+
+def test_evaluate_batch_empty():
+    strategy = CryptoFundingArbitrageStrategy()
+    assert strategy.evaluate_batch(strategy.build_batch([])).to_dicts() == []
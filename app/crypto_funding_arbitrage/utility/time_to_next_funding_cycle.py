@@ -1,14 +1,8 @@
 from datetime import datetime, timedelta
 
-def time_to_next_funding_cycle(now: datetime) -> timedelta:
-    # Binance cycles: 00:00, 08:00, 16:00 UTC
-    cycle_hours = [0, 8, 16]
-    current_hour = now.hour
+def time_to_next_funding_cycle(now: datetime, interval_hours: int = 8) -> timedelta:
+    # Cycles every `interval_hours` from midnight: 00:00, 08:00, 16:00 UTC for Binance's default 8h
+    next_cycle_hour = (now.hour // interval_hours + 1) * interval_hours
+    next_cycle = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(hours=next_cycle_hour)
 
-    next_cycle_hour = next((h for h in cycle_hours if h > current_hour), cycle_hours[0])
-    next_cycle = now.replace(hour=next_cycle_hour, minute=0, second=0, microsecond=0)
-
-    if next_cycle <= now:
-        next_cycle += timedelta(days=1)
-
-    return next_cycle - now
\ No newline at end of file
+    return next_cycle - now
@@ -0,0 +1,210 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from app.handlers.handler_interface import Handler
+from app.metrics import MetricsRegistry, shared_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HANDLER_TIMEOUT = 30.0  # seconds one handler call may take before it is abandoned
+
+DROP_OLDEST = "drop_oldest"  # a full queue discards its oldest item for the new one
+COALESCE = "coalesce"  # a full queue merges the new item into its newest one (latest wins by default)
+
+HANDLER_SECONDS = "handler_seconds"
+HANDLER_CALLS = "handler_calls_total"
+HANDLER_ERRORS = "handler_errors_total"
+
+
+@dataclass(frozen=True, slots=True)
+class HandlerOptions:
+    """
+    How one handler is dispatched to.
+
+    Without `queue_size` the cycle awaits the handler (alongside the others, up to `timeout`).
+    With it, the cycle only enqueues and a worker task feeds the handler, so a slow sink never
+    holds up the scrape loop; when the queue is full `policy` decides what is lost.
+    """
+    timeout: Optional[float] = DEFAULT_HANDLER_TIMEOUT
+    queue_size: Optional[int] = None
+    policy: str = DROP_OLDEST
+    merge: Optional[Callable[[Any, Any], Any]] = None  # COALESCE: (queued, new) -> item; defaults to new
+
+    def __post_init__(self):
+        if self.policy not in (DROP_OLDEST, COALESCE):
+            raise ValueError(f"Unknown queue policy: {self.policy}")
+        if self.queue_size is not None and self.queue_size < 1:
+            raise ValueError("queue_size must be at least 1")
+
+
+class HandlerRunner:
+    """
+    One handler with its options, its queue (if any) and its counters.
+    """
+
+    def __init__(self, name: str, handler: Handler, options: HandlerOptions, metrics: Optional[MetricsRegistry] = None):
+        metrics = metrics if metrics is not None else shared_metrics_registry()
+        self.name = name
+        self.handler = handler
+        self.options = options
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.cancelled = 0  # calls cut short by stop()
+        self.dropped = 0
+        self.coalesced = 0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+        self._total_latency = 0.0
+        self._queue: Deque[Any] = deque()
+        self._ready: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._latency = metrics.histogram(HANDLER_SECONDS, "Duration of one handler call", handler=name)
+        self._calls = metrics.counter(HANDLER_CALLS, "Handler calls", handler=name)
+        self._errors = metrics.counter(HANDLER_ERRORS, "Handler calls that failed", handler=name, reason="error")
+        self._timeouts = metrics.counter(HANDLER_ERRORS, "Handler calls that failed", handler=name, reason="timeout")
+
+    @property
+    def queued(self) -> bool:
+        return self.options.queue_size is not None
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def enqueue(self, data: Any):
+        """
+        Add `data` to the queue without waiting, applying the policy when it is full.
+        """
+        if self._worker is None or self._worker.done():
+            self._ready = asyncio.Event()
+            self._worker = asyncio.create_task(self._drain())
+        if len(self._queue) >= self.options.queue_size:
+            if self.options.policy == COALESCE:
+                merge = self.options.merge
+                self._queue[-1] = merge(self._queue[-1], data) if merge is not None else data
+                self.coalesced += 1
+                return
+            self._queue.popleft()
+            self.dropped += 1
+        self._queue.append(data)
+        self._ready.set()
+
+    async def run(self, data: Any):
+        """
+        Call the handler once, isolated: errors and timeouts are logged and counted, never raised.
+        """
+        started = time.monotonic()
+        self.calls += 1
+        self._calls.inc()
+        try:
+            await asyncio.wait_for(self.handler.handle(data), timeout=self.options.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self._timeouts.inc()
+            logger.error(f"❌ Handler {self.name} timed out after {self.options.timeout}s")
+        except Exception as e:
+            self.errors += 1
+            self._errors.inc()
+            logger.error(f"❌ Handler {self.name} failed: {e}", exc_info=True)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            latency = time.monotonic() - started
+            self.last_latency = latency
+            self.max_latency = max(self.max_latency, latency)
+            self._total_latency += latency
+            self._latency.record(latency)
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+        self._queue.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        latency = self._latency.summary()
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "cancelled": self.cancelled,
+            "avg_ms": round(self._total_latency / self.calls * 1000, 1) if self.calls else None,
+            "last_ms": round(self.last_latency * 1000, 1),
+            "max_ms": round(self.max_latency * 1000, 1),
+            "p50_ms": latency["p50_ms"],
+            "p95_ms": latency["p95_ms"],
+            "p99_ms": latency["p99_ms"],
+            "queue_depth": len(self._queue) if self.queued else None,
+            "queue_size": self.options.queue_size,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+        }
+
+    async def _drain(self):
+        while True:
+            if not self._queue:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            await self.run(self._queue.popleft())
+
+
+class HandlerDispatcher:
+    """
+    Fans one cycle's parsed data out to every handler at once.
+
+    Direct handlers run concurrently and `dispatch` returns when all of them have finished or
+    timed out; queued handlers are only enqueued. One handler failing, hanging or falling behind
+    never affects the others.
+    """
+
+    def __init__(
+        self,
+        handlers: List[Handler],
+        options: Optional[Dict[Handler, HandlerOptions]] = None,
+        default_options: Optional[HandlerOptions] = None,
+        metrics: Optional[MetricsRegistry] = None
+    ):
+        """
+        :param options: Per-handler options, keyed by handler instance.
+        :param default_options: Options of handlers missing from `options`.
+        :param metrics: Where call latencies and error counts are recorded, per handler name.
+        """
+        options = options or {}
+        default_options = default_options or HandlerOptions()
+        self.runners: List[HandlerRunner] = []
+        names: Dict[str, int] = {}
+        for handler in handlers:
+            name = type(handler).__name__
+            names[name] = names.get(name, 0) + 1
+            if names[name] > 1:
+                name = f"{name}#{names[name]}"
+            self.runners.append(HandlerRunner(name, handler, options.get(handler, default_options), metrics))
+
+    async def dispatch(self, data: Any):
+        direct = []
+        for runner in self.runners:
+            if runner.queued:
+                runner.enqueue(data)
+            else:
+                direct.append(runner.run(data))
+        if direct:
+            await asyncio.gather(*direct)
+
+    @property
+    def errors(self) -> int:
+        return sum(runner.errors + runner.timeouts for runner in self.runners)
+
+    async def stop(self):
+        for runner in self.runners:
+            await runner.stop()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {runner.name: runner.stats() for runner in self.runners}
@@ -0,0 +1,84 @@
+import asyncio
+import time
+
+import pytest
+
+from app.handlers.handler_dispatcher import COALESCE, DROP_OLDEST, HandlerDispatcher, HandlerOptions
+from app.handlers.handler_interface import Handler
+
+
+class RecordingHandler(Handler):
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.seen = []
+
+    async def handle(self, data):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("sink down")
+        self.seen.append(data)
+
+
+@pytest.mark.asyncio
+async def test_handlers_run_concurrently_with_isolated_errors_and_timeouts():
+    slow, fast, broken, hanging = RecordingHandler(0.05), RecordingHandler(0.05), RecordingHandler(fail=True), RecordingHandler(5)
+    dispatcher = HandlerDispatcher(
+        [slow, fast, broken, hanging],
+        options={hanging: HandlerOptions(timeout=0.05)}
+    )
+
+    started = time.monotonic()
+    await dispatcher.dispatch({"n": 1})
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 0.09  # the slowest handler (or timeout), not the sum
+    assert slow.seen == fast.seen == [{"n": 1}]
+    stats = dispatcher.stats()
+    assert (stats["RecordingHandler#3"]["errors"], stats["RecordingHandler#4"]["timeouts"]) == (1, 1)
+    assert dispatcher.errors == 2
+    assert stats["RecordingHandler"]["avg_ms"] >= 50
+
+
+@pytest.mark.asyncio
+async def test_queued_handler_drops_oldest_without_blocking():
+    sink = RecordingHandler(0.03)
+    dispatcher = HandlerDispatcher([sink], options={sink: HandlerOptions(queue_size=2, policy=DROP_OLDEST)})
+
+    started = time.monotonic()
+    await dispatcher.dispatch(0)
+    await asyncio.sleep(0.005)  # the worker takes 0 and is busy with it
+    for n in range(1, 5):
+        await dispatcher.dispatch(n)
+    assert time.monotonic() - started < 0.025  # enqueued only
+    await asyncio.sleep(0.15)
+
+    # 0 was taken by the worker right away; 1 and 2 were pushed out by 3 and 4
+    assert sink.seen == [0, 3, 4]
+    stats = dispatcher.stats()["RecordingHandler"]
+    assert (stats["dropped"], stats["queue_depth"], stats["queue_size"]) == (2, 0, 2)
+    await dispatcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_queued_handler_coalesces_into_newest_item():
+    sink = RecordingHandler(0.03)
+    merge = lambda queued, new: queued + new
+    dispatcher = HandlerDispatcher([sink], options={sink: HandlerOptions(queue_size=1, policy=COALESCE, merge=merge)})
+
+    await dispatcher.dispatch([1])
+    await asyncio.sleep(0.005)
+    for batch in ([2], [3], [4]):
+        await dispatcher.dispatch(batch)
+    await asyncio.sleep(0.1)
+
+    assert sink.seen == [[1], [2, 3, 4]]
+    assert dispatcher.stats()["RecordingHandler"]["coalesced"] == 2
+    await dispatcher.stop()
+
+
+def test_options_are_validated():
+    with pytest.raises(ValueError):
+        HandlerOptions(policy="block")
+    with pytest.raises(ValueError):
+        HandlerOptions(queue_size=0)
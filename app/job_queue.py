@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_PENDING = 20
+
+
+class JobQueueFull(Exception):
+    """Raised by `JobQueue.submit` when `max_pending` jobs are already waiting."""
+
+
+class JobQueue:
+    """
+    One long-lived event loop in a daemon thread, a bounded queue of jobs and a fixed pool of
+    worker tasks that run them.
+
+    `submit` is called from other threads (e.g. telebot's polling thread); it never waits for
+    the loop and either returns the job's queue position or raises `JobQueueFull`. Everything a
+    job creates on the loop (exchange sessions, caches) outlives the job, so later jobs start warm.
+    """
+
+    def __init__(
+        self,
+        run: Callable[[Any], Awaitable[None]],
+        workers: int = DEFAULT_WORKERS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        on_stop: Optional[Callable[[], Awaitable[None]]] = None,
+        name: str = "jobs"
+    ):
+        """
+        :param run: Coroutine function that runs one job on the loop.
+        :param workers: Jobs run at the same time.
+        :param max_pending: Jobs allowed to wait for a worker before submissions are rejected.
+        :param on_stop: Awaited on the loop before it shuts down, e.g. to close sessions.
+        """
+        self.run = run
+        self.workers = workers
+        self.max_pending = max_pending
+        self.on_stop = on_stop
+        self.name = name
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.pending = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "JobQueue":
+        if self.is_running:
+            return self
+        ready = threading.Event()
+
+        def run_loop():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            self.loop = loop
+            self._queue = asyncio.Queue()
+            self._tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+            loop.call_soon(ready.set)
+            try:
+                loop.run_forever()
+            finally:
+                loop.close()
+
+        self._thread = threading.Thread(target=run_loop, name=f"{self.name}-loop", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def submit(self, job: Any) -> int:
+        """
+        Queue `job`; returns its place in line among the jobs waiting for a worker, or 0 when a
+        worker is free and it starts right away. Raises `JobQueueFull` instead of queueing when
+        `max_pending` jobs are already waiting.
+        """
+        if not self.is_running:
+            raise RuntimeError(f"{self.name} queue is not running")
+        with self._lock:
+            # Jobs in `pending` that a free worker is about to pick up are not waiting
+            waiting = self.pending - (self.workers - self.running)
+            if waiting >= self.max_pending:
+                self.rejected += 1
+                raise JobQueueFull(f"{waiting} jobs already waiting")
+            position = waiting + 1 if waiting >= 0 else 0
+            self.pending += 1
+        self.loop.call_soon_threadsafe(self._queue.put_nowait, job)
+        return position
+
+    def run_coroutine(self, coroutine: Awaitable[Any]):
+        """
+        Run a coroutine on the queue's loop from another thread; returns a `concurrent.futures.Future`.
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Cancel the workers (jobs in progress included), run `on_stop`, and stop the loop.
+        """
+        if not self.is_running:
+            return
+
+        async def shutdown():
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            if self.on_stop is not None:
+                await self.on_stop()
+
+        try:
+            self.run_coroutine(shutdown()).result(timeout)
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "running": self.running,
+                "pending": self.pending,
+                "max_pending": self.max_pending,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+            }
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            with self._lock:
+                self.pending -= 1
+                self.running += 1
+            failed = False
+            try:
+                await self.run(job)
+            except asyncio.CancelledError:
+                failed = True  # stopped mid-job
+                raise
+            except Exception as e:
+                failed = True
+                logger.error(f"{self.name} job {job!r} failed: {e}")
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    if failed:
+                        self.failed += 1
+                    else:
+                        self.completed += 1
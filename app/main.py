@@ -2,50 +2,159 @@
 import os
 import asyncio
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from dotenv import load_dotenv
 from telebot import TeleBot
-from typing import Callable
+from typing import Callable, Dict, List, Optional
 from app.trade.entities.signal import Signal
 from app.crypto_funding_arbitrage.strategies import get_strategy_by_name
-from app.trade.exchanges import get_exchange_by_name
 from app.crypto_funding_arbitrage.executors.crypto_funding_arbitrage_strategy_executor import CryptoFundingArbitrageStrategyExecutor
-from app.crypto_funding_arbitrage.aggregator.crypto_funding_arbitrage_data_aggregator import CryptoFundingArbitrageDataAggregator
-from app.trade.symbols.kraken import KRAKEN_SYMBOLS
-from app.trade.symbols.binance import BINANCE_SYMBOLS
+from app.crypto_funding_arbitrage.aggregator.multi_exchange_data_aggregator import MultiExchangeDataAggregator
+from app.trade.symbols import get_symbols_by_exchange
+from app.trade.exchanges import get_exchange_by_name
+from app.trade.funding import FundingScheduler, shared_funding_calendar
+from app.trade.streams import MarketDataTable, get_stream_by_name
+from app.trade.history import HistoryStore, HistoryWriter
+from app.trade.exchanges.session_pool import ExchangeSessionPool
+from app.job_queue import JobQueue, JobQueueFull
+from app.trade.exchanges.rate_limiter import rate_limit_status
+from app.trade.exchanges.request_policy import request_metrics
+from app.crypto_funding_arbitrage.executors.evaluation_cache import evaluation_cache_metrics
+from app.crypto_funding_arbitrage.executors.scan_result_cache import ScanResultCache, scan_key
+from app.crypto_funding_arbitrage.executors.crypto_funding_arbitrage_strategy_executor import EVALUATE_SECONDS
+from app.crypto_funding_arbitrage.aggregator.multi_exchange_data_aggregator import EXCHANGE_SCAN_SECONDS
+from app.crypto_funding_arbitrage.aggregator.crypto_funding_arbitrage_data_aggregator import SYMBOL_FETCH_SECONDS
+from app.metrics import MetricsServer, shared_metrics_registry
 import argparse
 
 DEFAULT_EXCHANGE = "binance"
 DEFAULT_STRATEGY = "cfrashort"
-MAX_THREADS = 10
 
 load_dotenv()
+RUN_WORKERS = int(os.getenv("RUN_WORKERS", "4"))  # /run jobs scanning at the same time
+RUN_QUEUE_SIZE = int(os.getenv("RUN_QUEUE_SIZE", "20"))  # /run jobs allowed to wait for a worker
+SCAN_MAX_AGE = float(os.getenv("SCAN_MAX_AGE", "15"))  # seconds an identical /run is answered from the last scan
+METRICS_PORT = os.getenv("METRICS_PORT")  # serve /metrics on this local port (also --metrics-port)
+SLOWEST_SYMBOLS = 5  # symbols listed by p95 fetch time in /status
 TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
 
 EXCHANGES = ["kraken", "binance", "deribit", "bybit", "okx"]
+ALL_EXCHANGES = "all"
 STRATEGIES = ["cfrashort"]
 
+# Venues streamed over WebSocket in listen mode, with the symbols to subscribe to
+STREAM_SYMBOLS = {name: get_symbols_by_exchange(name) for name in ["binance", "bybit", "okx"]}
+
 bot = TeleBot(TELEGRAM_TOKEN)
+market_data_table: Optional[MarketDataTable] = None  # filled by the streams in listen mode
+history_writer: Optional[HistoryWriter] = None  # set by --record
+run_queue: Optional[JobQueue] = None  # runs /run jobs on one long-lived loop in listen mode
+session_pool = ExchangeSessionPool()  # warm exchange sessions of that loop
+scan_results = ScanResultCache(max_age=SCAN_MAX_AGE)  # identical /run requests share scans on that loop
+# Keeps bot I/O off the loop; one worker so each chat gets its replies in the order they were sent
+telegram_replies = ThreadPoolExecutor(max_workers=1, thread_name_prefix="telegram-reply")
 
 # --- Async Strategy Runner ---
-async def run_async_strategy(exchange_name: str, strategy_name: str, handle_signals: Callable[[str], None]):
-    exchange_client = get_exchange_by_name(exchange_name)
-    symbols = KRAKEN_SYMBOLS if exchange_name == "kraken" else BINANCE_SYMBOLS
+async def run_async_strategy(
+    exchange_name: str,
+    strategy_name: str,
+    handle_signals: Callable[[str], None],
+    market_data_table: Optional[MarketDataTable] = None,
+    symbols_by_exchange: Optional[Dict[str, List[str]]] = None,
+    history_writer: Optional[HistoryWriter] = None,
+    session_pool: Optional[ExchangeSessionPool] = None,
+    scan_results: Optional[ScanResultCache] = None
+):
+    """
+    :param scan_results: Share scans between identical requests; the reply then says how old its result is.
+    """
+    # "all" scans every venue at once; a single venue is the same scan with one entry
+    exchange_names = EXCHANGES if exchange_name == ALL_EXCHANGES else [exchange_name]
+    if symbols_by_exchange is not None:
+        exchange_names = [name for name in exchange_names if name in symbols_by_exchange]
+    strategy = get_strategy_by_name(strategy_name)
+
+    async def scan() -> List[str]:
+        aggregator = MultiExchangeDataAggregator(
+            exchange_names,
+            symbols_by_exchange=symbols_by_exchange,
+            market_data_table=market_data_table,
+            history_writer=history_writer,
+            session_pool=session_pool
+        )
+        market_data_list = await aggregator.fetch_all()
+
+        executor = CryptoFundingArbitrageStrategyExecutor(strategy)
+        replies = []
+        await executor.run(
+            market_data_list, 
+            handle_signals=replies.append
+        )
+        return replies
 
-    aggregator = CryptoFundingArbitrageDataAggregator(exchange_client, symbols)
-    strategy = get_strategy_by_name(strategy_name, exchange_client)
+    if scan_results is None:
+        for reply_message in await scan():
+            handle_signals(reply_message)
+        return
+    result = await scan_results.get_or_scan(scan_key(tuple(exchange_names), strategy, symbols_by_exchange), scan)
+    for reply_message in result.value:
+        handle_signals(f"{reply_message}\n({result.describe()})")
 
-    market_data_list = await aggregator.fetch_all()
 
-    executor = CryptoFundingArbitrageStrategyExecutor(strategy)
-    await executor.run(
-        market_data_list, 
-        handle_signals=handle_signals
+# --- Funding-aware scheduling ---
+async def run_scheduled_strategy(
+    exchange_name: str,
+    strategy_name: str,
+    handle_signals: Callable[[str], None],
+    market_data_table: Optional[MarketDataTable] = None,
+    history_writer: Optional[HistoryWriter] = None
+):
+    """
+    Scan each symbol only in the run-up to its own funding settlement, instead of polling everything.
+    """
+    exchange_names = EXCHANGES if exchange_name == ALL_EXCHANGES else [exchange_name]
+    scheduler = FundingScheduler(
+        shared_funding_calendar(),
+        {name: get_symbols_by_exchange(name) for name in exchange_names},
+        client_factory=get_exchange_by_name,
+        market_data_table=market_data_table
     )
 
+    async def scan(due: Dict[str, List[str]]):
+        await run_async_strategy(
+            exchange_name, strategy_name, handle_signals, market_data_table,
+            symbols_by_exchange=due, history_writer=history_writer
+        )
+
+    await scheduler.run(scan)
+
+
+# --- Streaming market data ---
+def start_market_data_streams(history_writer: Optional[HistoryWriter] = None) -> MarketDataTable:
+    """
+    Run the WebSocket streams on their own event loop in a daemon thread.
+    Scans read the returned table instead of polling REST for funding rates.
+    """
+    table = MarketDataTable(history_writer=history_writer)
+
+    async def run_streams():
+        streams = [get_stream_by_name(name, symbols, table) for name, symbols in STREAM_SYMBOLS.items()]
+        for stream in streams:
+            await stream.start()
+        # A stream that dies must not take the others down with it
+        results = await asyncio.gather(*(stream.task for stream in streams), return_exceptions=True)
+        for stream, result in zip(streams, results):
+            if isinstance(result, Exception):
+                print(f"{stream.name} stream stopped: {result}")
+
+    threading.Thread(target=lambda: asyncio.run(run_streams()), name="market-data-streams", daemon=True).start()
+    return table
+
 
 # --- CLI interaction ---
 def select_cli_option():
-    print("\nAvailable exchanges:", ", ".join(EXCHANGES))
+    print("\nAvailable exchanges:", ", ".join(EXCHANGES + [ALL_EXCHANGES]))
     exchange_name = input("Choose exchange: ").strip()
 
     print("Available strategies:", ", ".join(STRATEGIES))
@@ -70,34 +179,126 @@ def parse_telegram_command(message):
 
     return command, exchange, strategy
 
+# --- Telegram /run jobs ---
+@dataclass(frozen=True, slots=True)
+class RunJob:
+    exchange: str
+    strategy: str
+    message: object  # the telebot message to reply to
+
+
+async def run_telegram_job(job: RunJob):
+    await run_async_strategy(
+        exchange_name=job.exchange,
+        strategy_name=job.strategy,
+        handle_signals=lambda reply_message: telegram_replies.submit(bot.reply_to, job.message, reply_message),
+        market_data_table=market_data_table,
+        history_writer=history_writer,
+        session_pool=session_pool,
+        scan_results=scan_results
+    )
+
+
+def start_run_queue() -> JobQueue:
+    """
+    One event loop for every /run: jobs share its exchange sessions and caches instead of
+    each building a loop and cold sessions in a thread of its own.
+    """
+    return JobQueue(
+        run_telegram_job,
+        workers=RUN_WORKERS,
+        max_pending=RUN_QUEUE_SIZE,
+        on_stop=session_pool.aclose,
+        name="run"
+    ).start()
+
+
 # --- Telegram handler ---
 @bot.message_handler(commands=["run"])
 def handle_telegram_command(message):
     try:
-        _, exchange, strategy = parse_telegram_command(message)
-
-        # Run in new event loop inside thread
-        def run_in_thread():        
-            asyncio.run(
-                run_async_strategy(
-                    exchange_name=exchange, 
-                    strategy_name=strategy, 
-                    handle_signals=lambda reply_message: bot.reply_to(message, reply_message)
-                )
-            )
-        if threading.active_count() < MAX_THREADS:
-            threading.Thread(target=run_in_thread).start()
-            bot.reply_to(message, f"Running `{strategy}` on `{exchange}`...")
+        command, exchange, strategy = parse_telegram_command(message)
+        if command is None:
+            return
+        try:
+            position = run_queue.submit(RunJob(exchange, strategy, message))
+        except JobQueueFull:
+            bot.reply_to(message, f"Busy: {RUN_QUEUE_SIZE} runs are already waiting, try again shortly.")
+            return
+        if position:
+            bot.reply_to(message, f"Queued `{strategy}` on `{exchange}` (position {position})...")
         else:
-            print(f"[DEBUG] Too many threads: {threading.active_count()}")
+            bot.reply_to(message, f"Running `{strategy}` on `{exchange}`...")
 
     except Exception as e:
         print(f"[DEBUG] Error: {e}")
         bot.reply_to(message, f"Error: {e}")
 
+@bot.message_handler(commands=["status"])
+def handle_telegram_status(message):
+    budgets = rate_limit_status()
+    if not budgets:
+        bot.reply_to(message, "No exchange requests yet.")
+        return
+    lines = ["Rate limits:"] + [
+        f"{name}: {budget['available']}/{budget['capacity']} per {budget['window']:g}s"
+        f" (venue used {budget['used_weight'] if budget['used_weight'] is not None else '-'}"
+        f", waits {budget['waits']}, throttled {budget['throttled']}"
+        + (f", paused {budget['paused_for']}s" if budget['paused_for'] else "") + ")"
+        for name, budget in budgets.items()
+    ]
+    lines.append("Requests:")
+    for name, endpoints in request_metrics().items():
+        for endpoint, stats in endpoints.items():
+            lines.append(
+                f"{name} {endpoint}: {stats['requests']} req, p95 {stats['p95_ms']}ms, p99 {stats['p99_ms']}ms,"
+                f" retries {stats['retries']}, hedges {stats['hedges']} (won {stats['hedge_wins']}),"
+                f" errors {stats['errors']}, deadlines {stats['deadlines']}"
+            )
+    if run_queue is not None:
+        jobs = run_queue.stats()
+        lines.append(
+            f"Runs: {jobs['running']}/{jobs['workers']} running, {jobs['pending']}/{jobs['max_pending']} queued,"
+            f" {jobs['completed']} done, {jobs['failed']} failed, {jobs['rejected']} rejected"
+        )
+    scans = scan_results.stats()
+    lines.append(
+        f"Scans: {scans['scans']} run, {scans['joined']} joined in flight, {scans['hits']} served cached"
+        f" (max age {SCAN_MAX_AGE:g}s), {scans['in_flight']} in flight"
+    )
+    for name, cache in evaluation_cache_metrics().items():
+        lines.append(
+            f"Evaluations ({name}): {cache['hits']} cached, {cache['misses']} computed"
+            f" (hit rate {cache['hit_rate']}), {cache['entries']}/{cache['max_entries']} entries,"
+            f" evicted {cache['evictions']}"
+        )
+    lines.extend(latency_lines())
+    bot.reply_to(message, "\n".join(lines))
+
+
+def latency_lines() -> List[str]:
+    """
+    p50/p95/p99 of venue scans and strategy evaluations, and the symbols slowest to fetch.
+    """
+    metrics = shared_metrics_registry()
+    lines = ["Latency:"]
+    for labels, histogram in metrics.series(EXCHANGE_SCAN_SECONDS):
+        lines.append(f"scan {labels['exchange']}: {format_latency(histogram.summary())}")
+    for labels, histogram in metrics.series(EVALUATE_SECONDS):
+        lines.append(f"evaluate {labels['strategy']}: {format_latency(histogram.summary())}")
+    symbols = [(labels, histogram.summary()) for labels, histogram in metrics.series(SYMBOL_FETCH_SECONDS)]
+    symbols.sort(key=lambda item: item[1]["p95_ms"] or 0.0, reverse=True)
+    for labels, latency in symbols[:SLOWEST_SYMBOLS]:
+        lines.append(f"fetch {labels['exchange']}:{labels['symbol']}: {format_latency(latency)}")
+    return lines if len(lines) > 1 else []
+
+
+def format_latency(latency: Dict[str, Optional[float]]) -> str:
+    return f"p50 {latency['p50_ms']}ms, p95 {latency['p95_ms']}ms, p99 {latency['p99_ms']}ms ({latency['count']})"
+
 @bot.message_handler(commands=["help"])
 def handle_telegram_help(message):
-    bot.reply_to(message, "Usage: /run <exchange> <strategy>, \nExchanges: " + ", ".join(EXCHANGES) + ", \nStrategies: " + ", ".join(STRATEGIES))
+    bot.reply_to(message, "Usage: /run <exchange> <strategy>, /status, \nExchanges: " + ", ".join(EXCHANGES + [ALL_EXCHANGES]) + ", \nStrategies: " + ", ".join(STRATEGIES))
 
 
 def get_args():
@@ -108,12 +309,18 @@ def get_args():
         action="store_true",
         help="Enable Telegram bot listening (default: False)"
     )
+    parser.add_argument(
+        "--schedule", "-s",
+        dest="schedule",
+        action="store_true",
+        help="Keep running and scan symbols as their funding settlements approach (default: False)"
+    )
     parser.add_argument(
         "--exchange", "-ex",
         type=str,
-        choices=EXCHANGES,
+        choices=EXCHANGES + [ALL_EXCHANGES],
         default=DEFAULT_EXCHANGE,
-        help="Exchange to use (default: binance)"
+        help="Exchange to use, or 'all' to scan every venue at once (default: binance)"
     )
     parser.add_argument(
         "--strategy", "-strat",
@@ -122,22 +329,69 @@ def get_args():
         default=DEFAULT_STRATEGY,
         help="Trading strategy to run (default: cfrashort)"
     )
+    parser.add_argument(
+        "--record", "-r",
+        dest="record",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="Append fetched and streamed funding rates and order books to a history store in DIR"
+    )
+    parser.add_argument(
+        "--metrics-port", "-m",
+        dest="metrics_port",
+        type=int,
+        default=int(METRICS_PORT) if METRICS_PORT else None,
+        metavar="PORT",
+        help="Serve latency histograms and counters in Prometheus format at http://127.0.0.1:PORT/metrics"
+    )
     args = parser.parse_args()
     return args
 
 async def main():
     args = get_args()
+    global history_writer
+    if args.record:
+        history_writer = HistoryWriter(HistoryStore(args.record)).start()
+    metrics_server = None
+    if args.metrics_port is not None:
+        metrics_server = MetricsServer(port=args.metrics_port).start()
+        print(f"Serving metrics at {metrics_server.url}")
+
+    try:
+        await run_mode(args)
+    finally:
+        if metrics_server is not None:
+            metrics_server.stop()
+        if run_queue is not None:
+            run_queue.stop(timeout=10)
+        if history_writer is not None:
+            history_writer.close()
 
+
+async def run_mode(args):
     if args.listen:
+        global market_data_table, run_queue
+        market_data_table = start_market_data_streams(history_writer)
+        run_queue = start_run_queue()
         print("\n[Telegram bot is now listening...]\n")
         bot.infinity_polling()
+    elif args.schedule:
+        print(f"Scheduling strategy {args.strategy} on {args.exchange} around funding settlements")
+        await run_scheduled_strategy(
+            args.exchange,
+            args.strategy,
+            lambda reply_message: print(reply_message),
+            history_writer=history_writer
+        )
     else:
         print(f"Running strategy: {args.strategy}")
         print(f"Using exchange: {args.exchange}")
         await run_async_strategy(
             args.exchange, 
             args.strategy, 
-            lambda reply_message: print(reply_message)
+            lambda reply_message: print(reply_message),
+            history_writer=history_writer
         )
 
 
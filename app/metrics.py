@@ -0,0 +1,287 @@
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_SUB_BUCKETS = 32  # buckets per power of two: values are kept to within ~1.6%
+DEFAULT_METRICS_HOST = "127.0.0.1"
+DEFAULT_METRICS_PORT = 9464
+QUANTILES = (0.5, 0.95, 0.99)
+
+HISTOGRAM = "summary"  # exposed as a Prometheus summary: precomputed quantiles plus _sum and _count
+COUNTER = "counter"
+
+_MIN_EXPONENT = -20  # values below 2**-21 s (~0.5 µs) share the first bucket
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram of durations in seconds: log-linear buckets of fixed relative width
+    (`sub_buckets` per power of two), so recording is O(1), memory grows with the spread of the
+    values rather than their number, and any quantile is accurate to about 1 / (2 * sub_buckets).
+
+    Only the buckets that were hit are stored; count, sum, min and max are exact.
+    """
+    __slots__ = ("sub_buckets", "count", "sum", "min", "max", "_counts", "_lock")
+
+    def __init__(self, sub_buckets: int = DEFAULT_SUB_BUCKETS):
+        self.sub_buckets = sub_buckets
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self._counts: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        index = self._index(seconds)
+        with self._lock:
+            self._counts[index] = self._counts.get(index, 0) + 1
+            self.count += 1
+            self.sum += seconds
+            if seconds < self.min:
+                self.min = seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def time(self) -> "_Timer":
+        """
+        Context manager recording the duration of its block.
+        """
+        return _Timer(self)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        The value below which a fraction `q` of the recorded values fall, or None when empty.
+        """
+        with self._lock:
+            if not self.count:
+                return None
+            rank = max(1, math.ceil(q * self.count))
+            if rank >= self.count:
+                return self.max
+            counts = sorted(self._counts.items())
+            low, high = self.min, self.max
+        seen = 0
+        for index, count in counts:
+            seen += count
+            if seen >= rank:
+                return min(high, max(low, self._value(index)))
+        return high
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        p50, p95, p99 = (self.percentile(q) for q in QUANTILES)
+        return {
+            "count": self.count,
+            "p50_ms": _ms(p50),
+            "p95_ms": _ms(p95),
+            "p99_ms": _ms(p99),
+            "max_ms": _ms(self.max) if self.count else None,
+        }
+
+    def _index(self, seconds: float) -> int:
+        if seconds <= 0:
+            return 0
+        mantissa, exponent = math.frexp(seconds)  # seconds = mantissa * 2**exponent, mantissa in [0.5, 1)
+        if exponent < _MIN_EXPONENT:
+            return 0
+        return (exponent - _MIN_EXPONENT) * self.sub_buckets + int((mantissa - 0.5) * 2 * self.sub_buckets)
+
+    def _value(self, index: int) -> float:
+        # Midpoint of the bucket
+        exponent, sub_bucket = divmod(index, self.sub_buckets)
+        return math.ldexp(0.5 + (sub_bucket + 0.5) / (2 * self.sub_buckets), exponent + _MIN_EXPONENT)
+
+
+class _Timer:
+    __slots__ = ("histogram", "started")
+
+    def __init__(self, histogram: LatencyHistogram):
+        self.histogram = histogram
+
+    def __enter__(self) -> "_Timer":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.record(time.perf_counter() - self.started)
+
+
+class Counter:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1):
+        with self._lock:
+            self.value += amount
+
+
+class MetricsRegistry:
+    """
+    Named families of histograms and counters, one series per label set.
+
+    `histogram` and `counter` create a series on first use and return the same object after
+    that, so hot paths look a series up once and keep it. `render` writes every family in the
+    Prometheus text exposition format.
+    """
+
+    def __init__(self):
+        self._families: Dict[str, Tuple[str, str, Dict[Labels, object]]] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, help_text: str = "", **labels: str) -> LatencyHistogram:
+        return self._series(name, HISTOGRAM, help_text, labels, LatencyHistogram)
+
+    def counter(self, name: str, help_text: str = "", **labels: str) -> Counter:
+        return self._series(name, COUNTER, help_text, labels, Counter)
+
+    def series(self, name: str) -> List[Tuple[Dict[str, str], object]]:
+        """
+        Every `(labels, histogram or counter)` of family `name`, in creation order.
+        """
+        with self._lock:
+            family = self._families.get(name)
+            series = list(family[2].items()) if family is not None else []
+        return [(dict(labels), metric) for labels, metric in series]
+
+    def value(self, name: str, **labels: str) -> int:
+        """
+        Current value of one counter; 0 if it was never incremented.
+        """
+        with self._lock:
+            family = self._families.get(name)
+            counter = family[2].get(_labels(labels)) if family is not None else None
+        return counter.value if counter is not None else 0
+
+    def render(self) -> str:
+        with self._lock:
+            families = [(name, kind, help_text, list(series.items())) for name, (kind, help_text, series) in self._families.items()]
+        lines = []
+        for name, kind, help_text, series in families:
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, metric in series:
+                lines.extend(self._render_series(name, labels, metric))
+        return "\n".join(lines) + "\n"
+
+    def _series(self, name: str, kind: str, help_text: str, labels: Dict[str, str], factory):
+        key = _labels(labels)
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = self._families[name] = (kind, help_text, {})
+            elif family[0] != kind:
+                raise ValueError(f"Metric {name} is a {family[0]}, not a {kind}")
+            metric = family[2].get(key)
+            if metric is None:
+                metric = family[2][key] = factory()
+            return metric
+
+    def _render_series(self, name: str, labels: Labels, metric) -> Iterator[str]:
+        if isinstance(metric, Counter):
+            yield f"{name}{_format_labels(labels)} {metric.value}"
+            return
+        for q in QUANTILES:
+            value = metric.percentile(q)
+            yield f"{name}{_format_labels(labels + (('quantile', f'{q:g}'),))} {_format_value(value)}"
+        yield f"{name}_sum{_format_labels(labels)} {_format_value(metric.sum)}"
+        yield f"{name}_count{_format_labels(labels)} {metric.count}"
+
+
+class MetricsServer:
+    """
+    Serves a registry's `render()` at `GET /metrics` from a daemon thread, for Prometheus or curl.
+    Binds to localhost by default; port 0 picks a free port (see `port` after `start`).
+    """
+
+    def __init__(
+        self,
+        registry: Optional[MetricsRegistry] = None,
+        host: str = DEFAULT_METRICS_HOST,
+        port: int = DEFAULT_METRICS_PORT
+    ):
+        self.registry = registry if registry is not None else shared_metrics_registry()
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/metrics"
+
+    def start(self) -> "MetricsServer":
+        if self._server is not None:
+            return self
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # scrapes every few seconds would flood the log
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
+
+
+_shared_registry = MetricsRegistry()
+
+
+def shared_metrics_registry() -> MetricsRegistry:
+    """
+    The process-wide registry every component records into unless given its own.
+    """
+    return _shared_registry
+
+
+def _labels(labels: Dict[str, str]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (f'{key}="{_escape(value)}"' for key, value in labels)
+    return "{" + ",".join(escaped) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: Optional[float]) -> str:
+    return "NaN" if value is None else repr(float(value))
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 1) if seconds is not None else None
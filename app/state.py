@@ -1,15 +1,21 @@
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
+from app.metrics import MetricsRegistry, shared_metrics_registry
+
+STAGE_SECONDS = "bot_stage_seconds"
+STAGE_ERRORS = "bot_stage_errors_total"
 
 class BotState:
     """Manages the state and statistics of the bot."""
     
-    def __init__(self):
+    def __init__(self, metrics: Optional[MetricsRegistry] = None):
+        self.metrics = metrics if metrics is not None else shared_metrics_registry()
         self._is_running = False
         self._is_paused = False
         self._last_cycle_time: Optional[datetime] = None
         self._last_cycle_duration: float = 0.0
         self._error_count = 0
+        self._missed_ticks = 0
         self._start_time: Optional[datetime] = None
     
     @property
@@ -37,6 +43,11 @@ class BotState:
         """Get the total number of errors encountered."""
         return self._error_count
     
+    @property
+    def missed_ticks(self) -> int:
+        """Get the number of fixed-rate ticks skipped because a cycle overran."""
+        return self._missed_ticks
+    
     @property
     def start_time(self) -> Optional[datetime]:
         """Get when the bot was started."""
@@ -68,6 +79,20 @@ class BotState:
         """Increment the error count."""
         self._error_count += 1
     
+    def add_missed_ticks(self, count: int):
+        """Record fixed-rate ticks skipped by an overrunning cycle."""
+        self._missed_ticks += count
+    
+    def record_stage(self, stage: str, duration: float, error: bool = False):
+        """Record how long one stage of a cycle (fetch, parse, handle, cycle) took."""
+        self.metrics.histogram(STAGE_SECONDS, "Duration of each bot cycle stage", stage=stage).record(duration)
+        if error:
+            self.metrics.counter(STAGE_ERRORS, "Bot cycle stages that failed", stage=stage).inc()
+    
+    def stage_latencies(self) -> Dict[str, dict]:
+        """Get count and p50/p95/p99 (ms) per stage."""
+        return {labels["stage"]: histogram.summary() for labels, histogram in self.metrics.series(STAGE_SECONDS)}
+    
     def reset_error_count(self):
         """Reset the error count."""
         self._error_count = 0
@@ -83,5 +108,7 @@ class BotState:
             "uptime": uptime_str,
             "last_cycle": self._last_cycle_time.isoformat() if self._last_cycle_time else "Never",
             "cycle_duration": f"{self._last_cycle_duration:.2f}s",
-            "errors": self._error_count
+            "errors": self._error_count,
+            "missed_ticks": self._missed_ticks,
+            "stages": self.stage_latencies()
         } 
\ No newline at end of file
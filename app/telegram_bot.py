@@ -119,8 +119,21 @@ The bot is currently *running* and monitoring for data.
 🕐 **Last Cycle**: {state['last_cycle']}
 ⏱️ **Cycle Duration**: {state['cycle_duration']}
 ❌ **Errors**: {state['errors']}
-🔄 **Poll Interval**: {status['poll_interval']}s
+🔄 **Poll Interval**: {status['poll_interval']}s ({status['schedule']}{', pipelined' if status['pipelined'] else ''})
+⏭️ **Missed Ticks**: {status['missed_ticks']}
         """
+        for stage, latency in state['stages'].items():
+            status_message += (
+                f"\n⏱️ **{stage}**: p50 {latency['p50_ms']}ms, p95 {latency['p95_ms']}ms,"
+                f" p99 {latency['p99_ms']}ms ({latency['count']} runs)"
+            )
+        for name, handler in status['handlers'].items():
+            queue = f", queue {handler['queue_depth']}/{handler['queue_size']}" if handler['queue_size'] else ""
+            status_message += (
+                f"\n🧩 **{name}**: p50 {handler['p50_ms']}ms, p95 {handler['p95_ms']}ms, p99 {handler['p99_ms']}ms,"
+                f" max {handler['max_ms']}ms{queue},"
+                f" errors {handler['errors']}, timeouts {handler['timeouts']}, dropped {handler['dropped']}"
+            )
         
         await update.message.reply_text(status_message, parse_mode='Markdown')
     
@@ -0,0 +1,158 @@
+import asyncio
+import time
+
+import pytest
+
+from app.bot_controller import FIXED_RATE, BotController
+from app.handlers.handler_interface import Handler
+from app.metrics import MetricsRegistry
+from app.parsers.parser_interface import Parser
+from app.scrapers.scraper_interface import Scraper
+from app.state import BotState
+
+
+class TimedScraper(Scraper):
+    def __init__(self, delay):
+        self.delay = delay
+        self.starts = []
+        self.count = 0
+
+    async def fetch(self):
+        self.starts.append(time.monotonic())
+        self.count += 1
+        cycle = self.count
+        await asyncio.sleep(self.delay)
+        return {"cycle": cycle}
+
+
+class PassThroughParser(Parser):
+    async def parse(self, raw_data):
+        return raw_data
+
+
+class SlowHandler(Handler):
+    def __init__(self, delay, controller_ref):
+        self.delay = delay
+        self.controller_ref = controller_ref
+        self.handled = []
+        self.max_in_flight = 0
+
+    async def handle(self, data):
+        self.max_in_flight = max(self.max_in_flight, self.controller_ref[0].in_flight)
+        await asyncio.sleep(self.delay)
+        self.handled.append((data["cycle"], time.monotonic()))
+
+
+async def run_for(controller, seconds):
+    await controller.start()
+    await asyncio.sleep(seconds)
+    await controller.stop()
+
+
+@pytest.mark.asyncio
+async def test_fixed_rate_does_not_drift_with_cycle_time():
+    scraper = TimedScraper(delay=0.03)
+    controller = BotController(scraper, PassThroughParser(), [], BotState(), poll_interval=0.1, schedule=FIXED_RATE)
+    await run_for(controller, 0.55)
+
+    starts = [start - scraper.starts[0] for start in scraper.starts]
+    assert len(starts) >= 5
+    # On the 0.1s grid, not every 0.13s as sleeping a full interval after each cycle would give
+    assert all(abs(start - i * 0.1) < 0.03 for i, start in enumerate(starts))
+    assert controller.state.missed_ticks == 0
+
+
+@pytest.mark.asyncio
+async def test_fixed_rate_counts_missed_ticks_when_cycles_overrun():
+    scraper = TimedScraper(delay=0.12)
+    controller = BotController(scraper, PassThroughParser(), [], BotState(), poll_interval=0.05, schedule=FIXED_RATE)
+    await run_for(controller, 0.45)
+
+    assert controller.state.missed_ticks >= 4
+    assert controller.get_status()["missed_ticks"] == controller.state.missed_ticks
+    gaps = [later - earlier for earlier, later in zip(scraper.starts, scraper.starts[1:])]
+    assert all(gap == pytest.approx(0.15, abs=0.03) for gap in gaps)  # the next free slot of the grid
+
+
+@pytest.mark.asyncio
+async def test_pipelined_overlaps_fetch_with_handling_in_order_and_bounded():
+    ref = []
+    handler = SlowHandler(delay=0.08, controller_ref=ref)
+    scraper = TimedScraper(delay=0.02)
+    controller = BotController(
+        scraper, PassThroughParser(), [handler], BotState(), poll_interval=0, pipelined=True, max_in_flight=2
+    )
+    ref.append(controller)
+    await run_for(controller, 0.5)
+
+    cycles = [cycle for cycle, _ in handler.handled]
+    assert cycles == sorted(cycles) and len(cycles) >= 4
+    assert handler.max_in_flight == 2
+    # The fetch of cycle n + 1 started before cycle n finished handling
+    assert all(scraper.starts[cycle] < finished for cycle, finished in handler.handled if cycle < len(scraper.starts))
+    assert scraper.count <= len(cycles) + 2
+    assert controller.in_flight == 0
+    # stop() let the cycles already fetched finish handling
+    handler_stats = controller.get_status()["handlers"]["SlowHandler"]
+    assert (handler_stats["calls"], handler_stats["cancelled"]) == (len(cycles), 0)
+    assert len(cycles) == scraper.count
+
+
+@pytest.mark.asyncio
+async def test_stop_cancels_cycles_still_handling_after_stop_timeout():
+    ref = []
+    handler = SlowHandler(delay=10, controller_ref=ref)
+    controller = BotController(
+        TimedScraper(delay=0), PassThroughParser(), [handler], BotState(),
+        poll_interval=0, pipelined=True, max_in_flight=1, stop_timeout=0.1
+    )
+    ref.append(controller)
+    await controller.start()
+    await asyncio.sleep(0.05)
+    started = time.monotonic()
+    await controller.stop()
+
+    assert time.monotonic() - started < 0.5
+    handler_stats = controller.get_status()["handlers"]["SlowHandler"]
+    assert (handler_stats["calls"], handler_stats["cancelled"]) == (1, 1)
+    assert handler.handled == []
+    assert controller.in_flight == 0
+
+
+class PausingHandler(Handler):
+    """Pauses the bot after `cycles` cycles, so the test stops it at a known count."""
+    def __init__(self, delay, cycles, controller_ref):
+        self.delay = delay
+        self.cycles = cycles
+        self.controller_ref = controller_ref
+        self.handled = 0
+        self.done = asyncio.Event()
+
+    async def handle(self, data):
+        await asyncio.sleep(self.delay)
+        self.handled += 1
+        if self.handled == self.cycles:
+            await self.controller_ref[0].pause()
+            self.done.set()
+
+
+@pytest.mark.asyncio
+async def test_stage_latencies_are_recorded_per_stage_and_handler():
+    metrics = MetricsRegistry()
+    ref = []
+    handler = PausingHandler(delay=0.02, cycles=3, controller_ref=ref)
+    controller = BotController(TimedScraper(delay=0.01), PassThroughParser(), [handler], BotState(metrics), poll_interval=0.01)
+    ref.append(controller)
+    await controller.start()
+    await asyncio.wait_for(handler.done.wait(), timeout=5)
+    await controller.stop()
+
+    stages = controller.state.get_summary()["stages"]
+    assert set(stages) == {"fetch", "parse", "handle", "cycle"}
+    assert all(latency["count"] == 3 for latency in stages.values())
+    assert stages["fetch"]["p50_ms"] >= 9
+    assert stages["handle"]["p95_ms"] >= 19
+    handler_stats = controller.get_status()["handlers"]["PausingHandler"]
+    assert handler_stats["p99_ms"] >= 19
+    assert metrics.value("handler_calls_total", handler="PausingHandler") == 3
+    assert 'bot_stage_seconds_count{stage="fetch"} 3' in metrics.render()
@@ -0,0 +1,59 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.job_queue import JobQueue, JobQueueFull
+
+
+def test_jobs_share_one_loop_and_report_positions():
+    release = threading.Event()
+    loops, done = set(), []
+
+    async def run(job):
+        loops.add(asyncio.get_running_loop())
+        while not release.is_set():
+            await asyncio.sleep(0.005)
+        done.append(job)
+
+    queue = JobQueue(run, workers=2, max_pending=2).start()
+    try:
+        assert [queue.submit(i) for i in range(4)] == [0, 0, 1, 2]
+        with pytest.raises(JobQueueFull):
+            queue.submit(4)
+        assert queue.stats()["rejected"] == 1
+
+        release.set()
+        queue.run_coroutine(asyncio.sleep(0.1)).result(timeout=5)
+        for _ in range(100):
+            if queue.stats()["completed"] == 4:
+                break
+            queue.run_coroutine(asyncio.sleep(0.01)).result(timeout=5)
+        assert sorted(done) == [0, 1, 2, 3]
+        assert loops == {queue.loop}
+        assert queue.submit(5) == 0  # workers are free again
+    finally:
+        queue.stop(timeout=5)
+    assert not queue.is_running
+
+
+def test_failed_job_does_not_kill_worker_and_on_stop_runs():
+    stopped = []
+
+    async def run(job):
+        if job == "bad":
+            raise ValueError("boom")
+
+    async def on_stop():
+        stopped.append(True)
+
+    queue = JobQueue(run, workers=1, on_stop=on_stop).start()
+    queue.submit("bad")
+    queue.submit("good")
+    for _ in range(100):
+        if queue.stats()["completed"] + queue.stats()["failed"] == 2:
+            break
+        queue.run_coroutine(asyncio.sleep(0.01)).result(timeout=5)
+    assert (queue.stats()["failed"], queue.stats()["completed"]) == (1, 1)
+    queue.stop(timeout=5)
+    assert stopped == [True]
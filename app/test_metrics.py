@@ -0,0 +1,70 @@
+import random
+import urllib.error
+import urllib.request
+
+import pytest
+
+from app.metrics import LatencyHistogram, MetricsRegistry, MetricsServer
+
+
+def test_histogram_percentiles_within_relative_precision():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(-4, 1.5) for _ in range(20000)]
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+
+    ordered = sorted(values)
+    for q in (0.5, 0.95, 0.99):
+        exact = ordered[int(q * len(ordered)) - 1]
+        assert histogram.percentile(q) == pytest.approx(exact, rel=0.03)
+    assert histogram.percentile(1.0) == max(values)
+    assert histogram.count == len(values)
+    assert histogram.sum == pytest.approx(sum(values))
+    assert len(histogram._counts) < 1000  # buckets, not samples
+
+
+def test_empty_and_tiny_values():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(0.5) is None
+    assert histogram.summary()["p99_ms"] is None
+    histogram.record(0.0)
+    histogram.record(1e-9)
+    assert histogram.percentile(0.99) == 1e-9
+    with histogram.time():
+        pass
+    assert histogram.count == 3
+
+
+def test_registry_returns_one_series_per_label_set_and_renders_prometheus_text():
+    metrics = MetricsRegistry()
+    latency = metrics.histogram("request_seconds", "Request time", exchange="binance", endpoint="/fapi")
+    assert metrics.histogram("request_seconds", endpoint="/fapi", exchange="binance") is latency
+    latency.record(0.25)
+    metrics.counter("requests_total", "Requests", exchange="bin\"ance").inc(3)
+    with pytest.raises(ValueError):
+        metrics.counter("request_seconds")
+
+    assert metrics.value("requests_total", exchange="bin\"ance") == 3
+    assert metrics.value("requests_total", exchange="okx") == 0
+    assert [labels for labels, _ in metrics.series("request_seconds")] == [{"endpoint": "/fapi", "exchange": "binance"}]
+    lines = metrics.render().splitlines()
+    assert lines[:2] == ["# HELP request_seconds Request time", "# TYPE request_seconds summary"]
+    assert 'request_seconds{endpoint="/fapi",exchange="binance",quantile="0.99"} 0.25' in lines
+    assert 'request_seconds_count{endpoint="/fapi",exchange="binance"} 1' in lines
+    assert "# TYPE requests_total counter" in lines
+    assert 'requests_total{exchange="bin\\"ance"} 3' in lines
+
+
+def test_server_serves_metrics():
+    metrics = MetricsRegistry()
+    metrics.counter("cycles_total").inc()
+    server = MetricsServer(metrics, port=0).start()
+    try:
+        with urllib.request.urlopen(server.url, timeout=5) as response:
+            assert response.headers["Content-Type"].startswith("text/plain")
+            assert "cycles_total 1" in response.read().decode()
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(server.url.replace("/metrics", "/other"), timeout=5)
+    finally:
+        server.stop()
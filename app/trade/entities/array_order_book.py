@@ -0,0 +1,45 @@
+from dataclasses import dataclass
+from typing import Any, Iterator, Sequence, Tuple
+
+from app.trade.entities.order_book import OrderBook
+
+
+class ArrayLevels(Sequence):
+    """
+    `(price, quantity)` sequence over an (n, 2) float64 array, so code written for the
+    list-of-tuples `OrderBook` keeps working while vectorised code reads `.array` directly.
+    """
+
+    __slots__ = ("array",)
+
+    def __init__(self, array: Any):
+        self.array = array
+
+    @property
+    def prices(self) -> Any:
+        return self.array[:, 0]
+
+    @property
+    def sizes(self) -> Any:
+        return self.array[:, 1]
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return ArrayLevels(self.array[i])
+        price, size = self.array[i]
+        return float(price), float(size)
+
+    def __iter__(self) -> Iterator[Tuple[float, float]]:
+        return zip(self.array[:, 0].tolist(), self.array[:, 1].tolist())
+
+
+@dataclass(frozen=True, slots=True)
+class ArrayOrderBook(OrderBook):
+    """
+    `OrderBook` whose sides are contiguous float64 arrays (see `app.trade.order_book.fast_decode`).
+    """
+    bids: ArrayLevels
+    asks: ArrayLevels
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class FundingRate:
     symbol: str
     funding_rate: float
@@ -0,0 +1,11 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass(frozen=True, slots=True)
+class FundingSchedule:
+    exchange: str
+    symbol: str
+    interval_hours: float
+    next_funding_time: Optional[datetime] = None  # UTC; None means cycles every `interval_hours` from midnight UTC
@@ -1,9 +1,10 @@
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Sequence, Tuple
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class OrderBook:
     symbol: str
-    bids: list[tuple[float, float]]  # List of (price, quantity)
-    asks: list[tuple[float, float]]
+    bids: Sequence[Tuple[float, float]]  # (price, quantity), best first; a list, or a LocalOrderBook view
+    asks: Sequence[Tuple[float, float]]
     timestamp: datetime
\ No newline at end of file
@@ -10,6 +10,8 @@ class SignalAction(Enum):
 
 
 class Signal:
+    __slots__ = ("symbol", "action", "confidence", "metadata")
+
     def __init__(self, symbol: str, action: SignalAction, confidence: float = 1.0, metadata: dict = None):
         self.symbol = symbol
         self.action = action
@@ -4,16 +4,21 @@ from app.trade.exchanges.deribit_client import DeribitClient
 from app.trade.exchanges.bybit_client import BybitClient
 from app.trade.exchanges.okx_client import OKXClient
 
-def get_exchange_by_name(name: str):
+def get_exchange_by_name(name: str, **kwargs):
+    """
+    Build an (unopened) exchange client. Keyword arguments are passed through to
+    `ExchangeClient.__init__` (timeout, pool size, http2, ...). Use it as an async
+    context manager, or call `open()`/`aclose()`, so one pooled session serves every request.
+    """
     if name == "kraken":
-        return KrakenClient()
+        return KrakenClient(**kwargs)
     elif name == "binance":
-        return BinanceClient()
+        return BinanceClient(**kwargs)
     elif name == "deribit":
-        return DeribitClient()
+        return DeribitClient(**kwargs)
     elif name == "bybit":
-        return BybitClient()
+        return BybitClient(**kwargs)
     elif name == "okx":
-        return OKXClient()
+        return OKXClient(**kwargs)
     else:
         raise ValueError(f"Unknown exchange: {name}")
\ No newline at end of file
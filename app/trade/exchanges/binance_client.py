@@ -1,43 +1,122 @@
-import httpx
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
 from app.trade.exchanges.exchange_client import ExchangeClient
+from app.trade.exchanges.rate_limiter import RateLimit
+from app.trade.exchanges.request_policy import RequestPolicy
+from app.trade.exchanges.snapshot import Snapshot
 from app.trade.entities.funding_rate import FundingRate
+from app.trade.entities.funding_schedule import FundingSchedule
 from app.trade.entities.order_book import OrderBook
 from app.trade.entities.fees import Fees
+from app.trade.order_book.decoders import binance_depth_snapshot
+from app.trade.order_book.local_order_book import BookUpdate
 
 DEFAULT_TAKER_FEE = 0.0004
 DEFAULT_MAKER_FEE = 0.0002
+DEFAULT_FUNDING_INTERVAL_HOURS = 8
+# /fapi/v1/depth request weight by `limit`
+DEPTH_WEIGHTS = [(50, 2), (100, 5), (500, 10), (1000, 20)]
 
 class BinanceClient(ExchangeClient):
-    def __init__(self):
+    name = "binance"
+    max_concurrency = 20
+    rate_limit = RateLimit(capacity=2400, window=60.0, used_weight_header="X-MBX-USED-WEIGHT-1M")
+    endpoint_policies = {"/depth": RequestPolicy(deadline=3.0, hedge=True)}
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
         self.api_url = "https://fapi.binance.com/fapi/v1"
         self.funding_url = f"{self.api_url}/fundingRate"
         self.order_book_url = f"{self.api_url}/depth"
+        self.premium_index_url = f"{self.api_url}/premiumIndex"
+        self.funding_info_url = f"{self.api_url}/fundingInfo"
+
+    def request_weight(self, url: str, params: Optional[Dict[str, Any]] = None) -> int:
+        params = params or {}
+        if url == self.order_book_url:
+            limit = int(params.get("limit", 500))
+            for max_limit, weight in DEPTH_WEIGHTS:
+                if limit <= max_limit:
+                    return weight
+            return DEPTH_WEIGHTS[-1][1]
+        if url == self.premium_index_url and "symbol" not in params:
+            return 10
+        return 1
 
     async def fetch_funding_rate(self, symbol: str) -> FundingRate:
-        async with httpx.AsyncClient() as client:
-            r = await client.get(self.funding_url, params={"symbol": symbol, "limit": 1})
-            r.raise_for_status()
-            data = r.json()[0]
-            return FundingRate(
-                symbol=data["symbol"],
-                funding_rate=float(data["fundingRate"]),
-                timestamp=datetime.utcfromtimestamp(data["fundingTime"] / 1000)
+        data = (await self._get_json(self.funding_url, params={"symbol": symbol, "limit": 1}))[0]
+        return FundingRate(
+            symbol=data["symbol"],
+            funding_rate=float(data["fundingRate"]),
+            timestamp=datetime.utcfromtimestamp(data["fundingTime"] / 1000)
+        )
+
+    async def fetch_funding_rates(self, symbols: List[str]) -> Dict[str, FundingRate]:
+        """
+        premiumIndex without a symbol returns every perpetual in one response. Its `lastFundingRate`
+        is the current (predicted) rate for the next settlement, stamped with the response time,
+        whereas `fetch_funding_rate` returns the last settled rate stamped with its `fundingTime`.
+        """
+        premium_index = await self._premium_index_snapshot()
+        rates = {}
+        for symbol in symbols:
+            item = premium_index.get(symbol)
+            if item is None or item.get("lastFundingRate") in (None, ""):
+                continue
+            rates[symbol] = FundingRate(
+                symbol=symbol,
+                funding_rate=float(item["lastFundingRate"]),
+                timestamp=datetime.utcfromtimestamp(item["time"] / 1000)
             )
+        return rates
 
-    async def fetch_order_book(self, symbol: str) -> OrderBook:
-        async with httpx.AsyncClient() as client:
-            r = await client.get(self.order_book_url, params={"symbol": symbol, "limit": 5})
-            r.raise_for_status()
-            data = r.json()
-            return OrderBook(
+    async def fetch_funding_schedules(self, symbols: List[str]) -> Dict[str, FundingSchedule]:
+        """
+        Next settlement from premiumIndex; fundingInfo lists only the symbols whose interval
+        was changed from the default 8h.
+        """
+        premium_index = await self._premium_index_snapshot()
+        funding_info = Snapshot(await self._get_json(self.funding_info_url))
+        schedules = {}
+        for symbol in symbols:
+            item = premium_index.get(symbol)
+            if item is None or not item.get("nextFundingTime"):
+                continue
+            info = funding_info.get(symbol) or {}
+            schedules[symbol] = FundingSchedule(
+                exchange=self.name,
                 symbol=symbol,
-                bids=[(float(price), float(qty)) for price, qty in data["bids"]],
-                asks=[(float(price), float(qty)) for price, qty in data["asks"]],
-                timestamp=datetime.utcnow()
+                interval_hours=float(info.get("fundingIntervalHours") or DEFAULT_FUNDING_INTERVAL_HOURS),
+                next_funding_time=datetime.fromtimestamp(item["nextFundingTime"] / 1000, timezone.utc)
             )
+        return schedules
+
+    async def _premium_index_snapshot(self) -> Snapshot:
+        async def load():
+            return Snapshot(await self._get_json(self.premium_index_url))
+
+        return await self._snapshot("premiumIndex", load)
+
+    async def fetch_order_book(self, symbol: str) -> OrderBook:
+        params = {"symbol": symbol, "limit": 5}
+        if self.fast_decode:
+            return await self._fetch_array_order_book(symbol, self.order_book_url, params, time_field="E")
+        data = await self._get_json(self.order_book_url, params=params)
+        return OrderBook(
+            symbol=symbol,
+            bids=[(float(price), float(qty)) for price, qty in data["bids"]],
+            asks=[(float(price), float(qty)) for price, qty in data["asks"]],
+            timestamp=datetime.utcnow()
+        )
         
 
+    async def fetch_depth_snapshot(self, symbol: str, limit: int = 1000) -> BookUpdate:
+        """
+        Depth snapshot with its `lastUpdateId`, for (re)syncing a `LocalOrderBook` fed by `depthUpdate`.
+        """
+        data = await self._get_json(self.order_book_url, params={"symbol": symbol, "limit": limit})
+        return binance_depth_snapshot(symbol, data)
+
     async def fetch_fees(self, symbol: str) -> Fees:
         return Fees(maker=DEFAULT_MAKER_FEE, taker=DEFAULT_TAKER_FEE)
         # async with httpx.AsyncClient() as client:
@@ -1,50 +1,102 @@
-import httpx
 from datetime import datetime, timezone
+from typing import Dict, List
 from app.trade.exchanges.exchange_client import ExchangeClient
+from app.trade.exchanges.rate_limiter import RateLimit
+from app.trade.exchanges.request_policy import RequestPolicy
+from app.trade.exchanges.snapshot import Snapshot
 from app.trade.entities.funding_rate import FundingRate
+from app.trade.entities.funding_schedule import FundingSchedule
 from app.trade.entities.order_book import OrderBook
 from app.trade.entities.fees import Fees
 
 DEFAULT_MAKER_FEE = 0.0001
 DEFAULT_TAKER_FEE = 0.0006
+DEFAULT_FUNDING_INTERVAL_HOURS = 8
 
 class BybitClient(ExchangeClient):
+    name = "bybit"
+    rate_limit = RateLimit(capacity=600, window=5.0)  # per-IP limit; no usage header on public endpoints
+    endpoint_policies = {"/v5/market/orderbook": RequestPolicy(deadline=3.0, hedge=True)}
     BASE_URL = "https://api.bybit.com"
 
     async def fetch_funding_rate(self, symbol: str) -> FundingRate:
-        async with httpx.AsyncClient() as client:
-            res = await client.get(
-                f"{self.BASE_URL}/v5/market/funding/prev-funding-rate",
-                params={"category": "contract", "symbol": symbol}
+        res = await self._get_json(
+            f"{self.BASE_URL}/v5/market/funding/prev-funding-rate",
+            params={"category": "contract", "symbol": symbol}
+        )
+        # res = await self._get_json(f"{self.BASE_URL}/v2/public/funding/prev-funding-rate", params={"symbol": symbol})
+        data = res["result"]
+        return FundingRate(
+            symbol=data["symbol"],
+            funding_rate=float(data["fundingRate"]),
+            timestamp=datetime.fromtimestamp(data["fundingTime"] / 1000)
+        )
+
+    async def fetch_funding_rates(self, symbols: List[str]) -> Dict[str, FundingRate]:
+        """
+        The linear tickers list carries the current (predicted) funding rate of every perpetual,
+        stamped with the response time. `fetch_funding_rate` instead returns the last settled rate
+        stamped with its `fundingTime`.
+        """
+        tickers = await self._tickers_snapshot()
+        return {
+            symbol: FundingRate(
+                symbol=symbol,
+                funding_rate=float(tickers[symbol]["fundingRate"]),
+                timestamp=tickers.fetched_at
             )
-            # res = await client.get(f"{self.BASE_URL}/v2/public/funding/prev-funding-rate", params={"symbol": symbol})
-            res.raise_for_status()
-            data = res.json()["result"]
-            return FundingRate(
-                symbol=data["symbol"],
-                funding_rate=float(data["fundingRate"]),
-                timestamp=datetime.fromtimestamp(data["fundingTime"] / 1000)
+            for symbol in symbols
+            if symbol in tickers and tickers[symbol].get("fundingRate")
+        }
+
+    async def fetch_funding_schedules(self, symbols: List[str]) -> Dict[str, FundingSchedule]:
+        """
+        The tickers list also carries each perpetual's next settlement and interval.
+        """
+        tickers = await self._tickers_snapshot()
+        schedules = {}
+        for symbol in symbols:
+            item = tickers.get(symbol)
+            if item is None or not item.get("nextFundingTime"):
+                continue
+            schedules[symbol] = FundingSchedule(
+                exchange=self.name,
+                symbol=symbol,
+                interval_hours=float(item.get("fundingIntervalHour") or DEFAULT_FUNDING_INTERVAL_HOURS),
+                next_funding_time=datetime.fromtimestamp(int(item["nextFundingTime"]) / 1000, timezone.utc)
             )
+        return schedules
 
-    async def fetch_order_book(self, symbol: str) -> OrderBook:
-        async with httpx.AsyncClient() as client:
-            res = await client.get(
-                f"{self.BASE_URL}/v5/market/orderbook",
-                params={"category": "linear", "symbol": symbol, "limit": 25}
+    async def _tickers_snapshot(self) -> Snapshot:
+        async def load():
+            body = await self._get_json(
+                f"{self.BASE_URL}/v5/market/tickers",
+                params={"category": "linear"}
             )
-            res.raise_for_status()
-            data = res.json()["result"]
+            return Snapshot(body["result"]["list"], fetched_at=datetime.fromtimestamp(body["time"] / 1000, timezone.utc))
 
-            # Each entry is [price: str, size: str]
-            bids = [(float(price), float(size)) for price, size in data["b"]]
-            asks = [(float(price), float(size)) for price, size in data["a"]]
+        return await self._snapshot("tickers", load)
 
-            return OrderBook(
-                symbol=symbol,
-                bids=bids,
-                asks=asks,
-                timestamp=datetime.now(timezone.utc)  # API does not provide timestamp
+    async def fetch_order_book(self, symbol: str) -> OrderBook:
+        url = f"{self.BASE_URL}/v5/market/orderbook"
+        params = {"category": "linear", "symbol": symbol, "limit": 25}
+        if self.fast_decode:
+            return await self._fetch_array_order_book(
+                symbol, url, params, bids_key=b'"b"', asks_key=b'"a"', time_field="ts"
             )
+        res = await self._get_json(url, params=params)
+        data = res["result"]
+
+        # Each entry is [price: str, size: str]
+        bids = [(float(price), float(size)) for price, size in data["b"]]
+        asks = [(float(price), float(size)) for price, size in data["a"]]
+
+        return OrderBook(
+            symbol=symbol,
+            bids=bids,
+            asks=asks,
+            timestamp=datetime.now(timezone.utc)  # API does not provide timestamp
+        )
 
     async def fetch_fees(self, symbol: str) -> Fees:
         # Bybit fees are usually static and may need to be hardcoded or scraped from docs if no endpoint is available.
@@ -1,16 +1,29 @@
-import httpx
+import asyncio
 from datetime import datetime, timezone
 from typing import List, Dict, Optional
 from app.trade.exchanges.exchange_client import ExchangeClient
+from app.trade.exchanges.rate_limiter import RateLimit
+from app.trade.exchanges.request_policy import RequestPolicy
+from app.trade.exchanges.snapshot import Snapshot
 from app.trade.entities.funding_rate import FundingRate
 from app.trade.entities.order_book import OrderBook
 from app.trade.entities.fees import Fees
 
 class DeribitClient(ExchangeClient):
+    """
+    `fetch_funding_rates` reads `get_book_summary_by_currency`, one request per settlement
+    currency, which lists `funding_8h` for every perpetual of that currency.
+    """
+    name = "deribit"
+    max_concurrency = 5
+    rate_limit = RateLimit(capacity=20, window=1.0)  # non-matching-engine credits, refilled ~20/s
+    request_policy = RequestPolicy(max_retries=1)
     BASE_URL = "https://www.deribit.com/api/v2"
 
-    def __init__(self):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
         self._symbol_map: Optional[Dict[str, str]] = None
+        self._settlement_currencies: Dict[str, str] = {}  # instrument name -> settlement currency
 
     @property
     def symbol_map(self) -> dict:
@@ -22,24 +35,23 @@ class DeribitClient(ExchangeClient):
         if self._symbol_map is not None:
             return
 
-        async with httpx.AsyncClient() as client:
-            res = await client.get(
-                f"{self.BASE_URL}/public/get_instruments",
-                params={"kind": "future", "expired": False}
-            )
-            res.raise_for_status()
-            instruments = res.json()["result"]
-
-            symbol_map = {}
-            for inst in instruments:
-                if inst.get("settlement_period") == "perpetual":
-                    base = inst["base_currency"]
-                    quote = inst["quote_currency"]
-                    symbol = f"{base}{quote}"
-                    symbol_map[symbol] = inst["instrument_name"]
-
-            self._symbol_map = symbol_map
-            return self._symbol_map
+        res = await self._get_json(
+            f"{self.BASE_URL}/public/get_instruments",
+            params={"kind": "future", "expired": False}
+        )
+        instruments = res["result"]
+
+        symbol_map = {}
+        for inst in instruments:
+            if inst.get("settlement_period") == "perpetual":
+                base = inst["base_currency"]
+                quote = inst["quote_currency"]
+                symbol = f"{base}{quote}"
+                symbol_map[symbol] = inst["instrument_name"]
+                self._settlement_currencies[inst["instrument_name"]] = inst["settlement_currency"]
+
+        self._symbol_map = symbol_map
+        return self._symbol_map
 
     async def fetch_funding_rate(self, symbol: str) -> FundingRate:
         await self.fetch_symbol_map()
@@ -49,27 +61,60 @@ class DeribitClient(ExchangeClient):
 
         now_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
 
-        async with httpx.AsyncClient() as client:
-            res = await client.get(
-                f"{self.BASE_URL}/public/get_funding_rate_history",
-                params={
-                    "instrument_name": deribit_symbol,
-                    "start_timestamp": 0,
-                    "end_timestamp": now_ms,
-                    "count": 1
-                }
+        res = await self._get_json(
+            f"{self.BASE_URL}/public/get_funding_rate_history",
+            params={
+                "instrument_name": deribit_symbol,
+                "start_timestamp": 0,
+                "end_timestamp": now_ms,
+                "count": 1
+            }
+        )
+        items = res["result"]
+        if not items:
+            raise ValueError(f"No funding rate data returned for {symbol}")
+
+        data = items[0]
+        return FundingRate(
+            symbol=symbol,
+            funding_rate=float(data["interest_1h"]),
+            timestamp=datetime.fromtimestamp(data["timestamp"] / 1000)
+        )
+
+    async def fetch_funding_rates(self, symbols: List[str]) -> Dict[str, FundingRate]:
+        """
+        Current 8h funding of every perpetual from the book summaries, stamped with the summary's
+        creation time. `fetch_funding_rate` instead returns the last settled `interest_1h`.
+        """
+        await self.fetch_symbol_map()
+        instruments = {symbol: self._symbol_map[symbol] for symbol in symbols if symbol in self._symbol_map}
+        currencies = sorted({self._settlement_currencies[name] for name in instruments.values()})
+        summaries = dict(zip(
+            currencies,
+            await asyncio.gather(*(self._book_summary_snapshot(currency) for currency in currencies))
+        ))
+
+        rates = {}
+        for symbol, instrument_name in instruments.items():
+            summary = summaries[self._settlement_currencies[instrument_name]].get(instrument_name)
+            if summary is None or summary.get("funding_8h") is None:
+                continue
+            rates[symbol] = FundingRate(
+                symbol=symbol,
+                funding_rate=float(summary["funding_8h"]),
+                timestamp=datetime.fromtimestamp(summary["creation_timestamp"] / 1000, timezone.utc)
             )
-            res.raise_for_status()
-            items = res.json()["result"]
-            if not items:
-                raise ValueError(f"No funding rate data returned for {symbol}")
+        return rates
 
-            data = items[0]
-            return FundingRate(
-                symbol=symbol,
-                funding_rate=float(data["interest_1h"]),
-                timestamp=datetime.fromtimestamp(data["timestamp"] / 1000)
+    async def _book_summary_snapshot(self, currency: str) -> Snapshot:
+        async def load():
+            res = await self._get_json(
+                f"{self.BASE_URL}/public/get_book_summary_by_currency",
+                params={"currency": currency, "kind": "future"}
             )
+            return Snapshot(res["result"], key="instrument_name")
+
+        return await self._snapshot(f"book_summary:{currency}", load)
 
     async def fetch_order_book(self, symbol: str) -> OrderBook:
         await self.fetch_symbol_map()
@@ -77,23 +122,22 @@ class DeribitClient(ExchangeClient):
         if not deribit_symbol:
             raise ValueError(f"No Deribit mapping for symbol {symbol}")
 
-        async with httpx.AsyncClient() as client:
-            res = await client.get(
-                f"{self.BASE_URL}/public/get_order_book",
-                params={"instrument_name": deribit_symbol}
-            )
-            res.raise_for_status()
-            data = res.json()["result"]
-
-            bids = [(float(price), float(amount)) for price, amount in data["bids"]]
-            asks = [(float(price), float(amount)) for price, amount in data["asks"]]
-
-            return OrderBook(
-                symbol=symbol,
-                bids=bids,
-                asks=asks,
-                timestamp=datetime.fromtimestamp(data["timestamp"] / 1000)
-            )
+        url = f"{self.BASE_URL}/public/get_order_book"
+        params = {"instrument_name": deribit_symbol}
+        if self.fast_decode:
+            return await self._fetch_array_order_book(symbol, url, params, time_field="timestamp")
+        res = await self._get_json(url, params=params)
+        data = res["result"]
+
+        bids = [(float(price), float(amount)) for price, amount in data["bids"]]
+        asks = [(float(price), float(amount)) for price, amount in data["asks"]]
+
+        return OrderBook(
+            symbol=symbol,
+            bids=bids,
+            asks=asks,
+            timestamp=datetime.fromtimestamp(data["timestamp"] / 1000)
+        )
 
     async def fetch_fees(self, symbol: str) -> Fees:
         # No official API for public fees; Deribit's taker/maker structure is static for perpetuals.
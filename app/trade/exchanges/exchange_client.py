@@ -1,11 +1,227 @@
 
+import asyncio
+import contextvars
+import importlib.util
+from datetime import datetime, timezone
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+import httpx
+from app.trade.exchanges.single_flight import SingleFlight
+from app.trade.exchanges.snapshot import Snapshot
+from app.trade.exchanges.rate_limiter import RateLimit, RateLimiter, shared_rate_limiter
+from app.trade.exchanges.request_policy import RequestPolicy, shared_request_executor
 from app.trade.entities.order_book import OrderBook
+from app.trade.entities.array_order_book import ArrayLevels, ArrayOrderBook
+from app.trade.order_book.fast_decode import FAST_DECODE_AVAILABLE, decode_int_field, decode_levels, loads
 from app.trade.entities.funding_rate import FundingRate
+from app.trade.entities.funding_schedule import FundingSchedule
 from app.trade.entities.fees import Fees
 
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+DEFAULT_SNAPSHOT_MAX_AGE = 30.0  # seconds a per-cycle snapshot may be reused without start_cycle()
+
+# HTTP/2 needs the optional `h2` package (installed via `httpx[http2]`).
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
 class ExchangeClient(ABC):
+    name: str = "exchange"
+    http2: bool = True
+    max_concurrency: int = 10  # default cap on in-flight requests when scanning concurrently
+    rate_limit: Optional[RateLimit] = None  # venue request budget; None disables throttling
+    request_policy: RequestPolicy = RequestPolicy()  # retries/deadline/hedging for every endpoint...
+    endpoint_policies: Dict[str, RequestPolicy] = {}  # ...unless a URL path ending in one of these keys overrides it
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        http2: Optional[bool] = None,
+        snapshot_max_age: float = DEFAULT_SNAPSHOT_MAX_AGE,
+        rate_limiter: Optional[RateLimiter] = None,
+        fast_decode: bool = False
+    ):
+        """
+        :param timeout: Per-request timeout in seconds.
+        :param max_connections: Size of the keep-alive connection pool.
+        :param keepalive_expiry: Seconds an idle pooled connection is kept open.
+        :param http2: Override the venue default for HTTP/2.
+        :param snapshot_max_age: Seconds a bulk snapshot is reused when no new cycle is started.
+        :param rate_limiter: Override the process-wide limiter shared by every client of this venue.
+        :param fast_decode: Decode order books straight into float64 arrays (`ArrayOrderBook`) and JSON
+            with orjson. Needs `numpy`; silently off when it is not installed.
+        """
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.keepalive_expiry = keepalive_expiry
+        if http2 is not None:
+            self.http2 = http2
+        self.snapshot_max_age = snapshot_max_age
+        self._client: Optional[httpx.AsyncClient] = None
+        self._single_flight = SingleFlight()
+        self._snapshots: Dict[str, Snapshot] = {}  # used outside any cycle
+        self._cycle_snapshots: contextvars.ContextVar[Optional[Dict[str, Snapshot]]] = contextvars.ContextVar(
+            f"{self.name}_cycle_snapshots", default=None
+        )
+        if rate_limiter is None and self.rate_limit is not None:
+            rate_limiter = shared_rate_limiter(self.name, self.rate_limit)
+        self.rate_limiter = rate_limiter
+        self.request_executor = shared_request_executor(self.name)
+        self.fast_decode = fast_decode and FAST_DECODE_AVAILABLE
+
+    # --- Session lifecycle ---
+
+    @property
+    def is_open(self) -> bool:
+        return self._client is not None and not self._client.is_closed
+
+    async def open(self) -> "ExchangeClient":
+        """
+        Create the pooled HTTP session. Safe to call more than once.
+        """
+        if not self.is_open:
+            self._client = httpx.AsyncClient(
+                http2=self.http2 and HTTP2_AVAILABLE,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=self.keepalive_expiry
+                )
+            )
+        return self
+
+    async def aclose(self):
+        """
+        Close the pooled HTTP session and drop its connections.
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> "ExchangeClient":
+        return await self.open()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    def request_weight(self, url: str, params: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Cost of a request against `rate_limit`. Venues with weighted endpoints override this.
+        """
+        return 1
+
+    def request_policy_for(self, endpoint: str) -> RequestPolicy:
+        for suffix, policy in self.endpoint_policies.items():
+            if endpoint.endswith(suffix):
+                return policy
+        return self.request_policy
+
+    async def _get(self, url: str, params: Optional[Dict[str, Any]] = None) -> httpx.Response:
+        """
+        GET through the shared session, opening it on first use and waiting for rate-limit budget.
+        """
+        if not self.is_open:
+            await self.open()
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire(self.request_weight(url, params))
+        response = await self._client.get(url, params=params)
+        if self.rate_limiter is not None:
+            self.rate_limiter.observe(response.status_code, response.headers)
+        response.raise_for_status()
+        return response
+
+    async def _request(self, url: str, params: Optional[Dict[str, Any]] = None) -> httpx.Response:
+        """
+        GET under the endpoint's `RequestPolicy` (retries, deadline, hedging).
+        """
+        endpoint = urlparse(url).path
+        return await self.request_executor.execute(
+            endpoint,
+            self.request_policy_for(endpoint),
+            lambda: self._get(url, params=params)
+        )
+
+    async def _get_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        GET and decode JSON under the endpoint's `RequestPolicy`. Identical requests already in
+        flight share one network call and one parsed result, so callers must treat the payload as read-only.
+        """
+        key = (url, tuple(sorted((params or {}).items())))
+
+        async def fetch():
+            response = await self._request(url, params=params)
+            return loads(response.content) if self.fast_decode else response.json()
+
+        return await self._single_flight.do(key, fetch)
+
+    async def _get_bytes(self, url: str, params: Optional[Dict[str, Any]] = None) -> bytes:
+        """
+        Like `_get_json`, but returns the undecoded body for the fast decoders.
+        """
+        key = ("raw", url, tuple(sorted((params or {}).items())))
+
+        async def fetch():
+            return (await self._request(url, params=params)).content
+
+        return await self._single_flight.do(key, fetch)
+
+    async def _fetch_array_order_book(
+        self,
+        symbol: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        bids_key: bytes = b'"bids"',
+        asks_key: bytes = b'"asks"',
+        depth: Optional[int] = None,
+        time_field: Optional[str] = None
+    ) -> ArrayOrderBook:
+        """
+        Fast path for `fetch_order_book`: decode the first `depth` levels of each side straight
+        from the response bytes into float64 arrays. `time_field` names the venue's millisecond timestamp.
+        """
+        raw = await self._get_bytes(url, params=params)
+        timestamp_ms = decode_int_field(raw, time_field) if time_field else None
+        return ArrayOrderBook(
+            symbol=symbol,
+            bids=ArrayLevels(decode_levels(raw, bids_key, depth)),
+            asks=ArrayLevels(decode_levels(raw, asks_key, depth)),
+            timestamp=(
+                datetime.fromtimestamp(timestamp_ms / 1000, timezone.utc) if timestamp_ms
+                else datetime.now(timezone.utc)
+            )
+        )
+
+    # --- Per-cycle snapshots ---
+
+    def start_cycle(self):
+        """
+        Start a cycle with fresh snapshots for the calling task and the tasks it spawns.
+
+        A cycle's snapshots live in a context variable rather than on the client, so scans
+        sharing one pooled client each get their own cycle: starting one never drops the
+        snapshots another scan is still reading. Concurrent loads are still coalesced.
+        """
+        self._cycle_snapshots.set({})
+
+    async def _snapshot(self, name: str, load: Callable[[], Awaitable[Snapshot]]) -> Snapshot:
+        """
+        Return this cycle's snapshot `name`, loading it once (coalesced) on first use.
+        """
+        snapshots = self._cycle_snapshots.get()
+        if snapshots is None:
+            snapshots = self._snapshots
+        snapshot = snapshots.get(name)
+        if snapshot is None or snapshot.age > self.snapshot_max_age:
+            snapshot = await self._single_flight.do(("snapshot", name), load)
+            snapshots[name] = snapshot
+        return snapshot
+
+    # --- Market data ---
+
     @abstractmethod
     async def fetch_funding_rate(self, symbol: str) -> FundingRate:
         """
@@ -20,6 +236,45 @@ class ExchangeClient(ABC):
         """
         pass
 
+    @property
+    def has_bulk_funding_rates(self) -> bool:
+        """
+        True when the venue overrides `fetch_funding_rates` with a single-request endpoint.
+        """
+        return type(self).fetch_funding_rates is not ExchangeClient.fetch_funding_rates
+
+    async def fetch_funding_rates(self, symbols: List[str]) -> Dict[str, FundingRate]:
+        """
+        Fetch funding rates for many symbols, keyed by symbol.
+        Venues with a bulk endpoint override this with a single request; the default
+        issues the single-symbol calls concurrently, at most `max_concurrency` at a time.
+        Symbols that could not be fetched are left out of the result.
+
+        Bulk endpoints usually publish the current (predicted) rate stamped with the response
+        time rather than the last settled rate, so overrides document which one they return.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def bounded(symbol: str) -> FundingRate:
+            async with semaphore:
+                return await self.fetch_funding_rate(symbol)
+
+        results = await asyncio.gather(*(bounded(symbol) for symbol in symbols), return_exceptions=True)
+        rates = {}
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                print(f"Error fetching funding rate for {symbol}: {result}")
+                continue
+            rates[symbol] = result
+        return rates
+
+    async def fetch_funding_schedules(self, symbols: List[str]) -> Dict[str, FundingSchedule]:
+        """
+        Funding interval and next settlement time per symbol, for the `FundingCalendar`.
+        Venues that publish them override this; symbols left out keep the venue's default interval.
+        """
+        return {}
+
     @abstractmethod
     async def fetch_order_book(self, symbol: str) -> OrderBook:
         """
@@ -48,4 +303,4 @@ class ExchangeClient(ABC):
 
     @property
     def symbol_map(self) -> Optional[Dict[str, str]]:
-        return None
\ No newline at end of file
+        return None
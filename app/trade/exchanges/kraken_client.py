@@ -1,8 +1,10 @@
-import httpx
 from datetime import datetime, timezone
-from typing import List
+from typing import Dict, List
 
 from app.trade.exchanges.exchange_client import ExchangeClient
+from app.trade.exchanges.rate_limiter import RateLimit
+from app.trade.exchanges.request_policy import RequestPolicy
+from app.trade.exchanges.snapshot import Snapshot
 from app.trade.entities.funding_rate import FundingRate
 from app.trade.entities.order_book import OrderBook
 from app.trade.entities.fees import Fees
@@ -11,43 +13,62 @@ DEFAULT_TAKER_FEE = 0.0004
 DEFAULT_MAKER_FEE = 0.0002
 
 class KrakenClient(ExchangeClient):
-    def __init__(self):
+    name = "kraken"
+    max_concurrency = 5
+    rate_limit = RateLimit(capacity=100, window=10.0)
+    endpoint_policies = {"/orderbook": RequestPolicy(deadline=3.0, hedge=True)}
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
         self.base_url = "https://futures.kraken.com/derivatives/api/v3"
 
     async def fetch_funding_rate(self, symbol: str) -> FundingRate:
-        async with httpx.AsyncClient() as client:
-            r = await client.get(f"{self.base_url}/tickers")
-            r.raise_for_status()
-            tickers = r.json()["tickers"]
-            for t in tickers:
-                if t["symbol"] == symbol:
-                    return FundingRate(
-                        symbol=symbol,
-                        funding_rate=float(t["fundingRate"]),
-                        timestamp=datetime.now(timezone.utc)
-                    )
+        tickers = await self._tickers_snapshot()
+        ticker = tickers.get(symbol)
+        if ticker is None or "fundingRate" not in ticker:
             raise ValueError(f"Symbol {symbol} not found in Kraken tickers.")
+        return self._to_funding_rate(ticker, tickers)
+
+    async def fetch_funding_rates(self, symbols: List[str]) -> Dict[str, FundingRate]:
+        # /tickers already lists every contract, so one download serves all symbols
+        tickers = await self._tickers_snapshot()
+        return {
+            symbol: self._to_funding_rate(tickers[symbol], tickers)
+            for symbol in symbols
+            if symbol in tickers and "fundingRate" in tickers[symbol]
+        }
 
     async def fetch_order_book(self, symbol: str) -> OrderBook:
-        async with httpx.AsyncClient() as client:
-            r = await client.get(f"{self.base_url}/orderbook", params={"symbol": symbol})
-            r.raise_for_status()
-            data = r.json()
-            order_book = data["orderBook"]
-            bids = [(float(price), float(size)) for price, size in order_book["bids"][:20]]
-            asks = [(float(price), float(size)) for price, size in order_book["asks"][:20]]
-            return OrderBook(
-                symbol=symbol,
-                bids=bids,
-                asks=asks,
-                timestamp=datetime.now(timezone.utc)
-            )
+        if self.fast_decode:
+            # Only the 20 levels we keep are decoded, not the whole book
+            return await self._fetch_array_order_book(symbol, f"{self.base_url}/orderbook", {"symbol": symbol}, depth=20)
+        data = await self._get_json(f"{self.base_url}/orderbook", params={"symbol": symbol})
+        order_book = data["orderBook"]
+        bids = [(float(price), float(size)) for price, size in order_book["bids"][:20]]
+        asks = [(float(price), float(size)) for price, size in order_book["asks"][:20]]
+        return OrderBook(
+            symbol=symbol,
+            bids=bids,
+            asks=asks,
+            timestamp=datetime.now(timezone.utc)
+        )
 
     async def fetch_fees(self, symbol: str) -> Fees:
         return Fees(maker=DEFAULT_MAKER_FEE, taker=DEFAULT_TAKER_FEE)
 
     async def fetch_tickers(self) -> List[str]:
-        async with httpx.AsyncClient() as client:
-            r = await client.get(f"{self.base_url}/tickers")
-            r.raise_for_status()
-            return [item["symbol"] for item in r.json()["tickers"]]
\ No newline at end of file
+        return (await self._tickers_snapshot()).symbols()
+
+    async def _tickers_snapshot(self) -> Snapshot:
+        async def load():
+            data = await self._get_json(f"{self.base_url}/tickers")
+            return Snapshot(data["tickers"])
+
+        return await self._snapshot("tickers", load)
+
+    def _to_funding_rate(self, ticker: dict, tickers: Snapshot) -> FundingRate:
+        return FundingRate(
+            symbol=ticker["symbol"],
+            funding_rate=float(ticker["fundingRate"]),
+            timestamp=tickers.fetched_at
+        )
\ No newline at end of file
@@ -1,22 +1,31 @@
-import httpx
-from datetime import datetime
+import asyncio
+from datetime import datetime, timezone
+from typing import Dict, List
 from app.trade.exchanges.exchange_client import ExchangeClient
+from app.trade.exchanges.rate_limiter import RateLimit
+from app.trade.exchanges.request_policy import RequestPolicy
 from app.trade.entities.funding_rate import FundingRate
+from app.trade.entities.funding_schedule import FundingSchedule
 from app.trade.entities.order_book import OrderBook
 from app.trade.entities.fees import Fees
 
 class OKXClient(ExchangeClient):
+    """
+    OKX only serves funding per instrument, so `fetch_funding_rates` uses the
+    concurrent single-call fallback from `ExchangeClient`.
+    """
+    name = "okx"
+    rate_limit = RateLimit(capacity=20, window=2.0)  # public funding-rate/books: 20 requests per 2s
+    request_policy = RequestPolicy(max_retries=1)  # the 20/2s budget leaves no room for hedges
     BASE_URL = "https://www.okx.com"
 
     async def fetch_funding_rate(self, symbol: str) -> FundingRate:
         inst_id = f"{symbol[:symbol.index('USDT')]}-USDT-SWAP"
-        async with httpx.AsyncClient() as client:
-            res = await client.get(
-                f"{self.BASE_URL}/api/v5/public/funding-rate",
-                params={"instId": inst_id}
-            )
-            res.raise_for_status()
-            data = res.json()["data"][0]
+        res = await self._get_json(
+            f"{self.BASE_URL}/api/v5/public/funding-rate",
+            params={"instId": inst_id}
+        )
+        data = res["data"][0]
 
         return FundingRate(
             symbol=symbol,
@@ -24,15 +33,41 @@ class OKXClient(ExchangeClient):
             timestamp=datetime.fromtimestamp(int(data["fundingTime"]) / 1000)
         )
 
+    async def fetch_funding_schedules(self, symbols: List[str]) -> Dict[str, FundingSchedule]:
+        """
+        Per instrument, like the funding rates: `fundingTime` is the next settlement and
+        `nextFundingTime` the one after, so their difference is the interval.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch(symbol: str) -> FundingSchedule:
+            inst_id = f"{symbol[:symbol.index('USDT')]}-USDT-SWAP"
+            async with semaphore:
+                res = await self._get_json(f"{self.BASE_URL}/api/v5/public/funding-rate", params={"instId": inst_id})
+            data = res["data"][0]
+            funding_time, next_funding_time = int(data["fundingTime"]), int(data["nextFundingTime"])
+            return FundingSchedule(
+                exchange=self.name,
+                symbol=symbol,
+                interval_hours=(next_funding_time - funding_time) / 3_600_000,
+                next_funding_time=datetime.fromtimestamp(funding_time / 1000, timezone.utc)
+            )
+
+        results = await asyncio.gather(*(fetch(symbol) for symbol in symbols), return_exceptions=True)
+        return {
+            symbol: result
+            for symbol, result in zip(symbols, results)
+            if not isinstance(result, Exception) and result.interval_hours > 0
+        }
+
     async def fetch_order_book(self, symbol: str) -> OrderBook:
         inst_id = f"{symbol[:symbol.index('USDT')]}-USDT-SWAP"
-        async with httpx.AsyncClient() as client:
-            res = await client.get(
-                f"{self.BASE_URL}/api/v5/market/books",
-                params={"instId": inst_id, "sz": "20"}
-            )
-            res.raise_for_status()
-            data = res.json()["data"][0]
+        url = f"{self.BASE_URL}/api/v5/market/books"
+        params = {"instId": inst_id, "sz": "20"}
+        if self.fast_decode:
+            return await self._fetch_array_order_book(symbol, url, params, time_field="ts")
+        res = await self._get_json(url, params=params)
+        data = res["data"][0]
 
         bids = [(float(b[0]), float(b[1])) for b in data["bids"]]
         asks = [(float(a[0]), float(a[1])) for a in data["asks"]]
@@ -0,0 +1,171 @@
+import asyncio
+import math
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional
+
+DEFAULT_HEADROOM = 0.9  # fraction of the venue budget we allow ourselves to spend
+DEFAULT_BAN_BACKOFF = 60.0  # seconds to pause on 429/418 when the venue sends no Retry-After
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """
+    A venue's request budget: `capacity` weight units per `window` seconds.
+    """
+    capacity: int
+    window: float
+    used_weight_header: Optional[str] = None  # header reporting weight already used in the window (Binance)
+
+
+def retry_after_seconds(value: Optional[str], now: Optional[datetime] = None) -> float:
+    """
+    Seconds to wait for a `Retry-After` value, which is either delay-seconds or an HTTP date
+    (RFC 9110). Anything missing or unparseable falls back to `DEFAULT_BAN_BACKOFF`.
+    """
+    if not value:
+        return DEFAULT_BAN_BACKOFF
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            return DEFAULT_BAN_BACKOFF
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)  # "-0000": UTC per RFC 5322
+        seconds = (retry_at - (now or datetime.now(timezone.utc))).total_seconds()
+    if not math.isfinite(seconds):
+        return DEFAULT_BAN_BACKOFF
+    return max(0.0, seconds)
+
+
+class RateLimiter:
+    """
+    Token bucket in request-weight units, shared by every client of one venue.
+
+    Callers `acquire` the weight of a request before sending it and pass the response
+    to `observe`. Usage headers pull the local budget down to what the venue reports,
+    so we slow down before the limit rather than after a 429; a 429/418 pauses the
+    whole venue for its `Retry-After`.
+
+    State is guarded by a thread lock and waits are plain `asyncio.sleep`, so one limiter
+    can be shared by clients running on different event loops.
+    """
+
+    def __init__(self, name: str, limit: RateLimit, headroom: float = DEFAULT_HEADROOM):
+        """
+        :param headroom: Fraction of `limit.capacity` to use, leaving the rest for other consumers of the same IP.
+        """
+        self.name = name
+        self.limit = limit
+        self.capacity = max(1.0, limit.capacity * headroom)
+        self.refill_rate = self.capacity / limit.window
+        self.tokens = self.capacity
+        self.used_weight: Optional[int] = None  # last value reported by the venue
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.throttled = 0  # 429/418 responses seen
+        self._paused_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    async def acquire(self, weight: float = 1):
+        """
+        Wait until `weight` units are available, then spend them.
+        """
+        weight = min(weight, self.capacity)
+        waited = False
+        while True:
+            delay = self._try_acquire(weight)
+            if delay <= 0:
+                return
+            if not waited:
+                self.waits += 1
+                waited = True
+            self.wait_seconds += delay
+            await asyncio.sleep(delay)
+
+    def _try_acquire(self, weight: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now < self._paused_until:
+                return self._paused_until - now
+            if self.tokens >= weight:
+                self.tokens -= weight
+                return 0.0
+            return (weight - self.tokens) / self.refill_rate
+
+    def observe(self, status_code: int, headers: Mapping[str, str]):
+        """
+        Reconcile the bucket with a response: usage headers and 429/418 bans.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            remaining = self._remaining_from_headers(headers)
+            if remaining is not None:
+                self.tokens = min(self.tokens, remaining)
+            if status_code in (418, 429):
+                self.throttled += 1
+                pause = retry_after_seconds(headers.get("Retry-After"))
+                self._paused_until = max(self._paused_until, now + pause)
+                self.tokens = 0.0
+
+    def _remaining_from_headers(self, headers: Mapping[str, str]) -> Optional[float]:
+        if self.limit.used_weight_header:
+            used = headers.get(self.limit.used_weight_header)
+            if used is not None:
+                self.used_weight = int(used)
+                return max(0.0, self.capacity - self.used_weight)
+        return None
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.refill_rate)
+        self._updated = now
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Current budget, for the bot status.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            return {
+                "available": round(self.tokens, 1),
+                "capacity": round(self.capacity, 1),
+                "window": self.limit.window,
+                "used_weight": self.used_weight,
+                "paused_for": round(max(0.0, self._paused_until - now), 1),
+                "waits": self.waits,
+                "wait_seconds": round(self.wait_seconds, 3),
+                "throttled": self.throttled,
+            }
+
+
+_shared_limiters: Dict[str, RateLimiter] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_rate_limiter(name: str, limit: RateLimit) -> RateLimiter:
+    """
+    The process-wide limiter for venue `name`; the budget is per IP, so every client shares it.
+    """
+    with _shared_lock:
+        limiter = _shared_limiters.get(name)
+        if limiter is None:
+            limiter = _shared_limiters[name] = RateLimiter(name, limit)
+        return limiter
+
+
+def rate_limit_status() -> Dict[str, Dict[str, Any]]:
+    """
+    Budget of every venue a client has been created for in this process.
+    """
+    with _shared_lock:
+        limiters = list(_shared_limiters.values())
+    return {limiter.name: limiter.status() for limiter in limiters}
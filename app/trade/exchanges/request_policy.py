@@ -0,0 +1,232 @@
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+import httpx
+
+from app.metrics import Counter, LatencyHistogram, MetricsRegistry, shared_metrics_registry
+
+T = TypeVar("T")
+
+DEFAULT_LATENCY_SAMPLES = 200  # recent successful latencies kept per endpoint for the hedge delay
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+REQUEST_SECONDS = "exchange_request_seconds"
+REQUESTS = "exchange_requests_total"
+REQUEST_ERRORS = "exchange_request_errors_total"
+
+
+class RequestDeadlineExceeded(Exception):
+    """The endpoint deadline passed before any attempt succeeded."""
+
+
+@dataclass(frozen=True)
+class RequestPolicy:
+    """
+    How one endpoint is called: retries, overall deadline and optional hedging.
+    """
+    max_retries: int = 2
+    base_backoff: float = 0.1  # seconds; doubled per retry, with full jitter
+    max_backoff: float = 2.0
+    deadline: float = 8.0  # seconds for the whole call, retries included
+    hedge: bool = False
+    hedge_quantile: float = 0.95  # fire the duplicate once the first attempt is slower than this quantile
+    hedge_min_delay: float = 0.05
+    hedge_min_samples: int = 20  # no hedging until the latency estimate is meaningful
+
+
+def is_retryable(error: BaseException) -> bool:
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (httpx.TransportError, asyncio.TimeoutError))
+
+
+class EndpointStats:
+    def __init__(
+        self,
+        samples: int = DEFAULT_LATENCY_SAMPLES,
+        latency: Optional[LatencyHistogram] = None,
+        requests: Optional[Counter] = None,
+        errors: Optional[Counter] = None
+    ):
+        """
+        :param latency: Whole-call durations (retries and hedges included), kept for metrics;
+            `latencies` holds the recent per-attempt samples the hedge delay is derived from.
+        """
+        self.latency = latency if latency is not None else LatencyHistogram()
+        self.request_counter = requests if requests is not None else Counter()
+        self.error_counter = errors if errors is not None else Counter()
+        self.requests = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0  # the duplicate answered first
+        self.errors = 0
+        self.deadlines = 0
+        self.latencies: Deque[float] = deque(maxlen=samples)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+    def summary(self) -> Dict[str, Any]:
+        p50, p95, p99 = (self.quantile(q) for q in (0.5, 0.95, 0.99))
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "errors": self.errors,
+            "deadlines": self.deadlines,
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "p99_ms": round(p99 * 1000, 1) if p99 is not None else None,
+        }
+
+
+class RequestExecutor:
+    """
+    Runs exchange calls under a `RequestPolicy`: jittered exponential retries on retryable
+    errors, a deadline per endpoint, and optional hedging that sends a duplicate once the
+    first attempt is slower than the endpoint's recent p95 and keeps whichever answers first.
+
+    Latency samples and counters are kept per endpoint and shared by every client of a venue,
+    so the hedge delay survives the short-lived clients of each scan. Whole-call latencies and
+    request/error counts also go to `metrics`, labelled by exchange and endpoint.
+    """
+
+    def __init__(self, name: str, metrics: Optional[MetricsRegistry] = None):
+        self.name = name
+        self.metrics = metrics if metrics is not None else shared_metrics_registry()
+        self.endpoints: Dict[str, EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def stats_for(self, endpoint: str) -> EndpointStats:
+        with self._lock:
+            stats = self.endpoints.get(endpoint)
+            if stats is None:
+                labels = {"exchange": self.name, "endpoint": endpoint}
+                stats = self.endpoints[endpoint] = EndpointStats(
+                    latency=self.metrics.histogram(REQUEST_SECONDS, "Duration of exchange calls, retries included", **labels),
+                    requests=self.metrics.counter(REQUESTS, "Exchange calls", **labels),
+                    errors=self.metrics.counter(REQUEST_ERRORS, "Exchange calls that failed after retries", **labels)
+                )
+            return stats
+
+    async def execute(self, endpoint: str, policy: RequestPolicy, call: Callable[[], Awaitable[T]]) -> T:
+        stats = self.stats_for(endpoint)
+        stats.request_counter.inc()
+        started = time.perf_counter()
+        try:
+            return await self._execute(endpoint, stats, policy, call)
+        except Exception:
+            stats.error_counter.inc()
+            raise
+        finally:
+            stats.latency.record(time.perf_counter() - started)
+
+    async def _execute(self, endpoint: str, stats: EndpointStats, policy: RequestPolicy, call: Callable[[], Awaitable[T]]) -> T:
+        stats.requests += 1
+        deadline = time.monotonic() + policy.deadline
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+                return await asyncio.wait_for(self._attempt(stats, policy, call), remaining)
+            except asyncio.TimeoutError:
+                if time.monotonic() >= deadline:
+                    stats.deadlines += 1
+                    raise RequestDeadlineExceeded(
+                        f"{self.name} {endpoint}: no answer within {policy.deadline}s ({attempt + 1} attempts)"
+                    )
+                error = asyncio.TimeoutError()
+            except Exception as e:
+                error = e
+            if attempt >= policy.max_retries or not is_retryable(error):
+                stats.errors += 1
+                raise error
+            attempt += 1
+            stats.retries += 1
+            backoff = min(policy.max_backoff, policy.base_backoff * 2 ** (attempt - 1)) * random.random()
+            await asyncio.sleep(min(backoff, max(0.0, deadline - time.monotonic())))
+
+    async def _attempt(self, stats: EndpointStats, policy: RequestPolicy, call: Callable[[], Awaitable[T]]) -> T:
+        hedge_delay = self._hedge_delay(stats, policy)
+        if hedge_delay is None:
+            return await self._timed(stats, call)
+
+        first = asyncio.ensure_future(self._timed(stats, call))
+        tasks = {first}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+            if not done:
+                stats.hedges += 1
+                tasks.add(asyncio.ensure_future(self._timed(stats, call)))
+            error: Optional[BaseException] = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                # Both attempts can finish in the same round: any success beats any failure
+                succeeded = []
+                for task in done:
+                    if task.cancelled():
+                        continue
+                    if task.exception() is None:
+                        succeeded.append(task)
+                    else:
+                        error = task.exception()
+                if succeeded:
+                    winner = first if first in succeeded else succeeded[0]
+                    if winner is not first:
+                        stats.hedge_wins += 1
+                    return winner.result()
+            raise error if error is not None else asyncio.CancelledError()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _hedge_delay(self, stats: EndpointStats, policy: RequestPolicy) -> Optional[float]:
+        if not policy.hedge or len(stats.latencies) < policy.hedge_min_samples:
+            return None
+        return max(policy.hedge_min_delay, stats.quantile(policy.hedge_quantile))
+
+    async def _timed(self, stats: EndpointStats, call: Callable[[], Awaitable[T]]) -> T:
+        start = time.perf_counter()
+        result = await call()
+        stats.latencies.append(time.perf_counter() - start)
+        return result
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            endpoints = dict(self.endpoints)
+        return {endpoint: stats.summary() for endpoint, stats in endpoints.items()}
+
+
+_shared_executors: Dict[str, RequestExecutor] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_request_executor(name: str) -> RequestExecutor:
+    """
+    The process-wide executor (and latency history) for venue `name`.
+    """
+    with _shared_lock:
+        executor = _shared_executors.get(name)
+        if executor is None:
+            executor = _shared_executors[name] = RequestExecutor(name)
+        return executor
+
+
+def request_metrics() -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """
+    Per-venue, per-endpoint request counters and latency quantiles.
+    """
+    with _shared_lock:
+        executors = list(_shared_executors.values())
+    return {executor.name: executor.summary() for executor in executors}
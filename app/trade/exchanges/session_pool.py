@@ -0,0 +1,39 @@
+from typing import Callable, Dict, List, Optional
+
+from app.trade.exchanges.exchange_client import ExchangeClient
+
+
+class ExchangeSessionPool:
+    """
+    One open client per venue, kept for the life of an event loop, so repeated scans reuse
+    warm connections, bulk snapshots and the single-flight table instead of cold-starting a
+    session each time. Clients are bound to the loop that opened them: create and use the
+    pool on one long-lived loop and `aclose` it there.
+    """
+
+    def __init__(self, client_factory: Optional[Callable[[str], ExchangeClient]] = None):
+        """
+        :param client_factory: Builds an unopened client for a venue name (defaults to `get_exchange_by_name`).
+        """
+        if client_factory is None:
+            from app.trade.exchanges import get_exchange_by_name
+            client_factory = get_exchange_by_name
+        self.client_factory = client_factory
+        self._clients: Dict[str, ExchangeClient] = {}
+
+    async def client(self, name: str) -> ExchangeClient:
+        """
+        The open client for `name`, created on first use and reopened if it was closed.
+        """
+        client = self._clients.get(name)
+        if client is None:
+            client = self._clients[name] = self.client_factory(name)
+        return await client.open()
+
+    def names(self) -> List[str]:
+        return list(self._clients)
+
+    async def aclose(self):
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            await client.aclose()
@@ -0,0 +1,40 @@
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class Snapshot:
+    """
+    Symbol-indexed view of one bulk exchange payload (e.g. a tickers list), taken once per cycle
+    so every later lookup in that cycle is a dict hit instead of another download and scan.
+    """
+
+    def __init__(self, rows: Iterable[Dict[str, Any]], key: str = "symbol", fetched_at: Optional[datetime] = None):
+        """
+        :param rows: Payload rows, one per symbol.
+        :param key: Row field holding the symbol.
+        :param fetched_at: Venue timestamp of the payload, if it has one (defaults to now, UTC).
+        """
+        self._rows: Dict[str, Dict[str, Any]] = {row[key]: row for row in rows}
+        self.fetched_at = fetched_at or datetime.now(timezone.utc)
+        self._created = time.monotonic()
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was taken."""
+        return time.monotonic() - self._created
+
+    def get(self, symbol: str, default: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        return self._rows.get(symbol, default)
+
+    def symbols(self) -> List[str]:
+        return list(self._rows)
+
+    def __getitem__(self, symbol: str) -> Dict[str, Any]:
+        return self._rows[symbol]
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
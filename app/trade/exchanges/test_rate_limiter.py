@@ -0,0 +1,77 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+
+from app.trade.exchanges.binance_client import BinanceClient
+from app.trade.exchanges.rate_limiter import DEFAULT_BAN_BACKOFF, RateLimit, RateLimiter, retry_after_seconds
+
+
+@pytest.mark.asyncio
+async def test_bucket_paces_requests_to_the_refill_rate():
+    limiter = RateLimiter("test", RateLimit(capacity=10, window=0.1), headroom=1.0)
+
+    start = asyncio.get_running_loop().time()
+    for _ in range(20):
+        await limiter.acquire(1)
+    elapsed = asyncio.get_running_loop().time() - start
+
+    assert elapsed >= 0.09  # the second 10 units had to wait for one window of refill
+    assert limiter.waits > 0
+
+
+@pytest.mark.asyncio
+async def test_used_weight_header_and_ban_throttle_ahead_of_the_venue():
+    limiter = RateLimiter("test", RateLimit(capacity=2400, window=60, used_weight_header="X-MBX-USED-WEIGHT-1M"))
+
+    limiter.observe(200, {"X-MBX-USED-WEIGHT-1M": "2150"})
+    assert limiter.status()["available"] < 20  # 90% headroom leaves 2160 - 2150
+
+    limiter.observe(429, {"Retry-After": "0.05"})
+    start = asyncio.get_running_loop().time()
+    await limiter.acquire(1)
+    assert asyncio.get_running_loop().time() - start >= 0.05
+    assert limiter.throttled == 1
+
+
+def test_binance_depth_weight_follows_limit():
+    client = BinanceClient(rate_limiter=RateLimiter("test", BinanceClient.rate_limit))
+
+    assert client.request_weight(client.order_book_url, {"symbol": "BTCUSDT", "limit": 5}) == 2
+    assert client.request_weight(client.order_book_url, {"symbol": "BTCUSDT", "limit": 1000}) == 20
+    assert client.request_weight(client.premium_index_url) == 10
+    assert client.request_weight(client.funding_url, {"symbol": "BTCUSDT"}) == 1
+
+
+@pytest.mark.asyncio
+async def test_client_spends_weight_and_reads_headers():
+    def handler(request):
+        return httpx.Response(200, json={"lastUpdateId": 1, "bids": [], "asks": []}, headers={"X-MBX-USED-WEIGHT-1M": "42"})
+
+    limiter = RateLimiter("test", BinanceClient.rate_limit)
+    client = BinanceClient(rate_limiter=limiter)
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    await client.fetch_order_book("BTCUSDT")
+    await client.aclose()
+
+    assert limiter.used_weight == 42
+    assert limiter.status()["available"] <= limiter.capacity - 42
+
+
+def test_retry_after_accepts_http_dates_and_falls_back_on_garbage():
+    now = datetime(2024, 5, 1, 8, 0, 0, tzinfo=timezone.utc)
+    assert retry_after_seconds("120", now) == 120.0
+    assert retry_after_seconds("Wed, 01 May 2024 08:00:30 GMT", now) == 30.0
+    assert retry_after_seconds("Wed, 01 May 2024 07:59:00 GMT", now) == 0.0  # already passed
+    for value in (None, "", "soon", "inf", "Wed, 99 Foo 2024"):
+        assert retry_after_seconds(value, now) == DEFAULT_BAN_BACKOFF
+
+
+def test_ban_with_http_date_retry_after_pauses_instead_of_raising():
+    limiter = RateLimiter("test", RateLimit(capacity=10, window=1))
+    limiter.observe(429, {"Retry-After": format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)})
+    assert limiter.throttled == 1
+    assert 25 < limiter.status()["paused_for"] <= 30
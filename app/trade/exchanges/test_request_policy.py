@@ -0,0 +1,134 @@
+import asyncio
+import pytest
+
+import httpx
+
+from app.metrics import MetricsRegistry
+from app.trade.exchanges.request_policy import (
+    REQUEST_ERRORS,
+    REQUEST_SECONDS,
+    REQUESTS,
+    RequestDeadlineExceeded,
+    RequestExecutor,
+    RequestPolicy
+)
+
+
+def server_error():
+    request = httpx.Request("GET", "https://example.test/depth")
+    return httpx.HTTPStatusError("503", request=request, response=httpx.Response(503, request=request))
+
+
+@pytest.mark.asyncio
+async def test_retryable_errors_are_retried_and_others_are_not():
+    executor = RequestExecutor("test")
+    calls = 0
+
+    async def flaky():
+        nonlocal calls
+        calls += 1
+        if calls < 3:
+            raise server_error()
+        return "ok"
+
+    assert await executor.execute("/depth", RequestPolicy(max_retries=2, base_backoff=0.001), flaky) == "ok"
+    assert executor.stats_for("/depth").retries == 2
+
+    async def bad_request():
+        raise ValueError("not retryable")
+
+    with pytest.raises(ValueError):
+        await executor.execute("/other", RequestPolicy(max_retries=5), bad_request)
+    assert executor.stats_for("/other").retries == 0
+
+
+@pytest.mark.asyncio
+async def test_deadline_bounds_the_whole_call():
+    executor = RequestExecutor("test")
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    start = asyncio.get_running_loop().time()
+    with pytest.raises(RequestDeadlineExceeded):
+        await executor.execute("/depth", RequestPolicy(deadline=0.1), hang)
+    assert asyncio.get_running_loop().time() - start < 0.3
+    assert executor.stats_for("/depth").deadlines == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_fires_after_p95_and_takes_the_fast_answer():
+    executor = RequestExecutor("test")
+    policy = RequestPolicy(hedge=True, hedge_min_samples=5, hedge_min_delay=0.01)
+    stats = executor.stats_for("/depth")
+    stats.latencies.extend([0.01] * 10)
+    calls = 0
+
+    async def first_slow():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(1.0 if calls == 1 else 0.01)
+        return calls
+
+    start = asyncio.get_running_loop().time()
+    assert await executor.execute("/depth", policy, first_slow) == 2
+    assert asyncio.get_running_loop().time() - start < 0.2
+    assert stats.hedges == 1
+    assert stats.hedge_wins == 1
+
+
+@pytest.mark.asyncio
+async def test_whole_calls_are_recorded_per_exchange_and_endpoint():
+    metrics = MetricsRegistry()
+    executor = RequestExecutor("test", metrics=metrics)
+
+    async def ok():
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    async def bad_request():
+        raise ValueError("not retryable")
+
+    for _ in range(3):
+        await executor.execute("/depth", RequestPolicy(), ok)
+    with pytest.raises(ValueError):
+        await executor.execute("/depth", RequestPolicy(), bad_request)
+
+    assert metrics.value(REQUESTS, exchange="test", endpoint="/depth") == 4
+    assert metrics.value(REQUEST_ERRORS, exchange="test", endpoint="/depth") == 1
+    [(labels, latency)] = metrics.series(REQUEST_SECONDS)
+    assert labels == {"exchange": "test", "endpoint": "/depth"}
+    assert latency.count == 4 and latency.percentile(0.95) >= 0.01
+
+
+@pytest.mark.asyncio
+async def test_hedge_success_wins_over_a_failure_finishing_at_the_same_moment():
+    async def hedged_call():
+        executor = RequestExecutor("test")
+        policy = RequestPolicy(hedge=True, hedge_min_samples=5, hedge_min_delay=0.01, max_retries=0)
+        executor.stats_for("/depth").latencies.extend([0.01] * 10)
+        release = asyncio.Event()
+        calls = 0
+
+        async def original_fails_hedge_succeeds():
+            nonlocal calls
+            calls += 1
+            attempt = calls
+            await release.wait()  # both attempts wake, and finish, in the same loop iteration
+            if attempt == 1:
+                raise ValueError("original failed")
+            return "hedge"
+
+        async def release_both():
+            while calls < 2:
+                await asyncio.sleep(0.005)
+            release.set()
+
+        releaser = asyncio.ensure_future(release_both())
+        result = await executor.execute("/depth", policy, original_fails_hedge_succeeds)
+        await releaser
+        return result, executor.stats_for("/depth").hedge_wins
+
+    # The order of the finished attempts within a round varies, so cover both orders
+    for _ in range(20):
+        assert await hedged_call() == ("hedge", 1)
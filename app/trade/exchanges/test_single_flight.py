@@ -0,0 +1,124 @@
+import asyncio
+import pytest
+
+from app.trade.exchanges.single_flight import SingleFlight
+from app.trade.exchanges.kraken_client import KrakenClient
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+TICKERS = {
+    "tickers": [
+        {"symbol": "PF_XBTUSD", "fundingRate": "0.0001"},
+        {"symbol": "PF_ETHUSD", "fundingRate": "-0.0002"},
+        {"symbol": "FI_XBTUSD_250926"},
+    ]
+}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_with_same_key_share_one_execution():
+    single_flight = SingleFlight()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"value": calls}
+
+    results = await asyncio.gather(*(single_flight.do("k", work) for _ in range(5)))
+
+    assert calls == 1
+    assert all(result is results[0] for result in results)
+    assert single_flight.coalesced == 4
+    assert single_flight.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared_and_not_cached():
+    single_flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(*(single_flight.do("k", fail) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(r, ValueError) for r in results)
+
+    async def succeed():
+        return 42
+
+    assert await single_flight.do("k", succeed) == 42
+
+
+@pytest.mark.asyncio
+async def test_kraken_downloads_tickers_once_per_cycle():
+    client = KrakenClient()
+    downloads = 0
+
+    async def fake_get(url, params=None):
+        nonlocal downloads
+        downloads += 1
+        await asyncio.sleep(0.01)
+        return FakeResponse(TICKERS)
+
+    client._get = fake_get
+
+    rates = await asyncio.gather(client.fetch_funding_rate("PF_XBTUSD"), client.fetch_funding_rate("PF_ETHUSD"))
+    tickers = await client.fetch_tickers()
+    bulk = await client.fetch_funding_rates(["PF_XBTUSD", "FI_XBTUSD_250926", "MISSING"])
+
+    assert downloads == 1
+    assert [rate.funding_rate for rate in rates] == [0.0001, -0.0002]
+    assert tickers == ["PF_XBTUSD", "PF_ETHUSD", "FI_XBTUSD_250926"]
+    assert list(bulk) == ["PF_XBTUSD"]
+
+    client.start_cycle()
+    await client.fetch_funding_rate("PF_XBTUSD")
+    assert downloads == 2
+
+
+@pytest.mark.asyncio
+async def test_a_new_cycle_on_a_shared_client_keeps_other_scans_snapshots():
+    client = KrakenClient()
+    downloads = 0
+
+    async def fake_get(url, params=None):
+        nonlocal downloads
+        downloads += 1
+        return FakeResponse(TICKERS)
+
+    client._get = fake_get
+    first_scan_loaded = asyncio.Event()
+    second_cycle_started = asyncio.Event()
+    first_scan_done = asyncio.Event()
+
+    async def first_scan():
+        client.start_cycle()
+        await client.fetch_funding_rate("PF_XBTUSD")
+        first_scan_loaded.set()
+        await second_cycle_started.wait()
+        tickers = await client.fetch_tickers()
+        first_scan_done.set()
+        return tickers, downloads
+
+    async def second_scan():
+        await first_scan_loaded.wait()
+        client.start_cycle()
+        second_cycle_started.set()
+        await first_scan_done.wait()
+        return await client.fetch_funding_rate("PF_ETHUSD")
+
+    (tickers, downloads_in_first_scan), rate = await asyncio.gather(first_scan(), second_scan())
+
+    assert downloads_in_first_scan == 1  # the second cycle did not drop the first scan's snapshot
+    assert downloads == 2  # ...and got a fresh one of its own
+    assert tickers == ["PF_XBTUSD", "PF_ETHUSD", "FI_XBTUSD_250926"]
+    assert rate.funding_rate == -0.0002
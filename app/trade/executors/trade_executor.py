@@ -1,16 +1,67 @@
+from typing import Iterable, List, Optional
+
 from app.trade.entities.signal import Signal, SignalAction
+from app.trade.risk.risk_engine import NO_ACTION, RiskEngine
 
 
 class TradeExecutor:
-    def __init__(self, exchange_client, test_mode: bool = True):
+    def __init__(self, exchange_client, test_mode: bool = True, risk_engine: Optional[RiskEngine] = None):
+        """
+        :param risk_engine: Pre-trade gate; signals it rejects are not sent, and executed ones are recorded as fills.
+        """
         self.exchange = exchange_client
         self.test_mode = test_mode
+        self.risk_engine = risk_engine
+
+    async def execute(self, signal: Signal) -> Optional[str]:
+        """
+        Send the order for `signal`; returns the risk engine's rejection reason if it was blocked.
+        """
+        if signal.action not in [SignalAction.BUY, SignalAction.SELL]:
+            return None
+        if self.risk_engine is not None:
+            reason = self.risk_engine.check(signal, exchange=self.exchange.name)
+            if reason is not None:
+                print(f"[RISK] Rejected {signal.symbol}: {reason}")
+                return reason
+        await self._send(signal)
+        return None
 
-    async def execute(self, signal: Signal):
-        if signal.signal_action not in [SignalAction.BUY, SignalAction.SELL]:
-            return
+    async def execute_batch(self, signals: Iterable[Signal]) -> List[Optional[str]]:
+        """
+        Gate the whole batch in one risk check, then send the accepted orders in order.
+        Returns one entry per signal, in order: None if it was sent, otherwise why not
+        (`NO_ACTION` for signals that are neither BUY nor SELL).
+        """
+        signals = list(signals)
+        actionable = [signal for signal in signals if signal.action in [SignalAction.BUY, SignalAction.SELL]]
+        reasons = iter(
+            self.risk_engine.check_batch(actionable, exchange=self.exchange.name)
+            if self.risk_engine is not None else [None] * len(actionable)
+        )
+        results = []
+        for signal in signals:
+            if signal.action not in [SignalAction.BUY, SignalAction.SELL]:
+                results.append(NO_ACTION)
+                continue
+            reason = next(reasons)
+            if reason is None:
+                await self._send(signal)
+            else:
+                print(f"[RISK] Rejected {signal.symbol}: {reason}")
+            results.append(reason)
+        return results
 
+    async def _send(self, signal: Signal):
         if self.test_mode:
             print(f"[TEST] Would execute: {signal}")
         else:
-            await self.exchange.place_order(signal)
\ No newline at end of file
+            await self.exchange.place_order(signal)
+        if self.risk_engine is not None:
+            # Dry runs count as fills too, so the limits behave the same in test mode
+            self.risk_engine.on_fill(
+                self.exchange.name,
+                signal.symbol,
+                signal.action,
+                self.risk_engine.order_notional(signal)
+            )
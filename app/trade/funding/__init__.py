@@ -0,0 +1,2 @@
+from app.trade.funding.funding_calendar import FundingCalendar, shared_funding_calendar, EXCHANGE_FUNDING_INTERVAL_HOURS
+from app.trade.funding.funding_scheduler import FundingScheduler
@@ -0,0 +1,140 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.trade.entities.funding_schedule import FundingSchedule
+from app.crypto_funding_arbitrage.utility.time_to_next_funding_cycle import time_to_next_funding_cycle
+
+DEFAULT_FUNDING_INTERVAL_HOURS = 8
+# Venue default when no per-symbol schedule has been loaded yet
+EXCHANGE_FUNDING_INTERVAL_HOURS = {
+    "binance": 8,
+    "bybit": 8,
+    "okx": 8,
+    "deribit": 1,
+    "kraken": 1,
+}
+DEFAULT_REFRESH_INTERVAL = 3600.0  # seconds between calendar refreshes from a venue
+
+
+class FundingCalendar:
+    """
+    Funding schedule per (exchange, symbol): the interval and, once known, the next settlement
+    time. Symbols without a loaded schedule fall back to their venue's default interval counted
+    from midnight UTC. Schedules come from the venues (`refresh`) and from streamed ticks
+    (`update_from_table`), and known settlement times roll forward on their own between refreshes.
+
+    Guarded by a thread lock so the stream thread and the scan loops can share one calendar.
+    """
+
+    def __init__(self, intervals: Optional[Dict[str, float]] = None):
+        """
+        :param intervals: Override the default interval (hours) per venue.
+        """
+        self.intervals = {**EXCHANGE_FUNDING_INTERVAL_HOURS, **(intervals or {})}
+        self.version = 0  # bumped on every change, for caches keyed on the calendar
+        self._schedules: Dict[Tuple[str, str], FundingSchedule] = {}
+        self._refreshed: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def default_interval(self, exchange: Optional[str]) -> float:
+        return self.intervals.get(exchange, DEFAULT_FUNDING_INTERVAL_HOURS)
+
+    def schedule(self, exchange: Optional[str], symbol: str) -> FundingSchedule:
+        with self._lock:
+            schedule = self._schedules.get((exchange, symbol))
+        if schedule is None:
+            return FundingSchedule(exchange=exchange, symbol=symbol, interval_hours=self.default_interval(exchange))
+        return schedule
+
+    def update(self, schedules: Iterable[FundingSchedule]):
+        with self._lock:
+            changed = False
+            for schedule in schedules:
+                key = (schedule.exchange, schedule.symbol)
+                if self._schedules.get(key) != schedule:
+                    self._schedules[key] = schedule
+                    changed = True
+            if changed:
+                self.version += 1
+
+    def time_to_next_funding(self, exchange: Optional[str], symbol: str, now: datetime) -> timedelta:
+        """
+        Time from `now` to the symbol's next settlement. `now` may be naive, in which case it is UTC.
+        """
+        schedule = self.schedule(exchange, symbol)
+        if schedule.next_funding_time is None:
+            return time_to_next_funding_cycle(now, int(schedule.interval_hours))
+        if now.tzinfo is None:
+            now = now.replace(tzinfo=timezone.utc)
+        next_time = schedule.next_funding_time
+        if next_time <= now:
+            # Settled since the schedule was loaded: roll forward whole intervals
+            interval = timedelta(hours=schedule.interval_hours)
+            next_time += interval * ((now - next_time) // interval + 1)
+        return next_time - now
+
+    def next_funding_time(self, exchange: Optional[str], symbol: str, now: Optional[datetime] = None) -> datetime:
+        now = now or datetime.now(timezone.utc)
+        if now.tzinfo is None:
+            now = now.replace(tzinfo=timezone.utc)
+        return now + self.time_to_next_funding(exchange, symbol, now)
+
+    def fingerprint(self, exchange: Optional[str], symbol: str) -> tuple:
+        """
+        Identity of the symbol's schedule, for caches of results that depend on it.
+        """
+        schedule = self.schedule(exchange, symbol)
+        return schedule.interval_hours, schedule.next_funding_time
+
+    def update_from_table(self, table) -> int:
+        """
+        Take the next settlement times streamed into a `MarketDataTable`. Returns how many symbols were updated.
+        """
+        schedules = []
+        for exchange, symbol, tick in table.items():
+            if tick.next_funding_time is None:
+                continue
+            current = self.schedule(exchange, symbol)
+            schedules.append(FundingSchedule(
+                exchange=exchange,
+                symbol=symbol,
+                interval_hours=current.interval_hours,
+                next_funding_time=tick.next_funding_time
+            ))
+        self.update(schedules)
+        return len(schedules)
+
+    def needs_refresh(self, exchange: str, max_age: float = DEFAULT_REFRESH_INTERVAL) -> bool:
+        with self._lock:
+            refreshed = self._refreshed.get(exchange)
+        return refreshed is None or time.monotonic() - refreshed > max_age
+
+    async def refresh(self, client, symbols: List[str]) -> int:
+        """
+        Load `symbols`' schedules from an open `ExchangeClient`. Returns how many the venue reported.
+        """
+        schedules = await client.fetch_funding_schedules(symbols)
+        self.update(schedules.values())
+        with self._lock:
+            self._refreshed[client.name] = time.monotonic()
+        return len(schedules)
+
+    def __len__(self) -> int:
+        return len(self._schedules)
+
+
+_shared_calendar: Optional[FundingCalendar] = None
+_shared_lock = threading.Lock()
+
+
+def shared_funding_calendar() -> FundingCalendar:
+    """
+    The process-wide calendar read by the strategies and kept up to date by the scheduler.
+    """
+    global _shared_calendar
+    with _shared_lock:
+        if _shared_calendar is None:
+            _shared_calendar = FundingCalendar()
+        return _shared_calendar
@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from app.trade.funding.funding_calendar import DEFAULT_REFRESH_INTERVAL, FundingCalendar
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW = 15 * 60.0  # seconds before a settlement in which its symbols are scanned
+DEFAULT_ACTIVE_INTERVAL = 30.0  # seconds between scans while any symbol is inside its window
+DEFAULT_IDLE_INTERVAL = 15 * 60.0  # longest sleep when nothing is due, so refreshes and new schedules are picked up
+
+
+class FundingScheduler:
+    """
+    Scans only the symbols whose funding settles within `window`, every `active_interval`,
+    and otherwise sleeps until the next window opens (at most `idle_interval`). Hourly venues
+    are therefore scanned often and 8h venues only in the run-up to their settlements,
+    instead of every symbol on every poll.
+    """
+
+    def __init__(
+        self,
+        calendar: FundingCalendar,
+        symbols_by_exchange: Dict[str, List[str]],
+        window: float = DEFAULT_WINDOW,
+        active_interval: float = DEFAULT_ACTIVE_INTERVAL,
+        idle_interval: float = DEFAULT_IDLE_INTERVAL,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+        client_factory: Optional[Callable[[str], object]] = None,
+        market_data_table=None
+    ):
+        """
+        :param symbols_by_exchange: Universe to watch per venue.
+        :param client_factory: Builds an unopened `ExchangeClient` for refreshing the calendar; None skips venue refreshes.
+        :param market_data_table: Streamed ticks whose next funding times are merged into the calendar before each decision.
+        """
+        self.calendar = calendar
+        self.symbols_by_exchange = symbols_by_exchange
+        self.window = window
+        self.active_interval = active_interval
+        self.idle_interval = idle_interval
+        self.refresh_interval = refresh_interval
+        self.client_factory = client_factory
+        self.market_data_table = market_data_table
+        self.scans = 0
+        self.symbols_scanned = 0
+
+    def due(self, now: Optional[datetime] = None) -> Dict[str, List[str]]:
+        """
+        Symbols per venue whose next settlement is within `window` of `now`.
+        """
+        now = now or datetime.now(timezone.utc)
+        window = timedelta(seconds=self.window)
+        due = {}
+        for exchange, symbols in self.symbols_by_exchange.items():
+            selected = [
+                symbol for symbol in symbols
+                if self.calendar.time_to_next_funding(exchange, symbol, now) <= window
+            ]
+            if selected:
+                due[exchange] = selected
+        return due
+
+    def seconds_until_next_run(self, now: Optional[datetime] = None) -> float:
+        """
+        `active_interval` while anything is due, else until the earliest window opens (capped at `idle_interval`).
+        """
+        now = now or datetime.now(timezone.utc)
+        earliest = min(
+            (
+                self.calendar.time_to_next_funding(exchange, symbol, now).total_seconds()
+                for exchange, symbols in self.symbols_by_exchange.items()
+                for symbol in symbols
+            ),
+            default=None
+        )
+        if earliest is None:
+            return self.idle_interval
+        until_window = earliest - self.window
+        if until_window <= 0:
+            return self.active_interval
+        return min(until_window, self.idle_interval)
+
+    async def refresh_calendar(self):
+        """
+        Reload stale venue schedules and merge streamed next-funding times.
+        """
+        if self.market_data_table is not None:
+            self.calendar.update_from_table(self.market_data_table)
+        if self.client_factory is None:
+            return
+        for exchange, symbols in self.symbols_by_exchange.items():
+            if not self.calendar.needs_refresh(exchange, self.refresh_interval):
+                continue
+            try:
+                async with self.client_factory(exchange) as client:
+                    loaded = await self.calendar.refresh(client, symbols)
+                logger.info(f"Funding calendar: {loaded} schedules from {exchange}")
+            except Exception as e:
+                logger.warning(f"Funding calendar refresh failed for {exchange}: {e}")
+
+    async def run(self, scan: Callable[[Dict[str, List[str]]], Awaitable[None]], stop: Optional[asyncio.Event] = None):
+        """
+        Call `scan(due)` for every batch of due symbols until `stop` is set.
+        """
+        stop = stop or asyncio.Event()
+        while not stop.is_set():
+            await self.refresh_calendar()
+            due = self.due()
+            if due:
+                self.scans += 1
+                self.symbols_scanned += sum(len(symbols) for symbols in due.values())
+                started = time.monotonic()
+                try:
+                    await scan(due)
+                except Exception as e:
+                    logger.error(f"Scheduled scan failed: {e}", exc_info=True)
+                logger.debug(f"Scanned {sum(map(len, due.values()))} due symbols in {time.monotonic() - started:.2f}s")
+            try:
+                await asyncio.wait_for(stop.wait(), self.seconds_until_next_run())
+            except asyncio.TimeoutError:
+                pass
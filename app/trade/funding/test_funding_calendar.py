@@ -0,0 +1,98 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.trade.entities.funding_schedule import FundingSchedule
+from app.trade.funding import FundingCalendar, FundingScheduler
+from app.trade.streams.market_data_table import MarketDataTable, MarketTick
+
+NOW = datetime(2024, 5, 1, 6, 30, tzinfo=timezone.utc)
+
+
+def test_venue_defaults_replace_the_fixed_binance_cycle():
+    calendar = FundingCalendar()
+
+    assert calendar.time_to_next_funding("binance", "BTCUSDT", NOW) == timedelta(hours=1, minutes=30)
+    assert calendar.time_to_next_funding(None, "BTCUSDT", NOW) == timedelta(hours=1, minutes=30)
+    assert calendar.time_to_next_funding("kraken", "PF_XBTUSD", NOW) == timedelta(minutes=30)
+    assert calendar.time_to_next_funding("deribit", "BTC-PERPETUAL", NOW.replace(hour=23)) == timedelta(minutes=30)
+
+
+def test_loaded_schedule_wins_and_rolls_forward():
+    calendar = FundingCalendar()
+    calendar.update([FundingSchedule("binance", "ETHUSDT", 4, next_funding_time=NOW.replace(hour=4, minute=0))])
+    version = calendar.version
+
+    # 04:00 has passed, so the next settlement is 08:00
+    assert calendar.time_to_next_funding("binance", "ETHUSDT", NOW) == timedelta(hours=1, minutes=30)
+    assert calendar.time_to_next_funding("binance", "ETHUSDT", NOW.replace(tzinfo=None)) == timedelta(hours=1, minutes=30)
+    assert calendar.next_funding_time("binance", "ETHUSDT", NOW) == NOW.replace(hour=8, minute=0)
+
+    calendar.update([FundingSchedule("binance", "ETHUSDT", 4, next_funding_time=NOW.replace(hour=4, minute=0))])
+    assert calendar.version == version
+
+
+def test_streamed_next_funding_times_are_merged():
+    calendar = FundingCalendar()
+    table = MarketDataTable()
+    table.update(MarketTick("okx", "BTCUSDT", funding_rate=0.0001, next_funding_time=NOW + timedelta(minutes=5)))
+    table.update(MarketTick("okx", "ETHUSDT", mark_price=3000.0))
+
+    assert calendar.update_from_table(table) == 1
+    assert calendar.time_to_next_funding("okx", "BTCUSDT", NOW) == timedelta(minutes=5)
+
+
+class FakeClient:
+    name = "bybit"
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    async def fetch_funding_schedules(self, symbols):
+        return {"BTCUSDT": FundingSchedule("bybit", "BTCUSDT", 1, next_funding_time=NOW + timedelta(minutes=10))}
+
+
+def scheduler(calendar, **kwargs):
+    return FundingScheduler(
+        calendar,
+        {"binance": ["BTCUSDT", "ETHUSDT"], "kraken": ["PF_XBTUSD"]},
+        window=15 * 60, active_interval=30, idle_interval=3600,
+        **kwargs
+    )
+
+
+def test_only_symbols_near_settlement_are_due():
+    calendar = FundingCalendar()
+    calendar.update([FundingSchedule("binance", "ETHUSDT", 8, next_funding_time=NOW + timedelta(minutes=10))])
+    watcher = scheduler(calendar)
+
+    assert watcher.due(NOW) == {"binance": ["ETHUSDT"]}
+    assert watcher.seconds_until_next_run(NOW) == 30
+    # Nothing due at 06:20: sleep until the ETHUSDT window opens at 06:25
+    assert watcher.due(NOW - timedelta(minutes=10)) == {}
+    assert watcher.seconds_until_next_run(NOW - timedelta(minutes=10)) == 5 * 60
+    # Only 8h venues far from settlement: idle, capped
+    assert FundingScheduler(FundingCalendar(), {"binance": ["BTCUSDT"]}, idle_interval=3600).seconds_until_next_run(NOW.replace(hour=1)) == 3600
+
+
+@pytest.mark.asyncio
+async def test_run_refreshes_calendar_and_scans_due_symbols():
+    calendar = FundingCalendar()
+    watcher = FundingScheduler(calendar, {"bybit": ["BTCUSDT", "ETHUSDT"]}, client_factory=lambda name: FakeClient())
+    stop = asyncio.Event()
+    scanned = []
+
+    async def scan(due):
+        scanned.append(due)
+        stop.set()
+
+    watcher.due = lambda now=None: FundingScheduler.due(watcher, NOW)
+    await asyncio.wait_for(watcher.run(scan, stop), 1)
+
+    assert scanned == [{"bybit": ["BTCUSDT"]}]
+    assert not calendar.needs_refresh("bybit")
+    assert (watcher.scans, watcher.symbols_scanned) == (1, 1)
@@ -0,0 +1,2 @@
+from app.trade.history.history_store import HistoryStore, DATASETS, FUNDING, TOP_OF_BOOK, DEPTH, DEFAULT_HISTORY_DEPTH
+from app.trade.history.history_writer import HistoryWriter, epoch_us
@@ -0,0 +1,204 @@
+import os
+import re
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+FUNDING = "funding"
+TOP_OF_BOOK = "top_of_book"
+DEPTH = "depth"
+DATASETS = (FUNDING, TOP_OF_BOOK, DEPTH)
+
+DEFAULT_HISTORY_DEPTH = 20
+INDEX_FILE = "index.npy"
+INDEX_DTYPE = np.dtype([("chunk", "i8"), ("first_us", "i8"), ("last_us", "i8"), ("rows", "i8")])
+_UNSAFE = re.compile(r"[^A-Za-z0-9._-]")
+
+
+def _schema(dataset: str, depth: int) -> Dict[str, Tuple[np.dtype, tuple]]:
+    """
+    Column name -> (dtype, per-row shape). Every dataset is keyed by `time_us`, UTC epoch microseconds.
+    """
+    if dataset == FUNDING:
+        return {
+            "time_us": (np.dtype("i8"), ()),
+            "funding_rate": (np.dtype("f8"), ()),
+            "mark_price": (np.dtype("f8"), ()),  # NaN when the source did not carry one
+        }
+    if dataset == TOP_OF_BOOK:
+        return {
+            "time_us": (np.dtype("i8"), ()),
+            "bid_price": (np.dtype("f8"), ()),
+            "bid_size": (np.dtype("f8"), ()),
+            "ask_price": (np.dtype("f8"), ()),
+            "ask_size": (np.dtype("f8"), ()),
+        }
+    if dataset == DEPTH:
+        return {
+            "time_us": (np.dtype("i8"), ()),
+            "bids": (np.dtype("f8"), (depth, 2)),  # (price, quantity), best first, NaN-padded
+            "asks": (np.dtype("f8"), (depth, 2)),
+        }
+    raise ValueError(f"Unknown history dataset: {dataset}")
+
+
+class HistoryStore:
+    """
+    Append-only, columnar time series of funding rates, top-of-book and depth snapshots on local disk.
+
+    Each (dataset, exchange, symbol) is a partition directory of immutable chunks, one `.npy`
+    file per column, plus `index.npy` listing every chunk with its first/last time and row count:
+
+        <root>/<dataset>/<exchange>/<symbol>/index.npy
+        <root>/<dataset>/<exchange>/<symbol>/00000000/time_us.npy, funding_rate.npy, ...
+
+    A chunk is written to a temporary directory and renamed into place before the index is
+    atomically replaced, so readers never see a partial chunk. Rows inside a chunk are sorted
+    by time; the index lets a time-range read open only the chunks it overlaps, and columns
+    are opened with `mmap_mode="r"` so scanning months of history does not load it into RAM.
+    """
+
+    def __init__(self, root: str, depth: int = DEFAULT_HISTORY_DEPTH):
+        """
+        :param depth: Levels per side kept in depth snapshots; deeper books are cut, shallower ones NaN-padded.
+        """
+        self.root = root
+        self.depth = depth
+        self._indexes: Dict[Tuple[str, str, str], np.ndarray] = {}
+        # One appender per partition at a time, readers never wait
+        self._locks: Dict[Tuple[str, str, str], threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    # --- Writing ---
+
+    def append(self, dataset: str, exchange: str, symbol: str, columns: Dict[str, object]) -> int:
+        """
+        Write `columns` (name -> array-like of equal length) as one new chunk; returns the rows written.
+        """
+        schema = _schema(dataset, self.depth)
+        if set(columns) != set(schema):
+            raise ValueError(f"{dataset} needs columns {sorted(schema)}, got {sorted(columns)}")
+        arrays = {name: np.asarray(columns[name], dtype=dtype) for name, (dtype, _) in schema.items()}
+        rows = len(arrays["time_us"])
+        for name, (_, shape) in schema.items():
+            if arrays[name].shape != (rows,) + shape:
+                raise ValueError(f"{dataset}.{name} has shape {arrays[name].shape}, expected {(rows,) + shape}")
+        if not rows:
+            return 0
+        order = np.argsort(arrays["time_us"], kind="stable")
+        arrays = {name: np.ascontiguousarray(array[order]) for name, array in arrays.items()}
+
+        key = (dataset, exchange, symbol)
+        directory = self._partition(*key)
+        with self._partition_lock(key):
+            index = self._index(key)
+            chunk = int(index["chunk"][-1]) + 1 if len(index) else 0
+            os.makedirs(directory, exist_ok=True)
+            final = os.path.join(directory, f"{chunk:08d}")
+            staging = final + ".tmp"
+            os.makedirs(staging, exist_ok=True)
+            for name, array in arrays.items():
+                np.save(os.path.join(staging, f"{name}.npy"), array)
+            os.replace(staging, final)
+
+            entry = np.array([(chunk, arrays["time_us"][0], arrays["time_us"][-1], rows)], dtype=INDEX_DTYPE)
+            index = np.concatenate([index, entry])
+            index_path = os.path.join(directory, INDEX_FILE)
+            with open(index_path + ".tmp", "wb") as f:
+                np.save(f, index)
+            os.replace(index_path + ".tmp", index_path)
+            self._indexes[key] = index
+        return rows
+
+    # --- Reading ---
+
+    def partitions(self, dataset: str) -> List[Tuple[str, str]]:
+        """
+        `(exchange, symbol)` of every partition with data in `dataset`.
+        """
+        base = os.path.join(self.root, dataset)
+        if not os.path.isdir(base):
+            return []
+        return sorted(
+            (exchange, symbol)
+            for exchange in os.listdir(base)
+            for symbol in os.listdir(os.path.join(base, exchange))
+            if os.path.exists(os.path.join(base, exchange, symbol, INDEX_FILE))
+        )
+
+    def index(self, dataset: str, exchange: str, symbol: str) -> np.ndarray:
+        """
+        The partition's chunk index (`chunk`, `first_us`, `last_us`, `rows`), oldest chunk first.
+        """
+        path = os.path.join(self._partition(dataset, exchange, symbol), INDEX_FILE)
+        return np.load(path) if os.path.exists(path) else np.empty(0, dtype=INDEX_DTYPE)
+
+    def scan(
+        self,
+        dataset: str,
+        exchange: str,
+        symbol: str,
+        start_us: Optional[int] = None,
+        end_us: Optional[int] = None
+    ) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Memory-mapped columns of every chunk overlapping [start_us, end_us], trimmed to that range,
+        in chunk order. Nothing is read from disk until the arrays are touched.
+        """
+        directory = self._partition(dataset, exchange, symbol)
+        index = self.index(dataset, exchange, symbol)
+        if start_us is not None:
+            index = index[index["last_us"] >= start_us]
+        if end_us is not None:
+            index = index[index["first_us"] <= end_us]
+        names = list(_schema(dataset, self.depth))
+        for chunk in index["chunk"].tolist():
+            path = os.path.join(directory, f"{chunk:08d}")
+            columns = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in names}
+            times = columns["time_us"]
+            lo = 0 if start_us is None else int(np.searchsorted(times, start_us, side="left"))
+            hi = len(times) if end_us is None else int(np.searchsorted(times, end_us, side="right"))
+            if hi > lo:
+                yield {name: column[lo:hi] for name, column in columns.items()}
+
+    def read(
+        self,
+        dataset: str,
+        exchange: str,
+        symbol: str,
+        start_us: Optional[int] = None,
+        end_us: Optional[int] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Every row of the partition in [start_us, end_us], sorted by time. A range inside one chunk
+        stays memory-mapped; a range across chunks is concatenated into memory.
+        """
+        chunks = list(self.scan(dataset, exchange, symbol, start_us, end_us))
+        if len(chunks) == 1:
+            return chunks[0]
+        schema = _schema(dataset, self.depth)
+        if not chunks:
+            return {name: np.empty((0,) + shape, dtype=dtype) for name, (dtype, shape) in schema.items()}
+        columns = {name: np.concatenate([chunk[name] for chunk in chunks]) for name in schema}
+        # Chunks are sorted inside, but late appends can overlap earlier chunks in time
+        if np.any(np.diff(columns["time_us"]) < 0):
+            order = np.argsort(columns["time_us"], kind="stable")
+            columns = {name: column[order] for name, column in columns.items()}
+        return columns
+
+    def _index(self, key: Tuple[str, str, str]) -> np.ndarray:
+        index = self._indexes.get(key)
+        if index is None:
+            index = self._indexes[key] = self.index(*key)
+        return index
+
+    def _partition_lock(self, key: Tuple[str, str, str]) -> threading.Lock:
+        with self._locks_lock:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def _partition(self, dataset: str, exchange: str, symbol: str) -> str:
+        return os.path.join(self.root, dataset, _UNSAFE.sub("_", exchange), _UNSAFE.sub("_", symbol))
@@ -0,0 +1,219 @@
+import logging
+import queue
+import threading
+import time
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.trade.entities.funding_rate import FundingRate
+from app.trade.entities.order_book import OrderBook
+from app.trade.utilities.epoch_time import epoch_us
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_ROWS = 65536  # rows per partition that trigger a chunk write
+DEFAULT_FLUSH_INTERVAL = 300.0  # seconds before a partial buffer is written anyway
+DEFAULT_MAX_PENDING = 100_000  # queued records before new ones are dropped
+_NAN = float("nan")
+_STOP = object()
+
+# Kept in step with the schemas in history_store, without importing NumPy on the hot path
+_COLUMNS = {
+    "funding": ("time_us", "funding_rate", "mark_price"),
+    "top_of_book": ("time_us", "bid_price", "bid_size", "ask_price", "ask_size"),
+    "depth": ("time_us", "bids", "asks"),
+}
+
+
+class HistoryWriter:
+    """
+    Non-blocking front end of a `HistoryStore` for the aggregator and the streams.
+
+    `record_*` only copies the values into a tuple and puts it on a bounded queue; a daemon
+    thread buffers the rows per partition and writes them as one chunk when a partition reaches
+    `flush_rows` or its oldest row is `flush_interval` seconds old. When the queue is full the
+    record is dropped and counted rather than stalling the event loop.
+    """
+
+    def __init__(
+        self,
+        store,
+        flush_rows: int = DEFAULT_FLUSH_ROWS,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_pending: int = DEFAULT_MAX_PENDING
+    ):
+        """
+        :param store: The `HistoryStore` chunks are appended to.
+        """
+        self.store = store
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.records = 0
+        self.dropped = 0
+        self.rows_written = 0
+        self.chunks_written = 0
+        self.errors = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_pending)
+        self._buffers: Dict[Tuple[str, str, str], List[tuple]] = {}
+        self._buffered_since: Dict[Tuple[str, str, str], float] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    # --- Recording (any thread, never blocks) ---
+
+    def record_funding_rate(self, exchange: str, funding_rate: FundingRate, mark_price: Optional[float] = None):
+        self._put("funding", exchange, funding_rate.symbol, (
+            epoch_us(funding_rate.timestamp),
+            funding_rate.funding_rate,
+            _NAN if mark_price is None else mark_price
+        ))
+
+    def record_tick(self, tick):
+        """
+        A streamed `MarketTick`; only ticks carrying a funding rate are kept.
+        """
+        if tick.funding_rate is None:
+            return
+        self._put("funding", tick.exchange, tick.symbol, (
+            epoch_us(tick.timestamp),
+            tick.funding_rate,
+            _NAN if tick.mark_price is None else tick.mark_price
+        ))
+
+    def record_order_book(self, exchange: str, order_book: OrderBook):
+        """
+        Top of book and the first `store.depth` levels of each side. The levels are copied here,
+        since a live book's views keep changing after the call.
+        """
+        time_us = epoch_us(order_book.timestamp)
+        bids = [(float(price), float(quantity)) for price, quantity in islice(order_book.bids, self.store.depth)]
+        asks = [(float(price), float(quantity)) for price, quantity in islice(order_book.asks, self.store.depth)]
+        best_bid = bids[0] if bids else (_NAN, _NAN)
+        best_ask = asks[0] if asks else (_NAN, _NAN)
+        self._put("top_of_book", exchange, order_book.symbol, (time_us,) + best_bid + best_ask)
+        self._put("depth", exchange, order_book.symbol, (time_us, bids, asks))
+
+    # --- Lifecycle ---
+
+    def start(self) -> "HistoryWriter":
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+                self._thread.start()
+        return self
+
+    def flush(self, timeout: Optional[float] = None):
+        """
+        Write every record queued so far, partial buffers included, and wait for it.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            done = threading.Event()
+            self._queue.put(done)
+            done.wait(timeout)
+        else:
+            self._drain()
+            self._flush_all()
+
+    def close(self, timeout: Optional[float] = None):
+        """
+        Flush everything and stop the writer thread.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+        else:
+            self._drain()
+            self._flush_all()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "records": self.records,
+            "dropped": self.dropped,
+            "pending": self._queue.qsize(),
+            "buffered": sum(len(rows) for rows in list(self._buffers.values())),
+            "rows_written": self.rows_written,
+            "chunks_written": self.chunks_written,
+            "errors": self.errors,
+        }
+
+    # --- Writer thread ---
+
+    def _put(self, dataset: str, exchange: str, symbol: str, row: tuple):
+        try:
+            self._queue.put_nowait((dataset, exchange, symbol, row))
+            self.records += 1
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self._seconds_until_due())
+            except queue.Empty:
+                self._flush_due()
+                continue
+            if not self._handle(item):
+                return
+            self._flush_due()
+
+    def _drain(self):
+        # Used when no thread is running: buffer whatever is queued on the caller's thread
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            self._handle(item)
+
+    def _handle(self, item) -> bool:
+        if item is _STOP:
+            self._flush_all()
+            return False
+        if isinstance(item, threading.Event):
+            self._flush_all()
+            item.set()
+            return True
+        dataset, exchange, symbol, row = item
+        key = (dataset, exchange, symbol)
+        rows = self._buffers.get(key)
+        if rows is None:
+            rows = self._buffers[key] = []
+            self._buffered_since[key] = time.monotonic()
+        rows.append(row)
+        if len(rows) >= self.flush_rows:
+            self._write(key)
+        return True
+
+    def _seconds_until_due(self) -> float:
+        if not self._buffered_since:
+            return self.flush_interval
+        oldest = min(self._buffered_since.values())
+        return max(0.0, oldest + self.flush_interval - time.monotonic())
+
+    def _flush_due(self):
+        now = time.monotonic()
+        for key, since in list(self._buffered_since.items()):
+            if now - since >= self.flush_interval:
+                self._write(key)
+
+    def _flush_all(self):
+        for key in list(self._buffers):
+            self._write(key)
+
+    def _write(self, key: Tuple[str, str, str]):
+        rows = self._buffers.pop(key)
+        self._buffered_since.pop(key, None)
+        dataset, exchange, symbol = key
+        columns = dict(zip(_COLUMNS[dataset], zip(*rows)))
+        if dataset == "depth":
+            columns["bids"] = [self._pad(levels) for levels in columns["bids"]]
+            columns["asks"] = [self._pad(levels) for levels in columns["asks"]]
+        try:
+            self.rows_written += self.store.append(dataset, exchange, symbol, columns)
+            self.chunks_written += 1
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Failed to write {len(rows)} {dataset} rows for {exchange} {symbol}: {e}")
+
+    def _pad(self, levels: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+        return levels + [(_NAN, _NAN)] * (self.store.depth - len(levels))
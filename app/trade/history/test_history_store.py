@@ -0,0 +1,134 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from app.trade.entities.funding_rate import FundingRate
+from app.trade.entities.order_book import OrderBook
+from app.trade.history import DEPTH, FUNDING, TOP_OF_BOOK, HistoryStore, HistoryWriter, epoch_us
+from app.trade.streams.market_data_table import MarketDataTable, MarketTick
+
+T0 = datetime(2024, 5, 1, tzinfo=timezone.utc)
+T0_US = 1_714_521_600 * 10 ** 6
+
+
+def funding_columns(times, rates):
+    return {"time_us": times, "funding_rate": rates, "mark_price": [np.nan] * len(times)}
+
+
+def test_append_and_read_round_trip(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    store.append(FUNDING, "binance", "BTCUSDT", funding_columns([T0_US + 2, T0_US, T0_US + 1], [0.3, 0.1, 0.2]))
+
+    columns = store.read(FUNDING, "binance", "BTCUSDT")
+    assert isinstance(columns["time_us"], np.memmap)  # one chunk stays memory-mapped
+    assert columns["time_us"].tolist() == [T0_US, T0_US + 1, T0_US + 2]
+    assert columns["funding_rate"].tolist() == [0.1, 0.2, 0.3]
+    assert store.partitions(FUNDING) == [("binance", "BTCUSDT")]
+
+
+def test_time_index_limits_reads_to_overlapping_chunks(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    for day in range(3):
+        times = [T0_US + day * 100 + i for i in range(10)]
+        store.append(FUNDING, "okx", "BTC-USDT-SWAP", funding_columns(times, [float(day)] * 10))
+
+    index = store.index(FUNDING, "okx", "BTC-USDT-SWAP")
+    assert index["chunk"].tolist() == [0, 1, 2]
+    assert index["first_us"].tolist() == [T0_US, T0_US + 100, T0_US + 200]
+    assert index["rows"].tolist() == [10, 10, 10]
+
+    chunks = list(store.scan(FUNDING, "okx", "BTC-USDT-SWAP", T0_US + 105, T0_US + 203))
+    assert [chunk["time_us"].tolist() for chunk in chunks] == [
+        [T0_US + 100 + i for i in range(5, 10)],
+        [T0_US + 200 + i for i in range(4)],
+    ]
+    columns = store.read(FUNDING, "okx", "BTC-USDT-SWAP", T0_US + 105, T0_US + 203)
+    assert columns["funding_rate"].tolist() == [1.0] * 5 + [2.0] * 4
+
+
+def test_read_merges_overlapping_late_chunks(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    store.append(FUNDING, "bybit", "BTCUSDT", funding_columns([T0_US, T0_US + 10], [0.0, 0.2]))
+    store.append(FUNDING, "bybit", "BTCUSDT", funding_columns([T0_US + 5], [0.1]))
+
+    assert store.read(FUNDING, "bybit", "BTCUSDT")["funding_rate"].tolist() == [0.0, 0.1, 0.2]
+    assert len(store.read(FUNDING, "bybit", "ETHUSDT")["time_us"]) == 0
+
+
+def test_concurrent_appends_keep_every_chunk(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    symbols = ["BTCUSDT", "ETHUSDT"]
+
+    def append(i):
+        store.append(FUNDING, "binance", symbols[i % 2], funding_columns([T0_US + i], [float(i)]))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(append, range(40)))
+
+    for offset, symbol in enumerate(symbols):
+        index = store.index(FUNDING, "binance", symbol)
+        assert sorted(index["chunk"].tolist()) == list(range(20))
+        assert store.read(FUNDING, "binance", symbol)["time_us"].tolist() == [T0_US + i for i in range(offset, 40, 2)]
+
+
+def test_append_rejects_wrong_columns(tmp_path):
+    store = HistoryStore(str(tmp_path), depth=2)
+    with pytest.raises(ValueError):
+        store.append(FUNDING, "binance", "BTCUSDT", {"time_us": [T0_US], "funding_rate": [0.1]})
+    with pytest.raises(ValueError):
+        store.append(DEPTH, "binance", "BTCUSDT", {"time_us": [T0_US], "bids": [[(1.0, 1.0)]], "asks": [[(1.0, 1.0)]]})
+
+
+def test_writer_batches_records_into_chunks(tmp_path):
+    store = HistoryStore(str(tmp_path), depth=2)
+    writer = HistoryWriter(store, flush_rows=3).start()
+    for i in range(4):
+        writer.record_funding_rate("binance", FundingRate("BTCUSDT", 0.001 * i, T0 + timedelta(minutes=i)))
+    writer.record_order_book("binance", OrderBook(
+        symbol="BTCUSDT",
+        bids=[(99.0, 1.0), (98.0, 2.0), (97.0, 3.0)],
+        asks=[(101.0, 1.5)],
+        timestamp=T0
+    ))
+    writer.flush(timeout=5)
+
+    assert store.index(FUNDING, "binance", "BTCUSDT")["rows"].tolist() == [3, 1]
+    assert store.read(FUNDING, "binance", "BTCUSDT")["time_us"].tolist() == [T0_US + i * 60 * 10 ** 6 for i in range(4)]
+    top = store.read(TOP_OF_BOOK, "binance", "BTCUSDT")
+    assert (top["bid_price"][0], top["bid_size"][0], top["ask_price"][0], top["ask_size"][0]) == (99.0, 1.0, 101.0, 1.5)
+    depth = store.read(DEPTH, "binance", "BTCUSDT")
+    assert depth["bids"][0].tolist() == [[99.0, 1.0], [98.0, 2.0]]
+    assert depth["asks"][0, 0].tolist() == [101.0, 1.5] and np.isnan(depth["asks"][0, 1]).all()
+    assert writer.stats()["rows_written"] == 6
+    writer.close(timeout=5)
+
+
+def test_writer_drops_instead_of_blocking_when_full(tmp_path):
+    writer = HistoryWriter(HistoryStore(str(tmp_path)), max_pending=2)  # not started, so nothing drains
+    for i in range(5):
+        writer.record_funding_rate("binance", FundingRate("BTCUSDT", 0.001, T0 + timedelta(seconds=i)))
+
+    assert writer.stats()["dropped"] == 3
+    writer.close()
+    assert writer.stats()["rows_written"] == 2
+
+
+def test_table_records_streamed_funding_updates_only(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    writer = HistoryWriter(store)
+    table = MarketDataTable(history_writer=writer)
+    table.update(MarketTick("bybit", "BTCUSDT", funding_rate=0.0001, timestamp=T0))
+    table.update(MarketTick("bybit", "BTCUSDT", mark_price=65000.0, timestamp=T0 + timedelta(seconds=1)))
+    table.update(MarketTick("bybit", "BTCUSDT", funding_rate=0.0002, timestamp=T0 + timedelta(seconds=2)))
+    writer.close()
+
+    columns = store.read(FUNDING, "bybit", "BTCUSDT")
+    assert columns["funding_rate"].tolist() == [0.0001, 0.0002]
+    assert np.isnan(columns["mark_price"][0]) and columns["mark_price"][1] == 65000.0
+
+
+def test_epoch_us_reads_naive_timestamps_as_utc():
+    assert epoch_us(T0) == T0_US
+    assert epoch_us(T0.replace(tzinfo=None)) == T0_US
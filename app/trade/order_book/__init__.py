@@ -0,0 +1,4 @@
+from app.trade.order_book.book_side import BookSide, BookSideView
+from app.trade.order_book.local_order_book import BookUpdate, LocalOrderBook, SequenceStats
+from app.trade.order_book.decoders import binance_depth_snapshot, binance_depth_update, okx_books, bybit_orderbook
+from app.trade.order_book.slippage import BUY, SELL, DepthCurve, SlippageCurve
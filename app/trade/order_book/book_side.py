@@ -0,0 +1,128 @@
+from bisect import bisect_left
+from itertools import islice
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+
+class BookSide:
+    """
+    One side of an L2 book as parallel price/size lists kept sorted best-first.
+
+    Levels are located by binary search, so an update costs O(log L) plus the list shift
+    on insert/delete. Cumulative depth is computed lazily and cached until the next change.
+    """
+
+    def __init__(self, descending: bool):
+        """
+        :param descending: True for bids (best = highest price), False for asks.
+        """
+        self.descending = descending
+        self._keys: List[float] = []  # sort keys: -price for bids so index 0 is always the best level
+        self.prices: List[float] = []
+        self.sizes: List[float] = []
+        self.version = 0
+        self._cumulative: Optional[Tuple[int, List[float], List[float]]] = None
+
+    def set(self, price: float, size: float):
+        """
+        Set the absolute size at `price`; a size of 0 removes the level.
+        """
+        key = -price if self.descending else price
+        i = bisect_left(self._keys, key)
+        exists = i < len(self._keys) and self._keys[i] == key
+        if size == 0:
+            if not exists:
+                return
+            del self._keys[i]
+            del self.prices[i]
+            del self.sizes[i]
+        elif exists:
+            self.sizes[i] = size
+        else:
+            self._keys.insert(i, key)
+            self.prices.insert(i, price)
+            self.sizes.insert(i, size)
+        self.version += 1
+
+    def replace(self, levels: Sequence[Tuple[float, float]]):
+        """
+        Drop every level and load `levels` (in any order), e.g. from a snapshot.
+        """
+        ordered = sorted(
+            ((price, size) for price, size in levels if size != 0),
+            key=lambda level: -level[0] if self.descending else level[0]
+        )
+        self.prices = [price for price, _ in ordered]
+        self.sizes = [size for _, size in ordered]
+        self._keys = [-price if self.descending else price for price in self.prices]
+        self.version += 1
+
+    def truncate(self, depth: int):
+        """
+        Keep only the best `depth` levels.
+        """
+        if len(self.prices) > depth:
+            del self._keys[depth:]
+            del self.prices[depth:]
+            del self.sizes[depth:]
+            self.version += 1
+
+    def best(self) -> Optional[Tuple[float, float]]:
+        return (self.prices[0], self.sizes[0]) if self.prices else None
+
+    def top(self, n: Optional[int] = None) -> "BookSideView":
+        return BookSideView(self, n)
+
+    def cumulative(self) -> Tuple[List[float], List[float]]:
+        """
+        Running totals of quantity and notional (price * quantity) from the best level outwards.
+        The lists are shared with the cache, so callers must not modify them.
+        """
+        if self._cumulative is None or self._cumulative[0] != self.version:
+            quantities, notionals = [], []
+            quantity = notional = 0.0
+            for price, size in zip(self.prices, self.sizes):
+                quantity += size
+                notional += price * size
+                quantities.append(quantity)
+                notionals.append(notional)
+            self._cumulative = (self.version, quantities, notionals)
+        return self._cumulative[1], self._cumulative[2]
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+
+class BookSideView(Sequence):
+    """
+    Read-only `(price, quantity)` sequence over the best `n` levels of a `BookSide`,
+    without copying. Reflects later updates to the side, so read it before the next update.
+    """
+
+    __slots__ = ("_side", "_n")
+
+    def __init__(self, side: BookSide, n: Optional[int] = None):
+        self._side = side
+        self._n = n
+
+    @property
+    def side(self) -> BookSide:
+        """
+        The `BookSide` this view reads, e.g. for its cached running totals (`cumulative()`).
+        """
+        return self._side
+
+    def __len__(self) -> int:
+        size = len(self._side.prices)
+        return size if self._n is None else min(self._n, size)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("book level out of range")
+        return self._side.prices[i], self._side.sizes[i]
+
+    def __iter__(self) -> Iterator[Tuple[float, float]]:
+        return islice(zip(self._side.prices, self._side.sizes), len(self))
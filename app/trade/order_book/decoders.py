@@ -0,0 +1,71 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from app.trade.order_book.local_order_book import BookUpdate
+
+
+def _levels(levels) -> list:
+    # OKX rows carry extra fields after price and size
+    return [(float(level[0]), float(level[1])) for level in levels]
+
+
+def _ms(value) -> datetime:
+    return datetime.fromtimestamp(int(value) / 1000, timezone.utc)
+
+
+def binance_depth_snapshot(symbol: str, payload: Dict[str, Any]) -> BookUpdate:
+    """REST `/fapi/v1/depth` response."""
+    return BookUpdate(
+        symbol=symbol,
+        bids=_levels(payload["bids"]),
+        asks=_levels(payload["asks"]),
+        first_update_id=payload["lastUpdateId"],
+        last_update_id=payload["lastUpdateId"],
+        is_snapshot=True,
+        timestamp=_ms(payload["E"]) if payload.get("E") else None
+    )
+
+
+def binance_depth_update(event: Dict[str, Any]) -> BookUpdate:
+    """WebSocket `depthUpdate` event (`<symbol>@depth`)."""
+    return BookUpdate(
+        symbol=event["s"],
+        bids=_levels(event["b"]),
+        asks=_levels(event["a"]),
+        first_update_id=event["U"],
+        last_update_id=event["u"],
+        prev_update_id=event.get("pu"),  # futures only; spot streams are checked with U == last + 1
+        timestamp=_ms(event["E"])
+    )
+
+
+def okx_books(message: Dict[str, Any], symbol: str) -> List[BookUpdate]:
+    """WebSocket `books` channel push: `action` is `snapshot` or `update`, linked by `prevSeqId`."""
+    updates = []
+    for item in message["data"]:
+        is_snapshot = message.get("action") == "snapshot"
+        updates.append(BookUpdate(
+            symbol=symbol,
+            bids=_levels(item["bids"]),
+            asks=_levels(item["asks"]),
+            first_update_id=item["prevSeqId"] + 1 if not is_snapshot else item["seqId"],
+            last_update_id=item["seqId"],
+            prev_update_id=None if is_snapshot else item["prevSeqId"],
+            is_snapshot=is_snapshot,
+            timestamp=_ms(item["ts"])
+        ))
+    return updates
+
+
+def bybit_orderbook(message: Dict[str, Any]) -> BookUpdate:
+    """WebSocket `orderbook.<depth>.<symbol>` push; `u == 1` is a snapshot after a service restart."""
+    data = message["data"]
+    return BookUpdate(
+        symbol=data["s"],
+        bids=_levels(data["b"]),
+        asks=_levels(data["a"]),
+        first_update_id=data["u"],
+        last_update_id=data["u"],
+        is_snapshot=message.get("type") == "snapshot" or data["u"] == 1,
+        timestamp=_ms(message["ts"])
+    )
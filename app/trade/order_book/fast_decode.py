@@ -0,0 +1,76 @@
+"""
+Order-book decoding straight from the raw response bytes into float64 arrays.
+
+The level arrays are located in the payload and only the first `depth` levels are
+parsed, as one flat run of numbers, so no per-level list, str or tuple is created and
+the rest of a 1000-level book is never parsed. Needs the optional `numpy` package;
+`orjson`, when installed, parses the numbers (and the JSON of `ExchangeClient._get_json`).
+"""
+import importlib.util
+import json
+import re
+from typing import Any, Optional
+
+FAST_DECODE_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+if FAST_DECODE_AVAILABLE:
+    import numpy as np
+
+ORJSON_AVAILABLE = importlib.util.find_spec("orjson") is not None
+
+if ORJSON_AVAILABLE:
+    from orjson import loads
+else:
+    loads = json.loads
+
+_STRIP = b'[]"'
+_CLOSE = ord("]")
+
+
+def decode_levels(raw: bytes, key: bytes, depth: Optional[int] = None) -> "np.ndarray":
+    """
+    First `depth` levels (all if None) of the array stored under `key` (e.g. b'"bids"'),
+    as a C-contiguous (n, 2) float64 array of price and size. Extra columns (OKX) are dropped.
+    """
+    start = raw.find(key)
+    if start < 0:
+        return np.empty((0, 2), dtype=np.float64)
+    start = raw.index(b"[", start + len(key)) + 1
+    first_end = raw.find(b"]", start)
+    if raw.find(b"[", start, first_end) < 0:
+        return np.empty((0, 2), dtype=np.float64)  # `[]`: the side is empty
+    columns = raw.count(b",", start, first_end) + 1
+
+    # Venue payloads are compact JSON: after a level's `]` comes `,` or the side's own `]`
+    if depth is None:
+        pos = raw.find(b"]]", start) + 1
+        if pos <= 0:
+            raise ValueError(f"unterminated {key.decode()} levels")
+    else:
+        pos, levels = first_end + 1, 1
+        while levels < depth and raw[pos] != _CLOSE:
+            pos = raw.index(b"]", pos + 1) + 1
+            levels += 1
+
+    numbers = raw[start:pos].translate(None, _STRIP)
+    if ORJSON_AVAILABLE:
+        # orjson's float parser beats NumPy's text parser; the list is consumed straight away
+        values = np.array(loads(b"[" + numbers + b"]"), dtype=np.float64)
+    else:
+        values = np.fromstring(numbers, dtype=np.float64, sep=",")
+    values = values.reshape(-1, columns)
+    return values if columns == 2 else np.ascontiguousarray(values[:, :2])
+
+
+_INT_FIELD = {}
+
+
+def decode_int_field(raw: bytes, name: str) -> Optional[int]:
+    """
+    First integer value of field `name` (quoted or not), without parsing the payload.
+    """
+    pattern = _INT_FIELD.get(name)
+    if pattern is None:
+        pattern = _INT_FIELD[name] = re.compile(rb'"' + name.encode() + rb'"\s*:\s*"?(\d+)')
+    match = pattern.search(raw)
+    return int(match.group(1)) if match else None
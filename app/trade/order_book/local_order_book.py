@@ -0,0 +1,173 @@
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Deque, List, Optional, Tuple
+
+from app.trade.entities.order_book import OrderBook
+from app.trade.order_book.book_side import BookSide, BookSideView
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BUFFERED_UPDATES = 1000
+
+
+@dataclass
+class BookUpdate:
+    """
+    One venue-neutral depth message. Sizes are absolute; a size of 0 removes the level.
+
+    `first_update_id`/`last_update_id` bound the updates this message covers (Binance `U`/`u`,
+    OKX `prevSeqId + 1`/`seqId`, Bybit `u`/`u`). `prev_update_id` is set by venues that link each
+    message to the previous one (Binance futures `pu`, OKX `prevSeqId`).
+    """
+    symbol: str
+    bids: List[Tuple[float, float]]
+    asks: List[Tuple[float, float]]
+    first_update_id: int
+    last_update_id: int
+    prev_update_id: Optional[int] = None
+    is_snapshot: bool = False
+    timestamp: Optional[datetime] = None
+
+
+@dataclass
+class SequenceStats:
+    applied: int = 0
+    stale: int = 0
+    gaps: int = 0
+    resyncs: int = 0
+    buffered: int = 0
+    dropped: int = field(default=0)  # buffered updates discarded because the buffer was full
+
+
+class LocalOrderBook:
+    """
+    L2 book for one symbol, maintained incrementally from diff-depth updates.
+
+    Every delta is checked against the last applied update id. On a gap the book is marked
+    out of sync and further deltas are buffered until a snapshot arrives (from the stream, or
+    via `resync` from REST); buffered deltas newer than the snapshot are then replayed.
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        max_depth: Optional[int] = None,
+        max_buffered_updates: int = DEFAULT_MAX_BUFFERED_UPDATES
+    ):
+        """
+        :param max_depth: Keep only this many levels per side (None keeps everything received).
+        :param max_buffered_updates: Deltas held while waiting for a snapshot; older ones are dropped.
+        """
+        self.symbol = symbol
+        self.max_depth = max_depth
+        self.bids = BookSide(descending=True)
+        self.asks = BookSide(descending=False)
+        self.last_update_id: Optional[int] = None
+        self.timestamp: Optional[datetime] = None
+        self.is_synced = False
+        self.stats = SequenceStats()
+        self._awaiting_first_delta = False
+        self._buffer: Deque[BookUpdate] = deque(maxlen=max_buffered_updates)
+
+    # --- Updates ---
+
+    def apply(self, update: BookUpdate) -> bool:
+        """
+        Apply a snapshot or delta. Returns False if the book is (now) out of sync and needs a snapshot.
+        """
+        if update.is_snapshot:
+            self._load_snapshot(update)
+            return self.is_synced
+
+        if not self.is_synced:
+            self._buffer_update(update)
+            return False
+
+        if update.last_update_id <= self.last_update_id:
+            self.stats.stale += 1  # already covered by the snapshot or a previous delta
+            return True
+
+        if not self._is_contiguous(update):
+            logger.warning(
+                f"{self.symbol} book gap: last applied {self.last_update_id}, "
+                f"got {update.first_update_id}-{update.last_update_id} (prev {update.prev_update_id})"
+            )
+            self.stats.gaps += 1
+            self.is_synced = False
+            self._buffer_update(update)
+            return False
+
+        self._apply_levels(update)
+        return True
+
+    async def resync(self, fetch_snapshot: Callable[[], Awaitable[BookUpdate]]) -> bool:
+        """
+        Load a fresh snapshot (e.g. REST depth with its `lastUpdateId`) and replay buffered deltas.
+        """
+        self.stats.resyncs += 1
+        return self.apply(await fetch_snapshot())
+
+    def _is_contiguous(self, update: BookUpdate) -> bool:
+        if self._awaiting_first_delta:
+            # The first delta after a snapshot only has to straddle it (Binance: U <= lastUpdateId + 1 <= u)
+            return update.first_update_id <= self.last_update_id + 1 <= update.last_update_id
+        if update.prev_update_id is not None:
+            return update.prev_update_id == self.last_update_id
+        return update.first_update_id == self.last_update_id + 1
+
+    def _load_snapshot(self, snapshot: BookUpdate):
+        self.bids.replace(snapshot.bids)
+        self.asks.replace(snapshot.asks)
+        self._truncate()
+        self.last_update_id = snapshot.last_update_id
+        self.timestamp = snapshot.timestamp or datetime.now(timezone.utc)
+        self.is_synced = True
+        self._awaiting_first_delta = True
+
+        buffered, self._buffer = list(self._buffer), deque(maxlen=self._buffer.maxlen)
+        for update in buffered:
+            if not self.apply(update):
+                break
+
+    def _apply_levels(self, update: BookUpdate):
+        for price, size in update.bids:
+            self.bids.set(price, size)
+        for price, size in update.asks:
+            self.asks.set(price, size)
+        self._truncate()
+        self.last_update_id = update.last_update_id
+        self.timestamp = update.timestamp or datetime.now(timezone.utc)
+        self._awaiting_first_delta = False
+        self.stats.applied += 1
+
+    def _buffer_update(self, update: BookUpdate):
+        if len(self._buffer) == self._buffer.maxlen:
+            self.stats.dropped += 1
+        self._buffer.append(update)
+        self.stats.buffered += 1
+
+    def _truncate(self):
+        if self.max_depth is not None:
+            self.bids.truncate(self.max_depth)
+            self.asks.truncate(self.max_depth)
+
+    # --- Views ---
+
+    def top_bids(self, n: Optional[int] = None) -> BookSideView:
+        return self.bids.top(n)
+
+    def top_asks(self, n: Optional[int] = None) -> BookSideView:
+        return self.asks.top(n)
+
+    def to_order_book(self, depth: Optional[int] = None) -> OrderBook:
+        """
+        `OrderBook` whose bids/asks are live views over this book, so no levels are copied.
+        """
+        return OrderBook(
+            symbol=self.symbol,
+            bids=self.top_bids(depth),
+            asks=self.top_asks(depth),
+            timestamp=self.timestamp
+        )
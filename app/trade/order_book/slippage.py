@@ -0,0 +1,181 @@
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from app.trade.entities.order_book import OrderBook
+from app.trade.order_book.book_side import BookSideView
+
+BUY = "buy"  # a buy eats the asks
+SELL = "sell"  # a sell eats the bids
+
+
+class DepthCurve:
+    """
+    Cumulative quantity and notional of one book side, best level first, so the average
+    fill price (and slippage) of any order size is found by binary search in O(log L)
+    instead of walking the levels again for every size.
+
+    Slippage is relative to the best price and positive when the fill is worse than it:
+    above the best ask for buys, below the best bid for sells.
+    """
+
+    __slots__ = ("prices", "quantities", "notionals", "depth", "sign")
+
+    def __init__(
+        self,
+        prices: Sequence[float],
+        quantities: Sequence[float],
+        notionals: Sequence[float],
+        side: str = BUY,
+        depth: Optional[int] = None
+    ):
+        """
+        :param prices: Level prices, best first.
+        :param quantities: Running quantity totals per level.
+        :param notionals: Running notional (price * quantity) totals per level.
+        :param side: `BUY` for an ask curve, `SELL` for a bid curve.
+        :param depth: Use only the first `depth` levels of the (possibly longer, shared) lists.
+        """
+        self.prices = prices
+        self.quantities = quantities
+        self.notionals = notionals
+        self.depth = len(prices) if depth is None else min(depth, len(prices))
+        self.sign = 1.0 if side == BUY else -1.0
+
+    @classmethod
+    def from_levels(cls, levels: Sequence[Tuple[float, float]], side: str = BUY) -> "DepthCurve":
+        """
+        Build the curve for `(price, quantity)` levels sorted best first. Reuses the cached
+        totals of a live `BookSide` and vectorises the sums for array-backed levels.
+        """
+        if isinstance(levels, BookSideView):
+            quantities, notionals = levels.side.cumulative()
+            return cls(levels.side.prices, quantities, notionals, side, depth=len(levels))
+        array = getattr(levels, "array", None)
+        if array is not None:
+            prices, sizes = array[:, 0], array[:, 1]
+            return cls(prices.tolist(), sizes.cumsum().tolist(), (prices * sizes).cumsum().tolist(), side)
+        prices = [float(price) for price, _ in levels]
+        sizes = [float(quantity) for _, quantity in levels]
+        return cls(
+            prices,
+            list(accumulate(sizes)),
+            list(accumulate(price * size for price, size in zip(prices, sizes))),
+            side
+        )
+
+    @property
+    def best_price(self) -> Optional[float]:
+        return self.prices[0] if self.depth else None
+
+    @property
+    def total_quantity(self) -> float:
+        return self.quantities[self.depth - 1] if self.depth else 0.0
+
+    @property
+    def total_notional(self) -> float:
+        return self.notionals[self.depth - 1] if self.depth else 0.0
+
+    def fill_for_quantity(self, quantity: float) -> Optional[Tuple[float, float]]:
+        """
+        `(quantity, notional)` filled by an order for `quantity` units, or None when the book is too thin.
+        """
+        i = bisect_left(self.quantities, quantity, 0, self.depth)
+        if i == self.depth:
+            return None
+        filled_quantity = self.quantities[i - 1] if i else 0.0
+        filled_notional = self.notionals[i - 1] if i else 0.0
+        return quantity, filled_notional + (quantity - filled_quantity) * self.prices[i]
+
+    def fill_for_notional(self, notional: float) -> Optional[Tuple[float, float]]:
+        """
+        `(quantity, notional)` filled by an order worth `notional` in quote currency, or None when the book is too thin.
+        """
+        i = bisect_left(self.notionals, notional, 0, self.depth)
+        if i == self.depth:
+            return None
+        filled_quantity = self.quantities[i - 1] if i else 0.0
+        filled_notional = self.notionals[i - 1] if i else 0.0
+        return filled_quantity + (notional - filled_notional) / self.prices[i], notional
+
+    def slippage_for_quantity(self, quantity: float, allow_partial: bool = False) -> Optional[float]:
+        """
+        Slippage of an order for `quantity` units. When the book is too thin it is None,
+        or with `allow_partial` the slippage of sweeping every level.
+        """
+        return self._slippage(self.fill_for_quantity(quantity), allow_partial)
+
+    def slippage_for_notional(self, notional: float, allow_partial: bool = False) -> Optional[float]:
+        """
+        Slippage of an order worth `notional`; see `slippage_for_quantity`.
+        """
+        return self._slippage(self.fill_for_notional(notional), allow_partial)
+
+    def curve(self, sizes: Iterable[float], notional: bool = True, allow_partial: bool = False) -> List[Optional[float]]:
+        """
+        Slippage for every order size in `sizes` (quote notional by default, base quantity otherwise).
+        """
+        slippage = self.slippage_for_notional if notional else self.slippage_for_quantity
+        return [slippage(size, allow_partial) for size in sizes]
+
+    def _slippage(self, fill: Optional[Tuple[float, float]], allow_partial: bool) -> Optional[float]:
+        if fill is None:
+            if not allow_partial or not self.depth:
+                return None
+            fill = self.total_quantity, self.total_notional
+        quantity, notional = fill
+        if quantity <= 0:
+            return 0.0
+        best_price = self.prices[0]
+        return self.sign * (notional / quantity - best_price) / best_price
+
+
+class SlippageCurve:
+    """
+    Depth curves for both sides of an `OrderBook`, built once and queried for any number of sizes.
+    """
+
+    __slots__ = ("symbol", "asks", "bids")
+
+    def __init__(self, order_book: OrderBook):
+        self.symbol = order_book.symbol
+        self.asks = DepthCurve.from_levels(order_book.asks, BUY)
+        self.bids = DepthCurve.from_levels(order_book.bids, SELL)
+
+    def side(self, side: str) -> DepthCurve:
+        return self.asks if side == BUY else self.bids
+
+    def slippage(self, size: float, side: str = BUY, notional: bool = True, allow_partial: bool = False) -> Optional[float]:
+        curve = self.side(side)
+        if notional:
+            return curve.slippage_for_notional(size, allow_partial)
+        return curve.slippage_for_quantity(size, allow_partial)
+
+    def curve(self, sizes: Iterable[float], side: str = BUY, notional: bool = True, allow_partial: bool = False) -> List[Optional[float]]:
+        return self.side(side).curve(sizes, notional, allow_partial)
+
+
+def notional_slippages(asks, notional: float):
+    """
+    `DepthCurve.slippage_for_notional` for many books at once: `asks` is an (n, depth, 2) float64
+    array of ask levels, best first, padded with NaN. Uses the same operations in the same order,
+    so each value equals the per-book result; NaN where the book is too thin (or empty).
+    """
+    import numpy as np
+
+    prices = np.nan_to_num(asks[:, :, 0])
+    sizes = np.nan_to_num(asks[:, :, 1])
+    quantities = np.cumsum(sizes, axis=1)
+    notionals = np.cumsum(prices * sizes, axis=1)
+    reached = notionals >= notional
+    filled = reached.any(axis=1)
+    rows = np.arange(len(asks))
+    i = reached.argmax(axis=1)
+    previous = np.maximum(i - 1, 0)
+    filled_quantity = np.where(i > 0, quantities[rows, previous], 0.0)
+    filled_notional = np.where(i > 0, notionals[rows, previous], 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        quantity = filled_quantity + (notional - filled_notional) / prices[rows, i]
+        best_price = prices[:, 0]
+        slippages = (notional / quantity - best_price) / best_price
+    return np.where(filled, slippages, np.nan)
@@ -0,0 +1,57 @@
+import json
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.trade.entities.array_order_book import ArrayLevels
+from app.trade.order_book.fast_decode import decode_int_field, decode_levels
+
+
+BINANCE = json.dumps({
+    "lastUpdateId": 7, "E": 1700000000123, "T": 1700000000120,
+    "bids": [[f"{30000 - i * 0.1:.1f}", f"{1 + i}.5"] for i in range(1000)],
+    "asks": [[f"{30000.1 + i * 0.1:.1f}", "0.75"] for i in range(1000)],
+}).encode()
+
+
+def test_decodes_only_the_requested_levels_into_contiguous_float64():
+    bids = decode_levels(BINANCE, b'"bids"', depth=20)
+
+    assert bids.shape == (20, 2)
+    assert bids.dtype == np.float64
+    assert bids.flags["C_CONTIGUOUS"]
+    expected = [(float(p), float(q)) for p, q in json.loads(BINANCE)["bids"][:20]]
+    assert list(ArrayLevels(bids)) == expected
+    assert decode_levels(BINANCE, b'"asks"').shape == (1000, 2)
+    assert decode_int_field(BINANCE, "E") == 1700000000123
+
+
+def test_okx_extra_columns_numeric_levels_and_empty_sides():
+    okx = b'{"code":"0","data":[{"asks":[["41006.8","0.6","0","1"]],"bids":[],"ts":"1629966436396"}]}'
+    assert decode_levels(okx, b'"asks"').tolist() == [[41006.8, 0.6]]
+    assert decode_levels(okx, b'"bids"').shape == (0, 2)
+    assert decode_int_field(okx, "ts") == 1629966436396
+
+    kraken = b'{"orderBook":{"bids":[[30000, 1.5e-3], [29999.5, 2]],"asks":[[30001, 3]]}}'
+    assert decode_levels(kraken, b'"bids"', depth=1).tolist() == [[30000, 0.0015]]
+    assert decode_levels(kraken, b'"asks"', depth=5).tolist() == [[30001, 3]]
+
+
+@pytest.mark.asyncio
+async def test_client_fast_path_matches_the_list_path():
+    import httpx
+    from app.trade.exchanges.binance_client import BinanceClient
+    from app.trade.exchanges.rate_limiter import RateLimiter
+    from app.crypto_funding_arbitrage.strategies.crypto_funding_arbitrage_strategy import CryptoFundingArbitrageStrategy
+
+    books = []
+    for fast_decode in (False, True):
+        client = BinanceClient(fast_decode=fast_decode, rate_limiter=RateLimiter("test", BinanceClient.rate_limit))
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=BINANCE)))
+        books.append(await client.fetch_order_book("BTCUSDT"))
+        await client.aclose()
+
+    slow, fast = books
+    assert list(fast.asks) == slow.asks
+    strategy = CryptoFundingArbitrageStrategy()
+    assert strategy._calculate_slippage(fast, 10_000) == strategy._calculate_slippage(slow, 10_000)
@@ -0,0 +1,105 @@
+import pytest
+
+from app.trade.order_book import (
+    BookUpdate, LocalOrderBook, binance_depth_snapshot, binance_depth_update, okx_books, bybit_orderbook
+)
+from app.crypto_funding_arbitrage.strategies.crypto_funding_arbitrage_strategy import CryptoFundingArbitrageStrategy
+
+
+def depth_update(first, last, prev, bids=(), asks=()):
+    return binance_depth_update({
+        "e": "depthUpdate", "E": 1700000000000, "s": "BTCUSDT", "U": first, "u": last, "pu": prev,
+        "b": [[str(p), str(q)] for p, q in bids], "a": [[str(p), str(q)] for p, q in asks]
+    })
+
+
+def snapshot(last_update_id, bids, asks):
+    return binance_depth_snapshot("BTCUSDT", {
+        "lastUpdateId": last_update_id,
+        "bids": [[str(p), str(q)] for p, q in bids],
+        "asks": [[str(p), str(q)] for p, q in asks]
+    })
+
+
+def test_levels_stay_sorted_and_zero_size_removes():
+    book = LocalOrderBook("BTCUSDT")
+    book.apply(snapshot(100, bids=[(99, 1), (100, 2)], asks=[(102, 1), (101, 3)]))
+
+    assert book.apply(depth_update(99, 101, 95, bids=[(100.5, 4), (99, 0)], asks=[(101, 0), (103, 2)]))
+
+    assert list(book.top_bids()) == [(100.5, 4), (100, 2)]
+    assert list(book.top_asks()) == [(102, 1), (103, 2)]
+    assert book.last_update_id == 101
+
+
+def test_stale_updates_are_ignored_and_gap_triggers_resync():
+    book = LocalOrderBook("BTCUSDT")
+    book.apply(snapshot(100, bids=[(100, 1)], asks=[(101, 1)]))
+
+    assert book.apply(depth_update(90, 100, 89))  # fully covered by the snapshot
+    assert book.apply(depth_update(100, 105, 99, asks=[(101, 2)]))
+    assert not book.apply(depth_update(110, 112, 108, asks=[(101, 9)]))  # pu 108 != 105
+    assert not book.is_synced
+    assert book.stats.gaps == 1
+
+    # Deltas keep being buffered until the snapshot, then the ones newer than it are replayed
+    book.apply(depth_update(113, 114, 112, bids=[(100, 5)]))
+    book.apply(snapshot(112, bids=[(100, 1)], asks=[(101, 7)]))
+
+    assert book.is_synced
+    assert book.last_update_id == 114
+    assert list(book.top_bids()) == [(100, 5)]
+    assert list(book.top_asks()) == [(101, 7)]
+
+
+@pytest.mark.asyncio
+async def test_resync_fetches_snapshot():
+    book = LocalOrderBook("BTCUSDT")
+    book.apply(depth_update(1, 5, 0, asks=[(101, 1)]))  # nothing to anchor to yet
+
+    async def fetch_snapshot():
+        return snapshot(3, bids=[(100, 1)], asks=[(101, 4)])
+
+    assert await book.resync(fetch_snapshot)
+    assert book.last_update_id == 5
+    assert book.top_asks()[0] == (101, 1)
+
+
+def test_okx_and_bybit_sequences():
+    okx = LocalOrderBook("BTCUSDT")
+    for update in okx_books({"action": "snapshot", "data": [
+        {"bids": [["100", "1", "0", "1"]], "asks": [["101", "1", "0", "1"]], "seqId": 10, "prevSeqId": -1, "ts": "1700000000000"}
+    ]}, "BTCUSDT"):
+        okx.apply(update)
+    assert all(okx.apply(u) for u in okx_books({"action": "update", "data": [
+        {"bids": [["100", "0", "0", "0"]], "asks": [], "seqId": 12, "prevSeqId": 10, "ts": "1700000000100"}
+    ]}, "BTCUSDT"))
+    assert not any(okx.apply(u) for u in okx_books({"action": "update", "data": [
+        {"bids": [], "asks": [], "seqId": 20, "prevSeqId": 15, "ts": "1700000000200"}
+    ]}, "BTCUSDT"))
+
+    bybit = LocalOrderBook("BTCUSDT", max_depth=2)
+    bybit.apply(bybit_orderbook({"type": "snapshot", "ts": 1700000000000, "data": {
+        "s": "BTCUSDT", "u": 7, "b": [["100", "1"], ["99", "1"], ["98", "1"]], "a": [["101", "1"]]
+    }}))
+    assert len(bybit.top_bids()) == 2
+    assert bybit.apply(bybit_orderbook({"type": "delta", "ts": 1700000000100, "data": {
+        "s": "BTCUSDT", "u": 8, "b": [], "a": [["100.5", "2"]]
+    }}))
+    assert not bybit.apply(bybit_orderbook({"type": "delta", "ts": 1700000000200, "data": {
+        "s": "BTCUSDT", "u": 10, "b": [], "a": []
+    }}))
+
+
+def test_cumulative_depth_and_slippage_read_views():
+    book = LocalOrderBook("BTCUSDT")
+    book.apply(snapshot(1, bids=[(99, 1)], asks=[(100, 5), (101, 10)]))
+
+    quantities, notionals = book.asks.cumulative()
+    assert quantities == [5, 15]
+    assert notionals == [500, 1510]
+
+    order_book = book.to_order_book()
+    as_lists = order_book.__class__(order_book.symbol, list(order_book.bids), list(order_book.asks), order_book.timestamp)
+    strategy = CryptoFundingArbitrageStrategy()
+    assert strategy._calculate_slippage(order_book, 1000) == strategy._calculate_slippage(as_lists, 1000)
@@ -0,0 +1,86 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.trade.entities.order_book import OrderBook
+from app.trade.order_book import BUY, SELL, DepthCurve, LocalOrderBook, SlippageCurve, binance_depth_snapshot
+from app.trade.utilities.calculate_slippage import calculate_slippage
+from app.crypto_funding_arbitrage.strategies.config import DEFAULT_SLIPPAGE
+from app.crypto_funding_arbitrage.strategies.crypto_funding_arbitrage_strategy import CryptoFundingArbitrageStrategy
+
+ASKS = [(100.0, 1.0), (101.0, 2.0), (103.0, 5.0)]
+BIDS = [(99.0, 1.5), (98.0, 2.0), (95.0, 4.0)]
+
+
+def walk(levels, quantity):
+    # Reference: walk the levels one by one
+    remaining, notional = quantity, 0.0
+    for price, size in levels:
+        take = min(size, remaining)
+        notional += take * price
+        remaining -= take
+        if remaining <= 0:
+            break
+    return notional / quantity
+
+
+def book():
+    return OrderBook(symbol="BTCUSDT", bids=BIDS, asks=ASKS, timestamp=datetime.now(timezone.utc))
+
+
+@pytest.mark.parametrize("quantity", [0.5, 1.0, 1.5, 3.0, 7.9, 8.0])
+def test_quantity_slippage_matches_level_walk(quantity):
+    asks = DepthCurve.from_levels(ASKS, BUY)
+    bids = DepthCurve.from_levels(BIDS, SELL)
+
+    assert asks.slippage_for_quantity(quantity) == pytest.approx((walk(ASKS, quantity) - 100.0) / 100.0)
+    if quantity <= 7.5:
+        assert bids.slippage_for_quantity(quantity) == pytest.approx((99.0 - walk(BIDS, quantity)) / 99.0)
+
+
+def test_notional_slippage_and_thin_book():
+    asks = DepthCurve.from_levels(ASKS, BUY)
+
+    # 100 + 202 covers the first two levels, the rest comes from the third at 103
+    quantity = 3.0 + 100.0 / 103.0
+    assert asks.slippage_for_notional(402.0) == pytest.approx((402.0 / quantity - 100.0) / 100.0)
+    assert asks.slippage_for_notional(50.0) == 0.0
+    assert asks.slippage_for_notional(10_000.0) is None
+    assert asks.slippage_for_notional(10_000.0, allow_partial=True) == pytest.approx((817.0 / 8.0 - 100.0) / 100.0)
+
+
+def test_curve_answers_every_size():
+    curve = SlippageCurve(book())
+    sizes = [50.0, 150.0, 402.0, 10_000.0]
+
+    assert curve.curve(sizes) == [curve.slippage(size) for size in sizes]
+    assert curve.curve(sizes)[-1] is None
+    slippages = curve.curve([1.0, 2.0, 4.0], side=SELL, notional=False)
+    assert slippages == sorted(slippages)
+
+
+def test_live_book_reuses_cached_depth_and_respects_view_depth():
+    live = LocalOrderBook("BTCUSDT")
+    live.apply(binance_depth_snapshot("BTCUSDT", {
+        "lastUpdateId": 1,
+        "bids": [[str(p), str(q)] for p, q in BIDS],
+        "asks": [[str(p), str(q)] for p, q in ASKS]
+    }))
+
+    curve = SlippageCurve(live.to_order_book(depth=2))
+
+    assert curve.asks.total_quantity == 3.0
+    assert curve.slippage(3.0, notional=False) == DepthCurve.from_levels(ASKS[:2]).slippage_for_quantity(3.0)
+    assert curve.slippage(4.0, notional=False) is None
+
+
+def test_utility_and_strategy_use_the_engine():
+    assert calculate_slippage([[str(p), str(q)] for p, q in ASKS], 3.0) == pytest.approx((walk(ASKS, 3.0) - 100.0) / 100.0)
+    assert calculate_slippage([[str(p), str(q)] for p, q in BIDS], 3.5, side=SELL) == pytest.approx((99.0 - walk(BIDS, 3.5)) / 99.0)
+    assert calculate_slippage([], 1.0) == 0.0
+
+    strategy = CryptoFundingArbitrageStrategy()
+    assert strategy.slippage_curve(book(), [150.0, 10_000.0]) == [
+        pytest.approx(SlippageCurve(book()).slippage(150.0)), DEFAULT_SLIPPAGE
+    ]
+    assert strategy._calculate_slippage(book(), 150.0) > 0
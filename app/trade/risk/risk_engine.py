@@ -0,0 +1,260 @@
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.trade.entities.signal import Signal, SignalAction
+
+DEFAULT_ORDER_NOTIONAL = 1000.0
+
+# Rejection reasons returned by `RiskEngine.check`
+CONFIDENCE = "confidence"
+NO_ACTION = "no_action"
+NO_EXCHANGE = "no_exchange"
+ORDER_NOTIONAL = "order_notional"
+COOLDOWN = "cooldown"
+SYMBOL_EXPOSURE = "symbol_exposure"
+EXCHANGE_EXPOSURE = "exchange_exposure"
+TOTAL_EXPOSURE = "total_exposure"
+OPEN_POSITIONS = "open_positions"
+EXCHANGE_POSITIONS = "exchange_positions"
+
+_INF = float("inf")
+_EPSILON = 1e-9  # notional below this is a closed position
+
+
+@dataclass(frozen=True, slots=True)
+class RiskLimits:
+    """
+    Pre-trade limits; notionals are in quote currency (USD), None disables a check.
+    """
+    min_confidence: float = 0.0
+    max_order_notional: Optional[float] = None
+    max_symbol_notional: Optional[float] = None  # |net| per (exchange, symbol)
+    max_exchange_notional: Optional[float] = None  # sum of |net| over a venue's symbols
+    max_total_notional: Optional[float] = None  # sum of |net| over everything
+    max_open_positions: Optional[int] = None
+    max_positions_per_exchange: Optional[int] = None
+    cooldown_seconds: float = 0.0  # after a fill, before the same symbol may trade again
+
+
+class RiskEngine:
+    """
+    Pre-trade gate ahead of `TradeExecutor.execute`.
+
+    Net notional per (exchange, symbol), gross notional per venue and in total, open-position
+    counts and last fill times live in dicts that fills update incrementally (`on_fill`), so a
+    check is a handful of O(1) lookups and never a scan of the book of positions.
+
+    A signal's venue and size come from `signal.metadata` ("exchange", "notional") unless given
+    explicitly; BUY adds to the net notional and SELL subtracts from it. Orders that only
+    reduce a position skip the exposure and position-count limits. Not thread-safe: use one
+    engine per event loop.
+    """
+
+    def __init__(self, limits: Optional[RiskLimits] = None, default_notional: float = DEFAULT_ORDER_NOTIONAL):
+        """
+        :param default_notional: Order size for signals whose metadata carries none.
+        """
+        self.limits = limits or RiskLimits()
+        self.default_notional = default_notional
+        self.net: Dict[Tuple[str, str], float] = {}
+        self.exchange_gross: Dict[str, float] = {}
+        self.exchange_positions: Dict[str, int] = {}
+        self.total_gross = 0.0
+        self.open_positions = 0
+        self.last_fill: Dict[Tuple[str, str], float] = {}
+        self.checks = 0
+        self.rejections: Dict[str, int] = {}
+
+    # --- Checks ---
+
+    def check(
+        self,
+        signal: Signal,
+        exchange: Optional[str] = None,
+        notional: Optional[float] = None,
+        now: Optional[float] = None
+    ) -> Optional[str]:
+        """
+        None if the signal may trade, otherwise the reason it may not.
+        """
+        return self._check(signal, exchange, notional, time.monotonic() if now is None else now, None)
+
+    def allow(self, signal: Signal) -> bool:
+        return self.check(signal) is None
+
+    def order_notional(self, signal: Signal) -> float:
+        """
+        The size `check` assumes for `signal` when none is given: its metadata's "notional", or the default.
+        """
+        return signal.metadata.get("notional", self.default_notional)
+
+    def check_batch(
+        self,
+        signals: Iterable[Signal],
+        exchange: Optional[str] = None,
+        now: Optional[float] = None
+    ) -> List[Optional[str]]:
+        """
+        `check` for every signal, in order, as if the accepted ones filled: each signal is checked
+        against the exposure already committed plus what earlier signals of the batch would add,
+        so a batch can never jointly break a limit. Nothing is committed; call `on_fill` for fills.
+        """
+        now = time.monotonic() if now is None else now
+        pending = _Pending()
+        return [self._check(signal, exchange, None, now, pending) for signal in signals]
+
+    # --- Fills ---
+
+    def on_fill(
+        self,
+        exchange: str,
+        symbol: str,
+        action: SignalAction,
+        notional: float,
+        now: Optional[float] = None
+    ):
+        """
+        Apply a fill of `notional` (quote currency, positive) to the indexes.
+        """
+        key = (exchange, symbol)
+        previous = self.net.get(key, 0.0)
+        current = previous + (notional if action == SignalAction.BUY else -notional)
+        if abs(current) < _EPSILON:
+            current = 0.0
+        change = abs(current) - abs(previous)
+        self.exchange_gross[exchange] = self.exchange_gross.get(exchange, 0.0) + change
+        self.total_gross += change
+
+        opened, closed = previous == 0.0 and current != 0.0, previous != 0.0 and current == 0.0
+        if opened:
+            self.open_positions += 1
+            self.exchange_positions[exchange] = self.exchange_positions.get(exchange, 0) + 1
+        elif closed:
+            self.open_positions -= 1
+            self.exchange_positions[exchange] -= 1
+        if current:
+            self.net[key] = current
+        else:
+            self.net.pop(key, None)
+        self.last_fill[key] = time.monotonic() if now is None else now
+
+    def exposure(self, exchange: str, symbol: Optional[str] = None) -> float:
+        """
+        Net notional of one symbol, or gross notional of a venue when `symbol` is None.
+        """
+        if symbol is None:
+            return self.exchange_gross.get(exchange, 0.0)
+        return self.net.get((exchange, symbol), 0.0)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "checks": self.checks,
+            "rejections": dict(self.rejections),
+            "open_positions": self.open_positions,
+            "total_notional": self.total_gross,
+            "exchange_notional": dict(self.exchange_gross),
+        }
+
+    # --- Internals ---
+
+    def _check(
+        self,
+        signal: Signal,
+        exchange: Optional[str],
+        notional: Optional[float],
+        now: float,
+        pending: Optional["_Pending"]
+    ) -> Optional[str]:
+        self.checks += 1
+        reason = self._reason(signal, exchange, notional, now, pending)
+        if reason is not None:
+            self.rejections[reason] = self.rejections.get(reason, 0) + 1
+        return reason
+
+    def _reason(
+        self,
+        signal: Signal,
+        exchange: Optional[str],
+        notional: Optional[float],
+        now: float,
+        pending: Optional["_Pending"]
+    ) -> Optional[str]:
+        limits = self.limits
+        action = signal.action
+        if action is not SignalAction.BUY and action is not SignalAction.SELL:
+            return NO_ACTION
+        if signal.confidence < limits.min_confidence:
+            return CONFIDENCE
+        metadata = signal.metadata
+        exchange = exchange or metadata.get("exchange")
+        if exchange is None:
+            return NO_EXCHANGE
+        if notional is None:
+            notional = self.order_notional(signal)
+        if limits.max_order_notional is not None and notional > limits.max_order_notional:
+            return ORDER_NOTIONAL
+
+        key = (exchange, signal.symbol)
+        last_fill = self.last_fill.get(key, -_INF)
+        if pending is not None and key in pending.net:
+            last_fill = now  # already trading in this batch
+        if limits.cooldown_seconds and now - last_fill < limits.cooldown_seconds:
+            return COOLDOWN
+
+        previous = self.net.get(key, 0.0)
+        exchange_gross = self.exchange_gross.get(exchange, 0.0)
+        total_gross = self.total_gross
+        open_positions = self.open_positions
+        exchange_positions = self.exchange_positions.get(exchange, 0)
+        if pending is not None:
+            previous += pending.net.get(key, 0.0)
+            exchange_gross += pending.exchange_gross.get(exchange, 0.0)
+            total_gross += pending.total_gross
+            open_positions += pending.open_positions
+            exchange_positions += pending.exchange_positions.get(exchange, 0)
+
+        current = previous + (notional if action is SignalAction.BUY else -notional)
+        change = abs(current) - abs(previous)
+        if change > 0:
+            if limits.max_symbol_notional is not None and abs(current) > limits.max_symbol_notional:
+                return SYMBOL_EXPOSURE
+            if limits.max_exchange_notional is not None and exchange_gross + change > limits.max_exchange_notional:
+                return EXCHANGE_EXPOSURE
+            if limits.max_total_notional is not None and total_gross + change > limits.max_total_notional:
+                return TOTAL_EXPOSURE
+            if abs(previous) < _EPSILON:
+                if limits.max_open_positions is not None and open_positions >= limits.max_open_positions:
+                    return OPEN_POSITIONS
+                if limits.max_positions_per_exchange is not None and exchange_positions >= limits.max_positions_per_exchange:
+                    return EXCHANGE_POSITIONS
+
+        if pending is not None:
+            pending.add(key, exchange, previous, current)
+        return None
+
+
+class _Pending:
+    """
+    What the accepted signals of one `check_batch` call would add to the indexes.
+    """
+    __slots__ = ("net", "exchange_gross", "exchange_positions", "total_gross", "open_positions")
+
+    def __init__(self):
+        self.net: Dict[Tuple[str, str], float] = {}
+        self.exchange_gross: Dict[str, float] = {}
+        self.exchange_positions: Dict[str, int] = {}
+        self.total_gross = 0.0
+        self.open_positions = 0
+
+    def add(self, key: Tuple[str, str], exchange: str, previous: float, current: float):
+        change = abs(current) - abs(previous)
+        self.net[key] = self.net.get(key, 0.0) + current - previous
+        self.exchange_gross[exchange] = self.exchange_gross.get(exchange, 0.0) + change
+        self.total_gross += change
+        opened = abs(previous) < _EPSILON and abs(current) >= _EPSILON
+        closed = abs(previous) >= _EPSILON and abs(current) < _EPSILON
+        if opened or closed:
+            delta = 1 if opened else -1
+            self.open_positions += delta
+            self.exchange_positions[exchange] = self.exchange_positions.get(exchange, 0) + delta
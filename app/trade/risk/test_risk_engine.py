@@ -0,0 +1,127 @@
+import pytest
+
+from app.trade.entities.signal import Signal, SignalAction
+from app.trade.executors.trade_executor import TradeExecutor
+from app.trade.risk.risk_engine import (
+    COOLDOWN,
+    EXCHANGE_EXPOSURE,
+    EXCHANGE_POSITIONS,
+    NO_ACTION,
+    OPEN_POSITIONS,
+    ORDER_NOTIONAL,
+    SYMBOL_EXPOSURE,
+    TOTAL_EXPOSURE,
+    RiskEngine,
+    RiskLimits
+)
+
+
+def buy(symbol, exchange="binance", notional=1000.0, confidence=0.01):
+    return Signal(symbol, SignalAction.BUY, confidence=confidence, metadata={"exchange": exchange, "notional": notional})
+
+
+def sell(symbol, exchange="binance", notional=1000.0):
+    return Signal(symbol, SignalAction.SELL, confidence=0.01, metadata={"exchange": exchange, "notional": notional})
+
+
+def test_fills_update_exposure_and_positions_incrementally():
+    engine = RiskEngine()
+    engine.on_fill("binance", "BTCUSDT", SignalAction.BUY, 1000.0, now=0)
+    engine.on_fill("binance", "ETHUSDT", SignalAction.SELL, 500.0, now=0)
+    engine.on_fill("okx", "BTC-USDT-SWAP", SignalAction.BUY, 200.0, now=0)
+    assert engine.exposure("binance", "ETHUSDT") == -500.0
+    assert engine.exposure("binance") == 1500.0
+    assert (engine.total_gross, engine.open_positions, engine.exchange_positions["binance"]) == (1700.0, 3, 2)
+
+    engine.on_fill("binance", "BTCUSDT", SignalAction.SELL, 1000.0, now=1)
+    assert engine.exposure("binance", "BTCUSDT") == 0.0
+    assert (engine.exposure("binance"), engine.open_positions, engine.exchange_positions["binance"]) == (500.0, 2, 1)
+
+
+def test_limits_reject_with_reasons():
+    engine = RiskEngine(RiskLimits(
+        max_order_notional=5000,
+        max_symbol_notional=3000,
+        max_exchange_notional=4000,
+        max_total_notional=6000,
+        max_open_positions=4,
+        max_positions_per_exchange=2
+    ))
+    engine.on_fill("binance", "BTCUSDT", SignalAction.BUY, 2500.0, now=0)
+    engine.on_fill("bybit", "BTCUSDT", SignalAction.BUY, 1000.0, now=0)
+
+    assert engine.check(buy("BTCUSDT", notional=6000), now=10) == ORDER_NOTIONAL
+    assert engine.check(buy("BTCUSDT", notional=1000), now=10) == SYMBOL_EXPOSURE
+    assert engine.check(buy("ETHUSDT", notional=2000), now=10) == EXCHANGE_EXPOSURE
+    assert engine.check(buy("ETHUSDT", notional=1000), now=10) is None
+    assert engine.check(buy("ETHUSDT", "okx", notional=2600), now=10) == TOTAL_EXPOSURE
+    # Reducing a position is always allowed
+    assert engine.check(sell("BTCUSDT", notional=2500), now=10) is None
+
+    engine.on_fill("binance", "ETHUSDT", SignalAction.BUY, 100.0, now=0)
+    assert engine.check(buy("SOLUSDT", notional=100), now=10) == EXCHANGE_POSITIONS
+    engine.on_fill("okx", "ETH-USDT-SWAP", SignalAction.BUY, 100.0, now=0)
+    assert engine.check(buy("SOL-USDT-SWAP", "okx", notional=100), now=10) == OPEN_POSITIONS
+    assert engine.rejections[SYMBOL_EXPOSURE] == 1
+
+
+def test_cooldown_and_actions():
+    engine = RiskEngine(RiskLimits(cooldown_seconds=60, min_confidence=0.005))
+    engine.on_fill("binance", "BTCUSDT", SignalAction.BUY, 1000.0, now=100)
+    assert engine.check(buy("BTCUSDT"), now=130) == COOLDOWN
+    assert engine.check(buy("BTCUSDT"), now=161) is None
+    assert engine.check(buy("BTCUSDT", confidence=0.001), now=161) == "confidence"
+    assert engine.check(Signal("BTCUSDT", SignalAction.HOLD, metadata={"exchange": "binance"}), now=161) == NO_ACTION
+
+
+def test_batch_reserves_exposure_of_earlier_signals():
+    engine = RiskEngine(RiskLimits(max_exchange_notional=2500, max_open_positions=3, cooldown_seconds=10))
+    reasons = engine.check_batch([
+        buy("BTCUSDT"),
+        buy("ETHUSDT"),
+        buy("BTCUSDT"),  # same symbol again in the batch: cooling down
+        buy("SOLUSDT"),  # would take binance past 2500
+        buy("BTC-USDT-SWAP", "okx"),
+    ], now=0)
+    assert reasons == [None, None, COOLDOWN, EXCHANGE_EXPOSURE, None]
+    # Nothing was committed
+    assert engine.open_positions == 0 and engine.check(buy("SOLUSDT"), now=0) is None
+
+
+class StubExchange:
+    name = "binance"
+
+    def __init__(self):
+        self.orders = []
+
+    async def place_order(self, signal):
+        self.orders.append(signal)
+
+
+@pytest.mark.asyncio
+async def test_executor_gates_and_records_fills():
+    exchange = StubExchange()
+    engine = RiskEngine(RiskLimits(max_open_positions=1))
+    executor = TradeExecutor(exchange, test_mode=False, risk_engine=engine)
+
+    assert await executor.execute(buy("BTCUSDT")) is None
+    assert await executor.execute(buy("ETHUSDT")) == OPEN_POSITIONS
+    # Closing BTCUSDT earlier in the batch frees the slot for ETHUSDT
+    hold = Signal("XRPUSDT", SignalAction.HOLD, metadata={"exchange": "binance"})
+    # One reason per input signal, in order, the skipped HOLD included
+    assert await executor.execute_batch([sell("BTCUSDT"), hold, buy("ETHUSDT"), buy("SOLUSDT")]) == [
+        None, NO_ACTION, None, OPEN_POSITIONS
+    ]
+    assert [signal.symbol for signal in exchange.orders] == ["BTCUSDT", "BTCUSDT", "ETHUSDT"]
+    assert engine.open_positions == 1 and engine.exposure("binance", "ETHUSDT") == 1000.0
+
+
+@pytest.mark.asyncio
+async def test_dry_run_fills_use_the_notional_the_check_assumed():
+    engine = RiskEngine(RiskLimits(max_symbol_notional=2500), default_notional=2000.0)
+    executor = TradeExecutor(StubExchange(), test_mode=True, risk_engine=engine)
+    unsized = Signal("BTCUSDT", SignalAction.BUY, confidence=0.01, metadata={"exchange": "binance"})
+
+    assert await executor.execute(unsized) is None
+    assert engine.exposure("binance", "BTCUSDT") == engine.order_notional(unsized) == 2000.0
+    assert await executor.execute(unsized) == SYMBOL_EXPOSURE
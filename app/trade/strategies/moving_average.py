@@ -18,11 +18,11 @@ class MovingAverageStrategy(Strategy):
         long_ma = sum(closes[-self.long_window:]) / self.long_window
 
         if short_ma > long_ma:
-            return Signal(SignalAction.BUY, confidence=0.9)
+            return Signal(market_data.get("symbol", ""), SignalAction.BUY, confidence=0.9)
         elif short_ma < long_ma:
-            return Signal(SignalAction.SELL, confidence=0.9)
+            return Signal(market_data.get("symbol", ""), SignalAction.SELL, confidence=0.9)
         else:
-            return Signal(SignalAction.HOLD, confidence=0.5)
+            return Signal(market_data.get("symbol", ""), SignalAction.HOLD, confidence=0.5)
 
     async def evaluate(self, market_data: dict):
         candles = market_data.get("candles", [])
@@ -0,0 +1,146 @@
+from array import array
+from typing import Dict, Iterable, Optional
+
+from app.trade.entities.strategy import Strategy
+from app.trade.entities.signal import Signal, SignalAction
+
+RESUM_EVERY = 4096  # updates between exact re-sums, so float drift in the running sums stays bounded
+
+
+class RollingMovingAverage:
+    """
+    Short and long simple moving averages of one symbol's closes, updated in O(1) per candle.
+
+    The last `long_window` closes live in a float64 ring buffer; the short window is its most
+    recent `short_window` slots, so both running sums are adjusted by the close that enters and
+    the one that leaves instead of being re-summed.
+    """
+
+    __slots__ = ("short_window", "long_window", "closes", "count", "_next", "_short_sum", "_long_sum", "_since_resum")
+
+    def __init__(self, short_window: int, long_window: int):
+        if not 0 < short_window <= long_window:
+            raise ValueError("Need 0 < short_window <= long_window")
+        self.short_window = short_window
+        self.long_window = long_window
+        self.closes = array("d", bytes(8 * long_window))
+        self.count = 0  # closes seen, capped reads use min(count, long_window)
+        self._next = 0
+        self._short_sum = 0.0
+        self._long_sum = 0.0
+        self._since_resum = 0
+
+    def update(self, close: float):
+        slot = self._next
+        if self.count >= self.long_window:
+            self._long_sum -= self.closes[slot]
+        if self.count >= self.short_window:
+            self._short_sum -= self.closes[(slot - self.short_window) % self.long_window]
+        self.closes[slot] = close
+        self._long_sum += close
+        self._short_sum += close
+        self._next = (slot + 1) % self.long_window
+        self.count += 1
+        self._since_resum += 1
+        if self._since_resum >= RESUM_EVERY:
+            self._resum()
+
+    def update_many(self, closes: Iterable[float]):
+        for close in closes:
+            self.update(close)
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.long_window
+
+    @property
+    def short_ma(self) -> float:
+        return self._short_sum / self.short_window
+
+    @property
+    def long_ma(self) -> float:
+        return self._long_sum / self.long_window
+
+    def _resum(self):
+        filled = min(self.count, self.long_window)
+        recent = [self.closes[(self._next - 1 - i) % self.long_window] for i in range(filled)]
+        self._long_sum = sum(recent)
+        self._short_sum = sum(recent[:self.short_window])
+        self._since_resum = 0
+
+
+class StreamingMovingAverageStrategy(Strategy):
+    """
+    `MovingAverageStrategy` for candles that arrive one (or a few) at a time, across many symbols.
+
+    `market_data` carries only the new candles: {"symbol": str, "close": float} for one, or
+    {"symbol": str, "closes": [...]} for a batch (dict candles under "candles" are accepted too).
+    Each symbol keeps its own `RollingMovingAverage`, so a signal costs O(1) after the update.
+
+    Both `generate_signal` and `evaluate` consume the candles they are given, so call one of
+    them per tick, or feed with `update` and read `signal()`.
+    """
+
+    def __init__(self, short_window: int = 5, long_window: int = 20):
+        self.short_window = short_window
+        self.long_window = long_window
+        self.averages: Dict[str, RollingMovingAverage] = {}
+
+    def update(self, symbol: str, close: float) -> RollingMovingAverage:
+        average = self._average(symbol)
+        average.update(close)
+        return average
+
+    def update_many(self, symbol: str, closes: Iterable[float]) -> RollingMovingAverage:
+        average = self._average(symbol)
+        average.update_many(closes)
+        return average
+
+    def signal(self, symbol: str) -> Optional[Signal]:
+        """
+        Current signal for `symbol`, or None until `long_window` closes have been seen.
+        """
+        average = self.averages.get(symbol)
+        if average is None or not average.ready:
+            return None
+        short_ma, long_ma = average.short_ma, average.long_ma
+        if short_ma > long_ma:
+            return Signal(symbol, SignalAction.BUY, confidence=0.9)
+        elif short_ma < long_ma:
+            return Signal(symbol, SignalAction.SELL, confidence=0.9)
+        else:
+            return Signal(symbol, SignalAction.HOLD, confidence=0.5)
+
+    async def generate_signal(self, market_data: dict) -> Optional[Signal]:
+        symbol = self._ingest(market_data)
+        return self.signal(symbol)
+
+    async def evaluate(self, market_data: dict):
+        symbol = self._ingest(market_data)
+        average = self.averages[symbol]
+        if not average.ready:
+            return None
+        return {
+            "short_ma": average.short_ma,
+            "long_ma": average.long_ma,
+        }
+
+    def name(self):
+        return "StreamingMovingAverage"
+
+    def _average(self, symbol: str) -> RollingMovingAverage:
+        average = self.averages.get(symbol)
+        if average is None:
+            average = self.averages[symbol] = RollingMovingAverage(self.short_window, self.long_window)
+        return average
+
+    def _ingest(self, market_data: dict) -> str:
+        symbol = market_data.get("symbol", "")
+        average = self._average(symbol)
+        if "close" in market_data:
+            average.update(market_data["close"])
+        elif "closes" in market_data:
+            average.update_many(market_data["closes"])
+        else:
+            average.update_many(candle["close"] for candle in market_data.get("candles", []))
+        return symbol
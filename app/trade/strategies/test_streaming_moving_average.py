@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+from app.trade.entities.signal import SignalAction
+from app.trade.strategies.moving_average import MovingAverageStrategy
+from app.trade.strategies.streaming_moving_average import RollingMovingAverage, StreamingMovingAverageStrategy
+
+
+@pytest.mark.asyncio
+async def test_streaming_matches_full_recompute():
+    rng = random.Random(7)
+    closes = [100.0]
+    for _ in range(300):
+        closes.append(closes[-1] * (1 + rng.uniform(-0.01, 0.01)))
+
+    full = MovingAverageStrategy(short_window=5, long_window=20)
+    streaming = StreamingMovingAverageStrategy(short_window=5, long_window=20)
+    for i, close in enumerate(closes):
+        candles = [{"close": c} for c in closes[:i + 1]]
+        expected = await full.evaluate({"symbol": "BTCUSDT", "candles": candles})
+        signal = await streaming.generate_signal({"symbol": "BTCUSDT", "close": close})
+        average = streaming.averages["BTCUSDT"]
+
+        if expected is None:
+            assert signal is None
+            continue
+        assert average.short_ma == pytest.approx(expected["short_ma"], rel=1e-12)
+        assert average.long_ma == pytest.approx(expected["long_ma"], rel=1e-12)
+        assert signal.action == (await full.generate_signal({"symbol": "BTCUSDT", "candles": candles})).action
+
+
+def test_batches_and_symbols_are_independent():
+    strategy = StreamingMovingAverageStrategy(short_window=2, long_window=4)
+    strategy.update_many("BTCUSDT", [1.0, 2.0, 3.0, 4.0])
+    strategy.update_many("ETHUSDT", [4.0, 3.0, 2.0])
+
+    assert strategy.signal("BTCUSDT").action == SignalAction.BUY
+    assert strategy.signal("ETHUSDT") is None
+    strategy.update("ETHUSDT", 1.0)
+    assert strategy.signal("ETHUSDT").action == SignalAction.SELL
+    assert strategy.signal("SOLUSDT") is None
+
+
+def test_running_sums_are_resummed_exactly():
+    average = RollingMovingAverage(3, 5)
+    average.update_many([1e16, 1.0, -1e16] + [float(i) for i in range(5000)])
+
+    assert average.long_ma == sum(range(4995, 5000)) / 5
+    assert average.short_ma == sum(range(4997, 5000)) / 3
@@ -0,0 +1,16 @@
+from app.trade.streams.binance_stream import BinanceStream
+from app.trade.streams.bybit_stream import BybitStream
+from app.trade.streams.okx_stream import OKXStream
+from app.trade.streams.market_data_table import MarketDataTable, MarketTick
+
+STREAMING_EXCHANGES = ["binance", "bybit", "okx"]
+
+def get_stream_by_name(name: str, symbols, table: MarketDataTable, **kwargs):
+    if name == "binance":
+        return BinanceStream(symbols, table, **kwargs)
+    elif name == "bybit":
+        return BybitStream(symbols, table, **kwargs)
+    elif name == "okx":
+        return OKXStream(symbols, table, **kwargs)
+    else:
+        raise ValueError(f"No market data stream for exchange: {name}")
\ No newline at end of file
@@ -0,0 +1,32 @@
+from datetime import datetime, timezone
+from typing import Any, List
+
+from app.trade.streams.market_data_stream import MarketDataStream
+from app.trade.streams.market_data_table import MarketTick
+
+
+class BinanceStream(MarketDataStream):
+    """`<symbol>@markPrice@1s` carries mark price, funding rate and next funding time."""
+    name = "binance"
+    url = "wss://fstream.binance.com/ws"
+
+    def subscribe_messages(self, symbols: List[str]) -> List[Any]:
+        return [{
+            "method": "SUBSCRIBE",
+            "params": [f"{symbol.lower()}@markPrice@1s" for symbol in symbols],
+            "id": 1
+        }]
+
+    def parse(self, message: Any) -> List[MarketTick]:
+        # Combined-stream payloads wrap the event in {"stream": ..., "data": ...}
+        event = message.get("data", message) if isinstance(message, dict) else None
+        if not isinstance(event, dict) or event.get("e") != "markPriceUpdate":
+            return []
+        return [MarketTick(
+            exchange=self.name,
+            symbol=event["s"],
+            funding_rate=float(event["r"]) if event.get("r") not in (None, "") else None,
+            mark_price=float(event["p"]),
+            next_funding_time=datetime.fromtimestamp(event["T"] / 1000, timezone.utc) if event.get("T") else None,
+            timestamp=datetime.fromtimestamp(event["E"] / 1000, timezone.utc)
+        )]
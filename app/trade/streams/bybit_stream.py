@@ -0,0 +1,34 @@
+from datetime import datetime, timezone
+from typing import Any, List
+
+from app.trade.streams.market_data_stream import MarketDataStream
+from app.trade.streams.market_data_table import MarketTick
+
+
+class BybitStream(MarketDataStream):
+    """Public linear `tickers.<symbol>`: a snapshot first, then deltas with only the changed fields."""
+    name = "bybit"
+    url = "wss://stream.bybit.com/v5/public/linear"
+    heartbeat_interval = 20.0
+
+    def subscribe_messages(self, symbols: List[str]) -> List[Any]:
+        return [{"op": "subscribe", "args": [f"tickers.{symbol}" for symbol in symbols]}]
+
+    def heartbeat_message(self) -> Any:
+        return {"op": "ping"}
+
+    def parse(self, message: Any) -> List[MarketTick]:
+        if not isinstance(message, dict) or not str(message.get("topic", "")).startswith("tickers."):
+            return []
+        data = message["data"]
+        return [MarketTick(
+            exchange=self.name,
+            symbol=data["symbol"],
+            funding_rate=float(data["fundingRate"]) if data.get("fundingRate") else None,
+            mark_price=float(data["markPrice"]) if data.get("markPrice") else None,
+            next_funding_time=(
+                datetime.fromtimestamp(int(data["nextFundingTime"]) / 1000, timezone.utc)
+                if data.get("nextFundingTime") else None
+            ),
+            timestamp=datetime.fromtimestamp(message["ts"] / 1000, timezone.utc)
+        )]
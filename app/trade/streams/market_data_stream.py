@@ -0,0 +1,139 @@
+import asyncio
+import json
+import logging
+import random
+from abc import ABC, abstractmethod
+from typing import Any, List, Optional
+
+import websockets
+
+from app.trade.streams.market_data_table import MarketDataTable, MarketTick
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_BACKOFF = 1.0
+DEFAULT_MAX_BACKOFF = 30.0
+
+
+class MarketDataStream(ABC):
+    """
+    Persistent WebSocket subscription that writes funding and mark price updates into a
+    `MarketDataTable`. The connection is re-established with jittered exponential backoff
+    and every subscription is replayed after each reconnect.
+    """
+    name: str = "exchange"
+    url: str = ""
+    heartbeat_interval: Optional[float] = None  # seconds between application-level pings, if the venue wants them
+
+    def __init__(
+        self,
+        symbols: List[str],
+        table: MarketDataTable,
+        url: Optional[str] = None,
+        min_backoff: float = DEFAULT_MIN_BACKOFF,
+        max_backoff: float = DEFAULT_MAX_BACKOFF
+    ):
+        self.symbols = symbols
+        self.table = table
+        if url is not None:
+            self.url = url
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.is_running = False
+        self.is_connected = False
+        self.connects = 0
+        self.task: Optional[asyncio.Task] = None
+
+    # --- Venue specifics ---
+
+    @abstractmethod
+    def subscribe_messages(self, symbols: List[str]) -> List[Any]:
+        """
+        Messages to send right after connecting to subscribe to `symbols`.
+        """
+        pass
+
+    @abstractmethod
+    def parse(self, message: Any) -> List[MarketTick]:
+        """
+        Turn one decoded message into ticks; acks, pongs and unknown messages return [].
+        """
+        pass
+
+    def heartbeat_message(self) -> Any:
+        return None
+
+    # --- Lifecycle ---
+
+    async def start(self):
+        if self.is_running:
+            logger.warning(f"{self.name} stream is already running")
+            return
+        self.is_running = True
+        self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self.is_running = False
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def _run(self):
+        backoff = self.min_backoff
+        while self.is_running:
+            try:
+                async with websockets.connect(self.url) as ws:
+                    self.connects += 1
+                    self.is_connected = True
+                    backoff = self.min_backoff
+                    logger.info(f"📡 {self.name} stream connected ({len(self.symbols)} symbols)")
+                    await self._subscribe(ws)
+                    await self._consume(ws)
+            except asyncio.CancelledError:
+                raise
+            except (OSError, asyncio.TimeoutError, websockets.exceptions.WebSocketException) as e:
+                logger.warning(f"{self.name} stream disconnected: {e}")
+            finally:
+                self.is_connected = False
+
+            if self.is_running:
+                delay = backoff * (0.5 + random.random() / 2)
+                logger.info(f"🔄 Reconnecting {self.name} stream in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                backoff = min(backoff * 2, self.max_backoff)
+
+    async def _subscribe(self, ws):
+        for message in self.subscribe_messages(self.symbols):
+            await ws.send(self._encode(message))
+
+    async def _consume(self, ws):
+        heartbeat = asyncio.create_task(self._heartbeat(ws)) if self.heartbeat_interval else None
+        try:
+            async for raw in ws:
+                try:
+                    message = json.loads(raw)
+                except ValueError:
+                    continue  # e.g. a plain-text "pong"
+                try:
+                    ticks = self.parse(message)
+                except (KeyError, ValueError, TypeError) as e:
+                    # One malformed payload must not drop the connection
+                    logger.warning(f"{self.name} stream skipped unparseable message: {e!r}")
+                    continue
+                for tick in ticks:
+                    self.table.update(tick)
+        finally:
+            if heartbeat:
+                heartbeat.cancel()
+
+    async def _heartbeat(self, ws):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            await ws.send(self._encode(self.heartbeat_message()))
+
+    def _encode(self, message: Any) -> str:
+        return message if isinstance(message, str) else json.dumps(message)
@@ -0,0 +1,91 @@
+import time
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+
+@dataclass(slots=True)
+class MarketTick:
+    exchange: str
+    symbol: str
+    funding_rate: Optional[float] = None
+    mark_price: Optional[float] = None
+    next_funding_time: Optional[datetime] = None
+    timestamp: Optional[datetime] = None  # venue event time
+    received_at: float = field(default_factory=time.monotonic)
+    funding_received_at: Optional[float] = None  # when `funding_rate` last arrived; mark-price-only updates leave it alone
+
+    def __post_init__(self):
+        if self.funding_received_at is None and self.funding_rate is not None:
+            self.funding_received_at = self.received_at
+
+
+class MarketDataTable:
+    """
+    Latest streamed value per (exchange, symbol).
+
+    Updates merge into the previous tick, so partial messages (Bybit deltas, or OKX
+    sending funding and mark price on separate channels) keep the fields they omit.
+    With a `history_writer`, every update carrying a funding rate is also recorded.
+    """
+
+    def __init__(self, history_writer=None):
+        self._ticks: Dict[Tuple[str, str], MarketTick] = {}
+        self.updates = 0
+        self.history_writer = history_writer
+
+    def update(self, tick: MarketTick) -> MarketTick:
+        key = (tick.exchange, tick.symbol)
+        carries_funding = tick.funding_rate is not None
+        previous = self._ticks.get(key)
+        if previous is not None:
+            changes = {
+                name: getattr(tick, name)
+                for name in ("funding_rate", "mark_price", "next_funding_time", "timestamp")
+                if getattr(tick, name) is not None
+            }
+            if tick.funding_rate is not None:
+                changes["funding_received_at"] = tick.funding_received_at
+            tick = replace(previous, received_at=tick.received_at, **changes)
+        # Swap in a new object rather than mutating, so readers on other threads never see a half-updated tick
+        self._ticks[key] = tick
+        self.updates += 1
+        if carries_funding and self.history_writer is not None:
+            # The merged tick, so a funding update is recorded with the latest mark price
+            self.history_writer.record_tick(tick)
+        return tick
+
+    def get(self, exchange: str, symbol: str, max_age: Optional[float] = None) -> Optional[MarketTick]:
+        """
+        Latest tick for the symbol, or None if there is none or it is older than `max_age` seconds.
+        """
+        tick = self._ticks.get((exchange, symbol))
+        if tick is None:
+            return None
+        if max_age is not None and time.monotonic() - tick.received_at > max_age:
+            return None
+        return tick
+
+    def get_funding_rate(self, exchange: str, symbol: str, max_age: Optional[float] = None) -> Optional[MarketTick]:
+        """
+        Latest tick carrying a funding rate, or None if the funding rate itself is older than
+        `max_age` seconds, however recently other fields (e.g. mark price) were updated.
+        """
+        tick = self._ticks.get((exchange, symbol))
+        if tick is None or tick.funding_received_at is None:
+            return None
+        if max_age is not None and time.monotonic() - tick.funding_received_at > max_age:
+            return None
+        return tick
+
+    def items(self) -> list:
+        """
+        `(exchange, symbol, tick)` for every symbol in the table.
+        """
+        return [(exchange, symbol, tick) for (exchange, symbol), tick in list(self._ticks.items())]
+
+    def symbols(self, exchange: str) -> list:
+        return [symbol for venue, symbol in list(self._ticks) if venue == exchange]
+
+    def __len__(self) -> int:
+        return len(self._ticks)
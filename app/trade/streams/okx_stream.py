@@ -0,0 +1,54 @@
+from datetime import datetime, timezone
+from typing import Any, List
+
+from app.trade.streams.market_data_stream import MarketDataStream
+from app.trade.streams.market_data_table import MarketTick
+
+
+class OKXStream(MarketDataStream):
+    """Public `funding-rate` and `mark-price` channels for the USDT swaps."""
+    name = "okx"
+    url = "wss://ws.okx.com:8443/ws/v5/public"
+    heartbeat_interval = 25.0
+
+    def subscribe_messages(self, symbols: List[str]) -> List[Any]:
+        args = []
+        for symbol in symbols:
+            inst_id = self._inst_id(symbol)
+            args.append({"channel": "funding-rate", "instId": inst_id})
+            args.append({"channel": "mark-price", "instId": inst_id})
+        return [{"op": "subscribe", "args": args}]
+
+    def heartbeat_message(self) -> Any:
+        return "ping"
+
+    def parse(self, message: Any) -> List[MarketTick]:
+        if not isinstance(message, dict) or "data" not in message:
+            return []
+        channel = message.get("arg", {}).get("channel")
+        ticks = []
+        for item in message["data"]:
+            symbol = self._symbol(item["instId"])
+            if channel == "funding-rate":
+                ticks.append(MarketTick(
+                    exchange=self.name,
+                    symbol=symbol,
+                    funding_rate=float(item["fundingRate"]),
+                    next_funding_time=datetime.fromtimestamp(int(item["fundingTime"]) / 1000, timezone.utc),
+                    timestamp=datetime.fromtimestamp(int(item["ts"]) / 1000, timezone.utc) if item.get("ts") else None
+                ))
+            elif channel == "mark-price":
+                ticks.append(MarketTick(
+                    exchange=self.name,
+                    symbol=symbol,
+                    mark_price=float(item["markPx"]),
+                    timestamp=datetime.fromtimestamp(int(item["ts"]) / 1000, timezone.utc)
+                ))
+        return ticks
+
+    def _inst_id(self, symbol: str) -> str:
+        return f"{symbol[:symbol.index('USDT')]}-USDT-SWAP"
+
+    def _symbol(self, inst_id: str) -> str:
+        base, quote, _ = inst_id.split("-")
+        return f"{base}{quote}"
@@ -0,0 +1,170 @@
+import asyncio
+import json
+import time
+import pytest
+from datetime import datetime, timezone
+
+from websockets.asyncio.server import serve
+
+from app.trade.streams import BinanceStream, BybitStream, OKXStream, MarketDataTable, MarketTick
+from app.crypto_funding_arbitrage.aggregator.crypto_funding_arbitrage_data_aggregator import CryptoFundingArbitrageDataAggregator
+from app.trade.exchanges.exchange_client import ExchangeClient
+from app.trade.entities.fees import Fees
+from app.trade.entities.order_book import OrderBook
+
+
+def mark_price_event(symbol, rate, mark):
+    return json.dumps({
+        "e": "markPriceUpdate", "E": 1700000000000, "s": symbol,
+        "p": str(mark), "r": str(rate), "T": 1700006400000
+    })
+
+
+class StandInServer:
+    """Local WebSocket stand-in: records subscriptions and pushes the queued messages per connection."""
+
+    def __init__(self, messages_per_connection, close_after_send=False):
+        self.messages_per_connection = list(messages_per_connection)
+        self.close_after_send = close_after_send
+        self.subscriptions = []
+        self.connections = 0
+
+    async def handler(self, ws):
+        self.connections += 1
+        self.subscriptions.append(json.loads(await ws.recv()))
+        messages = self.messages_per_connection.pop(0) if self.messages_per_connection else []
+        for message in messages:
+            await ws.send(message)
+        if self.close_after_send and self.messages_per_connection:
+            return  # drop the connection to force a reconnect
+        await ws.wait_closed()
+
+
+async def wait_for(condition, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_binance_stream_fills_latest_value_table():
+    server = StandInServer([[mark_price_event("BTCUSDT", 0.0001, 30000), mark_price_event("BTCUSDT", 0.0003, 30100)]])
+    async with serve(server.handler, "127.0.0.1", 0) as ws_server:
+        port = ws_server.sockets[0].getsockname()[1]
+        table = MarketDataTable()
+        stream = BinanceStream(["BTCUSDT", "ETHUSDT"], table, url=f"ws://127.0.0.1:{port}")
+        await stream.start()
+        await wait_for(lambda: table.updates == 2)
+        await stream.stop()
+
+    tick = table.get("binance", "BTCUSDT")
+    assert tick.funding_rate == 0.0003
+    assert tick.mark_price == 30100
+    assert server.subscriptions[0]["params"] == ["btcusdt@markPrice@1s", "ethusdt@markPrice@1s"]
+
+
+@pytest.mark.asyncio
+async def test_stream_reconnects_and_resubscribes():
+    server = StandInServer(
+        [[mark_price_event("BTCUSDT", 0.0001, 30000)], [mark_price_event("BTCUSDT", 0.0002, 30500)]],
+        close_after_send=True
+    )
+    async with serve(server.handler, "127.0.0.1", 0) as ws_server:
+        port = ws_server.sockets[0].getsockname()[1]
+        table = MarketDataTable()
+        stream = BinanceStream(["BTCUSDT"], table, url=f"ws://127.0.0.1:{port}", min_backoff=0.01, max_backoff=0.05)
+        await stream.start()
+        await wait_for(lambda: table.updates == 2)
+        await stream.stop()
+
+    assert server.connections == 2
+    assert server.subscriptions[0] == server.subscriptions[1]
+    assert table.get("binance", "BTCUSDT").funding_rate == 0.0002
+
+
+@pytest.mark.asyncio
+async def test_malformed_message_is_skipped_without_reconnecting():
+    malformed = json.dumps({"e": "markPriceUpdate", "E": 1700000000000, "s": "BTCUSDT", "r": "0.0001"})  # no "p"
+    server = StandInServer([[malformed, mark_price_event("BTCUSDT", 0.0002, 30000)]])
+    async with serve(server.handler, "127.0.0.1", 0) as ws_server:
+        port = ws_server.sockets[0].getsockname()[1]
+        table = MarketDataTable()
+        stream = BinanceStream(["BTCUSDT"], table, url=f"ws://127.0.0.1:{port}")
+        await stream.start()
+        await wait_for(lambda: table.updates == 1)
+        await stream.stop()
+
+    assert server.connections == 1
+    assert table.get("binance", "BTCUSDT").funding_rate == 0.0002
+
+def test_partial_updates_merge_into_latest_value():
+    table = MarketDataTable()
+    bybit = BybitStream(["BTCUSDT"], table)
+    for tick in bybit.parse({
+        "topic": "tickers.BTCUSDT", "type": "snapshot", "ts": 1700000000000,
+        "data": {"symbol": "BTCUSDT", "markPrice": "30000", "fundingRate": "0.0001", "nextFundingTime": "1700006400000"}
+    }):
+        table.update(tick)
+    for tick in bybit.parse({
+        "topic": "tickers.BTCUSDT", "type": "delta", "ts": 1700000001000,
+        "data": {"symbol": "BTCUSDT", "markPrice": "30010"}
+    }):
+        table.update(tick)
+
+    okx = OKXStream(["ETHUSDT"], table)
+    for tick in okx.parse({
+        "arg": {"channel": "funding-rate", "instId": "ETH-USDT-SWAP"},
+        "data": [{"instId": "ETH-USDT-SWAP", "fundingRate": "0.0002", "fundingTime": "1700006400000", "ts": "1700000000000"}]
+    }):
+        table.update(tick)
+
+    assert table.get("bybit", "BTCUSDT").funding_rate == 0.0001
+    assert table.get("bybit", "BTCUSDT").mark_price == 30010
+    assert table.get("okx", "ETHUSDT").funding_rate == 0.0002
+
+
+class RestCountingClient(ExchangeClient):
+    name = "binance"
+
+    def __init__(self):
+        super().__init__()
+        self.funding_calls = 0
+
+    async def fetch_funding_rate(self, symbol):
+        self.funding_calls += 1
+        raise AssertionError("REST funding should not be used for streamed symbols")
+
+    async def fetch_order_book(self, symbol):
+        return OrderBook(symbol=symbol, bids=[], asks=[], timestamp=datetime.now(timezone.utc))
+
+    async def fetch_fees(self, symbol):
+        return Fees(maker=0.0002, taker=0.0004)
+
+
+@pytest.mark.asyncio
+async def test_aggregator_reads_funding_from_table():
+    table = MarketDataTable()
+    for tick in BinanceStream(["BTCUSDT"], table).parse(json.loads(mark_price_event("BTCUSDT", 0.0004, 30000))):
+        table.update(tick)
+    client = RestCountingClient()
+
+    results = await CryptoFundingArbitrageDataAggregator(
+        client, ["BTCUSDT"], concurrent=True, market_data_table=table
+    ).fetch_all()
+
+    assert client.funding_calls == 0
+    assert results[0].error is None
+    assert results[0].funding_rate.funding_rate == 0.0004
+
+
+
+def test_mark_price_updates_do_not_refresh_funding_age():
+    table = MarketDataTable()
+    table.update(MarketTick(exchange="okx", symbol="BTCUSDT", funding_rate=0.0001, received_at=time.monotonic() - 60))
+    table.update(MarketTick(exchange="okx", symbol="BTCUSDT", mark_price=30000, received_at=time.monotonic()))
+
+    assert table.get("okx", "BTCUSDT", max_age=5) is not None
+    assert table.get_funding_rate("okx", "BTCUSDT", max_age=5) is None
+    assert table.get_funding_rate("okx", "BTCUSDT").funding_rate == 0.0001
@@ -0,0 +1,23 @@
+from typing import List
+from app.trade.symbols.kraken import KRAKEN_SYMBOLS
+from app.trade.symbols.binance import BINANCE_SYMBOLS
+from app.trade.symbols.deribit import DERIBIT_SYMBOLS
+from app.trade.symbols.bybit import BYBIT_SYMBOLS
+from app.trade.symbols.okx import TICKERS_TO_MONITOR
+
+def get_symbols_by_exchange(name: str) -> List[str]:
+    """
+    Symbol universe to scan on `name`, in that venue's own naming.
+    """
+    if name == "kraken":
+        return KRAKEN_SYMBOLS
+    elif name == "binance":
+        return BINANCE_SYMBOLS
+    elif name == "deribit":
+        return DERIBIT_SYMBOLS
+    elif name == "bybit":
+        return BYBIT_SYMBOLS
+    elif name == "okx":
+        return TICKERS_TO_MONITOR
+    else:
+        raise ValueError(f"No symbol list for exchange: {name}")
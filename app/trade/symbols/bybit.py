@@ -0,0 +1,13 @@
+# Bybit linear perpetuals use the same BASEQUOTE names as Binance futures
+BYBIT_SYMBOLS = [
+    "BTCUSDT",
+    "ETHUSDT",
+    "SOLUSDT",
+    "XRPUSDT",
+    "DOGEUSDT",
+    "LINKUSDT",
+    "AVAXUSDT",
+    "OPUSDT",
+    "LTCUSDT",
+    "BNBUSDT"
+]
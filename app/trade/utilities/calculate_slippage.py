@@ -1,6 +1,8 @@
 
 from typing import List
 
+from app.trade.order_book.slippage import DepthCurve
+
 def calculate_slippage(order_book: List[List[str]], trade_size: float, side: str = "buy") -> float:
     """
     Estimate slippage based on order book and trade size.
@@ -16,34 +18,6 @@ def calculate_slippage(order_book: List[List[str]], trade_size: float, side: str
     if not order_book:
         return 0.0  # or raise an error
 
-    remaining = trade_size
-    total_cost = 0.0
-    weighted_qty = 0.0
-
-    for price_str, qty_str in order_book:
-        price = float(price_str)
-        qty = float(qty_str)
-
-        if remaining <= qty:
-            total_cost += remaining * price
-            weighted_qty += remaining
-            break
-        else:
-            total_cost += qty * price
-            weighted_qty += qty
-            remaining -= qty
-
-    if weighted_qty == 0:
-        return 0.0
-
-    avg_execution_price = total_cost / weighted_qty
-    top_price = float(order_book[0][0])
-
-    # For 'buy', slippage is how much above top ask you paid
-    # For 'sell', slippage is how much below top bid you got
-    if side == "buy":
-        slippage = (avg_execution_price - top_price) / top_price
-    else:
-        slippage = (top_price - avg_execution_price) / top_price
-
-    return slippage
\ No newline at end of file
+    # The book is thinner than the trade: price what is there
+    slippage = DepthCurve.from_levels(order_book, side).slippage_for_quantity(trade_size, allow_partial=True)
+    return slippage if slippage is not None else 0.0
@@ -0,0 +1,32 @@
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+MICROSECONDS_PER_SECOND = 10 ** 6
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def epoch_us(timestamp: Optional[datetime]) -> int:
+    """
+    UTC epoch microseconds; naive timestamps are UTC throughout the clients, None means now.
+    """
+    if timestamp is None:
+        return time.time_ns() // 1000
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return microseconds(timestamp - _EPOCH)
+
+
+def from_epoch_us(value: int) -> datetime:
+    """
+    Aware UTC datetime of UTC epoch microseconds; the inverse of `epoch_us`.
+    """
+    seconds, micros = divmod(int(value), MICROSECONDS_PER_SECOND)
+    return datetime.fromtimestamp(seconds, timezone.utc).replace(microsecond=micros)
+
+
+def microseconds(delta: timedelta) -> int:
+    """
+    Exact length of `delta` in microseconds (no float rounding).
+    """
+    return (delta.days * 86400 + delta.seconds) * MICROSECONDS_PER_SECOND + delta.microseconds
@@ -0,0 +1,19 @@
+from datetime import datetime, timedelta, timezone
+
+from app.trade.utilities.epoch_time import epoch_us, from_epoch_us, microseconds
+
+T0 = datetime(2024, 5, 1, 8, 0, 0, 123456, tzinfo=timezone.utc)
+T0_US = 1_714_550_400_123_456
+
+
+def test_naive_and_aware_timestamps_round_trip_as_utc():
+    assert epoch_us(T0) == T0_US
+    assert epoch_us(T0.replace(tzinfo=None)) == T0_US
+    assert epoch_us(T0.astimezone(timezone(timedelta(hours=2)))) == T0_US
+    assert from_epoch_us(T0_US) == T0 and from_epoch_us(T0_US).tzinfo is timezone.utc
+    assert from_epoch_us(epoch_us(None)).tzinfo is timezone.utc
+
+
+def test_microseconds_is_exact_for_negative_and_long_deltas():
+    assert microseconds(timedelta(days=400, microseconds=1)) == 400 * 86400 * 10 ** 6 + 1
+    assert microseconds(timedelta(microseconds=-1)) == -1